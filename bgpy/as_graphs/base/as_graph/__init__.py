@@ -1,4 +1,6 @@
 from .base_as import AS
 from .as_graph import ASGraph
+from .as_graph_arrays import ASGraphArrays
+from .as_graph_snapshot import ASGraphSnapshot
 
-__all__ = ["AS", "ASGraph"]
+__all__ = ["AS", "ASGraph", "ASGraphArrays", "ASGraphSnapshot"]
@@ -0,0 +1,86 @@
+"""Functions to build the array backed (CSR) topology of the graph"""
+
+from frozendict import frozendict
+import numpy as np
+from numpy.typing import NDArray
+
+from .as_graph_arrays import ASGraphArrays
+
+
+def get_arrays(self) -> ASGraphArrays:
+    """Returns the array backed topology, building it if it doesn't exist yet
+
+    The arrays are cached on the graph, so multiple engines that use the
+    same graph only build them once
+    """
+
+    if self.arrays is None:
+        self.arrays = self._build_arrays()
+    assert isinstance(self.arrays, ASGraphArrays), "mypy"
+    return self.arrays
+
+
+def get_asn_group_masks(self) -> frozendict[str, NDArray[np.bool_]]:
+    """Returns {AS group: whether the AS at each index is in the group}
+
+    Cached on the graph, like the arrays
+    """
+
+    if self.asn_group_masks is None:
+        asns = self.get_arrays().asns
+        self.asn_group_masks = frozendict(
+            {
+                as_group: np.isin(asns, np.fromiter(asn_group, dtype=np.int64))
+                for as_group, asn_group in self.asn_groups.items()
+            }
+        )
+    asn_group_masks: frozendict[str, NDArray[np.bool_]] = self.asn_group_masks
+    return asn_group_masks
+
+
+def _build_arrays(self) -> ASGraphArrays:
+    """Builds dense AS indices and CSR relationship arrays for the graph"""
+
+    asn_to_index: dict[int, int] = {as_obj.asn: i for i, as_obj in enumerate(self)}
+    csr_arrays = [
+        self._build_csr(asn_to_index, rel_attr)
+        for rel_attr in ("provider_asns", "peer_asns", "customer_asns")
+    ]
+    rank_indices = tuple(
+        np.fromiter(
+            (asn_to_index[x.asn] for x in rank), dtype=np.int32, count=len(rank)
+        )
+        for rank in self.propagation_ranks
+    )
+    return ASGraphArrays(
+        asns=np.fromiter((x.asn for x in self), dtype=np.int64, count=len(self)),
+        asn_to_index=frozendict(asn_to_index),
+        propagation_ranks=np.fromiter(
+            (x.propagation_rank for x in self), dtype=np.int32, count=len(self)
+        ),
+        provider_offsets=csr_arrays[0][0],
+        provider_indices=csr_arrays[0][1],
+        peer_offsets=csr_arrays[1][0],
+        peer_indices=csr_arrays[1][1],
+        customer_offsets=csr_arrays[2][0],
+        customer_indices=csr_arrays[2][1],
+        rank_indices=rank_indices,
+    )
+
+
+def _build_csr(
+    self, asn_to_index: dict[int, int], rel_attr: str
+) -> tuple[NDArray[np.int64], NDArray[np.int32]]:
+    """Returns the CSR offsets and indices for a given relationship
+
+    rel_attr is one of provider_asns, peer_asns, customer_asns
+    Neighbors are sorted by ASN, the same as the AS relationship tuples
+    """
+
+    offsets = np.zeros(len(self) + 1, dtype=np.int64)
+    indices: list[int] = list()
+    for i, as_obj in enumerate(self):
+        neighbor_asns = sorted(getattr(as_obj, rel_attr))
+        indices.extend(asn_to_index[asn] for asn in neighbor_asns)
+        offsets[i + 1] = len(indices)
+    return offsets, np.array(indices, dtype=np.int32)
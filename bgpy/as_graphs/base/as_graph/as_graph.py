@@ -2,9 +2,13 @@ from typing import Any, Callable, Optional
 from weakref import proxy
 
 from frozendict import frozendict
+import numpy as np
+from numpy.typing import NDArray
 from yamlable import yaml_info, YamlAble, yaml_info_decorate
 
 from .base_as import AS
+from .as_graph_arrays import ASGraphArrays
+from .as_graph_snapshot import ASGraphSnapshot
 
 from bgpy.enums import ASGroups
 
@@ -18,14 +22,21 @@ from .graph_building_funcs import _make_relationships_tuples
 
 # propagation rank building funcs
 from .propagation_rank_funcs import _assign_propagation_ranks
-from .propagation_rank_funcs import _assign_ranks_helper
 from .propagation_rank_funcs import _get_propagation_ranks
 
 # Customer cone funcs
 from .customer_cone_funcs import _get_customer_cone_size
-from .customer_cone_funcs import _get_cone_size_helper
+from .customer_cone_funcs import get_customer_cone_bitmap
+from .customer_cone_funcs import in_customer_cone
+from .customer_cone_funcs import customer_cone_asns
 from .customer_cone_funcs import _get_as_rank
 
+# Array backed topology funcs
+from .array_funcs import get_arrays
+from .array_funcs import get_asn_group_masks
+from .array_funcs import _build_arrays
+from .array_funcs import _build_csr
+
 import bgpy
 
 from ..as_graph_info import ASGraphInfo
@@ -42,14 +53,21 @@ class ASGraph(YamlAble):
 
     # propagation rank building funcs
     _assign_propagation_ranks = _assign_propagation_ranks
-    _assign_ranks_helper = _assign_ranks_helper
     _get_propagation_ranks = _get_propagation_ranks
 
     # Customer cone funcs
     _get_customer_cone_size = _get_customer_cone_size
-    _get_cone_size_helper = _get_cone_size_helper
+    get_customer_cone_bitmap = get_customer_cone_bitmap
+    in_customer_cone = in_customer_cone
+    customer_cone_asns = customer_cone_asns
     _get_as_rank = _get_as_rank
 
+    # Array backed topology funcs
+    get_arrays = get_arrays
+    get_asn_group_masks = get_asn_group_masks
+    _build_arrays = _build_arrays
+    _build_csr = _build_csr
+
     def __init_subclass__(cls, *args, **kwargs):
         """This method essentially creates a list of all subclasses
         This is allows us to easily assign yaml tags
@@ -71,12 +89,24 @@ class ASGraph(YamlAble):
         additional_as_group_filters: frozendict[
             str, Callable[["ASGraph"], frozenset[AS]]
         ] = frozendict(),
+        # Builds the compact array (CSR) topology alongside the AS objects
+        build_arrays: bool = False,
+        # Loads the graph from a snapshot rather than the as_graph_info
+        snapshot: Optional[ASGraphSnapshot] = None,
     ):
         """Reads in relationship data from a TSV and generate graph"""
 
+        # Lazily built by get_arrays unless build_arrays is set
+        self.arrays: Optional[ASGraphArrays] = None
+        # Lazily built by get_asn_group_masks
+        self.asn_group_masks: Optional[frozendict[str, NDArray[np.bool_]]] = None
+
         if yaml_as_dict is not None:
             # We are coming from YAML, so init from YAML (for testing)
             self._set_yaml_attrs(yaml_as_dict, yaml_ixp_asns)
+        elif snapshot is not None:
+            # Everything was already derived, so just load it
+            self._set_snapshot_attrs(snapshot, BaseASCls, BasePolicyCls)
         else:
             # init as normal, through the as_graph_info
             self._set_non_yaml_attrs(
@@ -84,6 +114,8 @@ class ASGraph(YamlAble):
             )
         # Set the AS and ASN group groups
         self._set_as_groups(additional_as_group_filters)
+        if build_arrays:
+            self.arrays = self._build_arrays()
 
     ##############
     # Init funcs #
@@ -111,6 +143,70 @@ class ASGraph(YamlAble):
             self._get_propagation_ranks()
         )
 
+    def _set_snapshot_attrs(
+        self,
+        snapshot: ASGraphSnapshot,
+        BaseASCls: type["AS"],
+        BasePolicyCls: type["bgpy.simulation_engine.Policy"],
+    ) -> None:
+        """Generates the AS graph from a snapshot
+
+        Produces the same graph as _set_non_yaml_attrs did when the snapshot
+        was written, without rederiving ranks or customer cones
+        """
+
+        # Python lists are much faster to index than arrays
+        asns: list[int] = snapshot.asns.tolist()
+        flags: list[int] = snapshot.flags.tolist()
+        propagation_ranks: list[int] = snapshot.propagation_ranks.tolist()
+        customer_cone_sizes: list[int] = snapshot.customer_cone_sizes.tolist()
+        as_ranks: list[int] = snapshot.as_ranks.tolist()
+
+        ases: list[AS] = [
+            BaseASCls(
+                asn=asn,
+                input_clique=bool(flag & snapshot.INPUT_CLIQUE_FLAG),
+                ixp=bool(flag & snapshot.IXP_FLAG),
+                customer_cone_size=cone_size if cone_size >= 0 else None,
+                as_rank=as_rank if as_rank >= 0 else None,
+                propagation_rank=propagation_rank,
+                policy=BasePolicyCls(),
+                as_graph=self,
+            )
+            for asn, flag, cone_size, as_rank, propagation_rank in zip(
+                asns, flags, customer_cone_sizes, as_ranks, propagation_ranks
+            )
+        ]
+        self.ixp_asns = frozenset(
+            asn for asn, flag in zip(asns, flags) if flag & snapshot.IXP_FLAG
+        )
+        self.as_dict = frozendict(zip(asns, ases))
+        self.ases = tuple(ases)
+
+        # Relationships are proxies sorted by ASN, the same as the CSR rows
+        proxies = [proxy(x) for x in ases]
+        for rel_attr, offsets_array, indices_array in (
+            ("providers", snapshot.provider_offsets, snapshot.provider_indices),
+            ("peers", snapshot.peer_offsets, snapshot.peer_indices),
+            ("customers", snapshot.customer_offsets, snapshot.customer_indices),
+        ):
+            offsets: list[int] = offsets_array.tolist()
+            indices: list[int] = indices_array.tolist()
+            asns_attr = rel_attr[:-1] + "_asns"
+            for i, as_obj in enumerate(ases):
+                start, end = offsets[i], offsets[i + 1]
+                row = indices[start:end]
+                setattr(as_obj, rel_attr, tuple([proxies[x] for x in row]))
+                setattr(as_obj, asns_attr, frozenset([asns[x] for x in row]))
+
+        rank_offsets: list[int] = snapshot.rank_offsets.tolist()
+        rank_indices: list[int] = snapshot.rank_indices.tolist()
+        self.propagation_ranks = tuple(
+            tuple([ases[x] for x in rank_indices[start:end]])
+            for start, end in zip(rank_offsets[:-1], rank_offsets[1:])
+        )
+        self.arrays = snapshot.to_arrays()
+
     def _set_non_yaml_attrs(
         self,
         as_graph_info: ASGraphInfo,
@@ -0,0 +1,82 @@
+from dataclasses import dataclass
+from typing import Any
+
+from frozendict import frozendict
+import numpy as np
+from numpy.typing import NDArray
+
+
+@dataclass(frozen=True, slots=True)
+class ASGraphArrays:
+    """Compact, array backed representation of an ASGraph's topology
+
+    Every AS gets a dense integer index (its position in ASGraph.ases).
+    Relationships are stored in CSR (compressed sparse row) form, so the
+    providers of the AS at index i are:
+
+    provider_indices[provider_offsets[i]:provider_offsets[i + 1]]
+
+    Neighbor order within a row matches the order of the AS's relationship
+    tuples (sorted by ASN), so iterating over these arrays visits neighbors
+    in the same order as iterating over the AS objects does
+    """
+
+    # ASN of the AS at each index
+    asns: NDArray[np.int64]
+    # {asn: index}
+    asn_to_index: frozendict[int, int]
+    # Propagation rank of the AS at each index
+    propagation_ranks: NDArray[np.int32]
+    # CSR relationship arrays
+    provider_offsets: NDArray[np.int64]
+    provider_indices: NDArray[np.int32]
+    peer_offsets: NDArray[np.int64]
+    peer_indices: NDArray[np.int32]
+    customer_offsets: NDArray[np.int64]
+    customer_indices: NDArray[np.int32]
+    # AS indices for each propagation rank, mirroring ASGraph.propagation_ranks
+    rank_indices: tuple[NDArray[np.int32], ...]
+
+    def __len__(self) -> int:
+        return len(self.asns)
+
+    def providers(self, index: int) -> NDArray[np.int32]:
+        """Returns the indices of the providers of the AS at index"""
+
+        offsets = self.provider_offsets
+        start, end = offsets[index], offsets[index + 1]
+        return self.provider_indices[start:end]
+
+    def peers(self, index: int) -> NDArray[np.int32]:
+        """Returns the indices of the peers of the AS at index"""
+
+        offsets = self.peer_offsets
+        start, end = offsets[index], offsets[index + 1]
+        return self.peer_indices[start:end]
+
+    def customers(self, index: int) -> NDArray[np.int32]:
+        """Returns the indices of the customers of the AS at index"""
+
+        offsets = self.customer_offsets
+        start, end = offsets[index], offsets[index + 1]
+        return self.customer_indices[start:end]
+
+    @property
+    def nbytes(self) -> int:
+        """Total number of bytes used by the arrays"""
+
+        arrays: list[NDArray[Any]] = [
+            self.asns,
+            self.propagation_ranks,
+            self.provider_offsets,
+            self.provider_indices,
+            self.peer_offsets,
+            self.peer_indices,
+            self.customer_offsets,
+            self.customer_indices,
+        ]
+        arrays.extend(self.rank_indices)
+        return sum(x.nbytes for x in arrays)
+
+
+__all__ = ["ASGraphArrays"]
@@ -0,0 +1,285 @@
+from dataclasses import dataclass, fields
+import json
+import mmap
+from multiprocessing.shared_memory import SharedMemory
+import os
+import sys
+from pathlib import Path
+from typing import Any, ClassVar, Optional, TYPE_CHECKING
+
+from frozendict import frozendict
+import numpy as np
+from numpy.typing import NDArray
+
+from .as_graph_arrays import ASGraphArrays
+
+if TYPE_CHECKING:
+    from .as_graph import ASGraph
+
+
+@dataclass(frozen=True, slots=True)
+class ASGraphSnapshot:
+    """Versioned binary snapshot of a constructed ASGraph
+
+    Everything that is derived while building the graph (relationships,
+    propagation ranks, customer cone sizes, AS rank) is stored as arrays,
+    so loading a graph doesn't have to parse the source file or derive
+    anything. ASes are in the same order as ASGraph.ases, and the
+    relationships are in the same CSR form as ASGraphArrays.
+
+    The file is a small JSON header followed by the raw (aligned) arrays,
+    so it's read with mmap rather than copied into memory.
+    The key identifies what the graph was built from (such as a hash of the
+    source file), so that stale snapshots are never loaded
+    """
+
+    # Identifies the source file and settings that the graph was built with
+    key: str
+    # ASN of the AS at each index
+    asns: NDArray[np.int64]
+    # INPUT_CLIQUE_FLAG | IXP_FLAG
+    flags: NDArray[np.uint8]
+    propagation_ranks: NDArray[np.int32]
+    # -1 if the graph was built without customer cones
+    customer_cone_sizes: NDArray[np.int64]
+    as_ranks: NDArray[np.int64]
+    # CSR relationship arrays
+    provider_offsets: NDArray[np.int64]
+    provider_indices: NDArray[np.int32]
+    peer_offsets: NDArray[np.int64]
+    peer_indices: NDArray[np.int32]
+    customer_offsets: NDArray[np.int64]
+    customer_indices: NDArray[np.int32]
+    # AS indices of each propagation rank, in CSR form
+    rank_offsets: NDArray[np.int64]
+    rank_indices: NDArray[np.int32]
+
+    VERSION = 1
+    INPUT_CLIQUE_FLAG = 1
+    IXP_FLAG = 2
+
+    _MAGIC = b"BGPYASGS"
+    _ALIGNMENT = 64
+    # {name: segment} that this process is attached to
+    _attached_shared_memory: ClassVar[dict[str, SharedMemory]] = dict()
+
+    @classmethod
+    def from_as_graph(cls, as_graph: "ASGraph", key: str) -> "ASGraphSnapshot":
+        """Creates the snapshot of a constructed ASGraph"""
+
+        arrays = as_graph.get_arrays()
+        rank_offsets = np.zeros(len(arrays.rank_indices) + 1, dtype=np.int64)
+        rank_offsets[1:] = np.cumsum([len(x) for x in arrays.rank_indices])
+
+        def optional_ints(attr: str) -> NDArray[np.int64]:
+            values = (getattr(x, attr) for x in as_graph)
+            return np.fromiter(
+                (-1 if x is None else x for x in values),
+                dtype=np.int64,
+                count=len(as_graph),
+            )
+
+        return cls(
+            key=key,
+            asns=arrays.asns,
+            flags=np.fromiter(
+                (
+                    cls.INPUT_CLIQUE_FLAG * x.input_clique + cls.IXP_FLAG * x.ixp
+                    for x in as_graph
+                ),
+                dtype=np.uint8,
+                count=len(as_graph),
+            ),
+            propagation_ranks=arrays.propagation_ranks,
+            customer_cone_sizes=optional_ints("customer_cone_size"),
+            as_ranks=optional_ints("as_rank"),
+            provider_offsets=arrays.provider_offsets,
+            provider_indices=arrays.provider_indices,
+            peer_offsets=arrays.peer_offsets,
+            peer_indices=arrays.peer_indices,
+            customer_offsets=arrays.customer_offsets,
+            customer_indices=arrays.customer_indices,
+            rank_offsets=rank_offsets,
+            rank_indices=np.concatenate(
+                [np.zeros(0, dtype=np.int32), *arrays.rank_indices]
+            ).astype(np.int32),
+        )
+
+    def to_arrays(self) -> ASGraphArrays:
+        """Returns the ASGraphArrays, sharing the arrays of the snapshot"""
+
+        rank_offsets = self.rank_offsets.tolist()
+        return ASGraphArrays(
+            asns=self.asns,
+            asn_to_index=frozendict(
+                {asn: i for i, asn in enumerate(self.asns.tolist())}
+            ),
+            propagation_ranks=self.propagation_ranks,
+            provider_offsets=self.provider_offsets,
+            provider_indices=self.provider_indices,
+            peer_offsets=self.peer_offsets,
+            peer_indices=self.peer_indices,
+            customer_offsets=self.customer_offsets,
+            customer_indices=self.customer_indices,
+            rank_indices=tuple(
+                self.rank_indices[start:end]
+                for start, end in zip(rank_offsets[:-1], rank_offsets[1:])
+            ),
+        )
+
+    ##############
+    # File funcs #
+    ##############
+
+    @classmethod
+    def _array_names(cls) -> tuple[str, ...]:
+        return tuple(x.name for x in fields(cls) if x.name != "key")
+
+    def to_bytes(self) -> bytes:
+        """Returns the snapshot in its binary format
+
+        Magic, header length, JSON header, then each array (aligned)
+        """
+
+        arrays: dict[str, NDArray[Any]] = {
+            name: np.ascontiguousarray(getattr(self, name))
+            for name in self._array_names()
+        }
+        array_info: dict[str, tuple[str, int, int]] = dict()
+        offset = 0
+        for name, array in arrays.items():
+            offset = self._align(offset)
+            array_info[name] = (array.dtype.str, len(array), offset)
+            offset += array.nbytes
+        header = json.dumps(
+            {"version": self.VERSION, "key": self.key, "arrays": array_info}
+        ).encode()
+
+        prefix = self._MAGIC + np.array([len(header)], dtype="<u8").tobytes()
+        data_start = self._align(len(prefix) + len(header))
+
+        # Empty arrays at the end must still be within the buffer
+        buf = bytearray(data_start + offset)
+        buf[: len(prefix) + len(header)] = prefix + header
+        for name, array in arrays.items():
+            array_start = data_start + array_info[name][2]
+            array_end = array_start + array.nbytes
+            buf[array_start:array_end] = array.tobytes()
+        return bytes(buf)
+
+    @classmethod
+    def from_buffer(
+        cls, buf: Any, key: Optional[str] = None
+    ) -> Optional["ASGraphSnapshot"]:
+        """Returns the snapshot within the buffer without copying the arrays
+
+        Returns None if the buffer isn't a snapshot, is from another version,
+        or (if a key is passed in) was built from something else
+        """
+
+        prefix_len = len(cls._MAGIC) + 8
+        if len(buf) < prefix_len or bytes(buf[: len(cls._MAGIC)]) != cls._MAGIC:
+            return None
+        header_len = int(
+            np.frombuffer(buf, dtype="<u8", count=1, offset=len(cls._MAGIC))[0]
+        )
+        header_end = prefix_len + header_len
+        header = json.loads(bytes(buf[prefix_len:header_end]))
+        if header["version"] != cls.VERSION or (
+            key is not None and header["key"] != key
+        ):
+            return None
+
+        data_start = cls._align(prefix_len + header_len)
+        # Views into the buffer, so nothing is copied
+        arrays = dict()
+        for name, (dtype, count, offset) in header["arrays"].items():
+            array = np.frombuffer(
+                buf, dtype=np.dtype(dtype), count=count, offset=data_start + offset
+            )
+            # Other processes may be using the same buffer
+            array.flags.writeable = False
+            arrays[name] = array
+        assert set(arrays) == set(cls._array_names()), "Corrupt snapshot header"
+        return cls(key=header["key"], **arrays)
+
+    def write(self, path: Path) -> None:
+        """Writes the snapshot
+
+        Written to a temporary file first, so that processes reading the
+        snapshot (or writing it at the same time) never see a partial file
+        """
+
+        path.parent.mkdir(parents=True, exist_ok=True)
+        tmp_path = path.with_name(f"{path.name}.{os.getpid()}.tmp")
+        tmp_path.write_bytes(self.to_bytes())
+        os.replace(tmp_path, path)
+
+    @classmethod
+    def read(cls, path: Path, key: Optional[str] = None) -> Optional["ASGraphSnapshot"]:
+        """Reads (mmaps) the snapshot
+
+        Returns None if the file doesn't exist, is from another version,
+        or (if a key is passed in) was built from something else
+        """
+
+        if not path.exists():
+            return None
+
+        with path.open("rb") as f:
+            try:
+                buf = mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ)
+            except ValueError:
+                # Empty file
+                return None
+        return cls.from_buffer(buf, key=key)
+
+    #######################
+    # Shared memory funcs #
+    #######################
+
+    def to_shared_memory(self) -> SharedMemory:
+        """Copies the snapshot into a new shared memory segment
+
+        Any local process can then attach to it with from_shared_memory
+        (by the segment's name), so that there is only one physical copy
+        of the topology. The caller owns the segment, and must close and
+        unlink it when all processes are done with it
+        """
+
+        data = self.to_bytes()
+        shm = SharedMemory(create=True, size=len(data))
+        shm.buf[: len(data)] = data
+        return shm
+
+    @classmethod
+    def from_shared_memory(cls, name: str) -> "ASGraphSnapshot":
+        """Attaches to a snapshot in shared memory, without copying it
+
+        The segment stays attached for the life of the process, since the
+        arrays are views into it. The owner (not this process) unlinks it
+        """
+
+        shm = cls._attached_shared_memory.get(name)
+        if shm is None:
+            if sys.version_info >= (3, 13):
+                shm = SharedMemory(name=name, track=False)
+            else:
+                # This registers the segment with the resource tracker.
+                # That's harmless for child processes (which share the
+                # tracker of the owner), but unrelated processes that attach
+                # must keep running until the owner is done with it
+                shm = SharedMemory(name=name)
+            cls._attached_shared_memory[name] = shm
+        snapshot = cls.from_buffer(shm.buf)
+        assert snapshot is not None, f"No snapshot in shared memory {name}"
+        return snapshot
+
+    @classmethod
+    def _align(cls, offset: int) -> int:
+        """Rounds the offset up so that arrays are aligned"""
+
+        return -(-offset // cls._ALIGNMENT) * cls._ALIGNMENT
+
+
+__all__ = ["ASGraphSnapshot"]
@@ -1,37 +1,83 @@
 """Functions to determine customer cone size"""
 
+import numpy as np
+from numpy.typing import NDArray
+
 from .base_as import AS
 
 
 def _get_customer_cone_size(self) -> None:
-    """Gets the AS rank by customer cone, the same way Caida does it"""
-
-    # Recursively assign the customer cone size
-    non_edges: list[AS] = []
-    cone_dict: dict[int, set[int]] = {}
-    for as_obj in self:
-        if as_obj.stub or as_obj.multihomed:
-            as_obj.customer_cone_size = 0
-            cone_dict[as_obj.asn] = set()
-        else:
-            non_edges.append(as_obj)
-    for as_obj in non_edges:
-        customer_cone: set[int] = self._get_cone_size_helper(as_obj, cone_dict)
-        as_obj.customer_cone_size = len(customer_cone)
-
-
-def _get_cone_size_helper(self, as_obj: AS, cone_dict: dict[int, set[int]]) -> set[int]:
-    """Recursively determines the cone size of an as"""
-
-    if as_obj.asn in cone_dict:
-        return cone_dict[as_obj.asn]
-    else:
-        cone_dict[as_obj.asn] = set()
-        for customer in as_obj.customers:
-            cone_dict[as_obj.asn].add(customer.asn)
-            self._get_cone_size_helper(customer, cone_dict)
-            cone_dict[as_obj.asn].update(cone_dict[customer.asn])
-    return cone_dict[as_obj.asn]
+    """Gets the AS rank by customer cone, the same way Caida does it
+
+    Cones are bitsets (python ints, where bit i is the AS at
+    self.ases[i]), built in propagation rank order so that the cones of an
+    AS's customers are always built first. A cone is then just the union of
+    its customers and their cones, which is a single int OR per link rather
+    than a set union. Each cone is dropped once all of the AS's providers
+    have used it, so only the cones along the frontier are in memory
+
+    NOTE: stubs and multihomed ASes have empty cones
+    """
+
+    asn_to_index: dict[int, int] = {as_obj.asn: i for i, as_obj in enumerate(self)}
+    # {asn: number of providers that haven't used the cone yet}
+    remaining_providers: dict[int, int] = {
+        as_obj.asn: len(as_obj.providers) for as_obj in self
+    }
+    cones: dict[int, int] = dict()
+    for rank in self.propagation_ranks:
+        for as_obj in rank:
+            cone = 0
+            edge = as_obj.stub or as_obj.multihomed
+            for customer in as_obj.customers:
+                if not edge:
+                    cone |= cones[customer.asn] | (1 << asn_to_index[customer.asn])
+                remaining_providers[customer.asn] -= 1
+                if remaining_providers[customer.asn] == 0:
+                    del cones[customer.asn]
+            as_obj.customer_cone_size = cone.bit_count()
+            if remaining_providers[as_obj.asn]:
+                cones[as_obj.asn] = cone
+
+
+def get_customer_cone_bitmap(self, asn: int) -> NDArray[np.uint8]:
+    """Returns the customer cone of an AS as a bitmap (not including the AS)
+
+    Bit i (in np.packbits little bit order) is the AS at index i of
+    get_arrays(), so membership is checked with in_customer_cone without
+    creating a set of ASNs. Bitmaps of multiple ASes can be combined
+    with np.bitwise_or
+
+    Unlike customer_cone_size, this is the full customer cone, including
+    the cones of stubs and multihomed ASes
+    """
+
+    asn_to_index = self.get_arrays().asn_to_index
+    in_cone = np.zeros(len(self), dtype=np.bool_)
+    # Iterative DFS down the customers
+    stack: list[AS] = [self.as_dict[asn]]
+    while stack:
+        for customer in stack.pop().customers:
+            index = asn_to_index[customer.asn]
+            if not in_cone[index]:
+                in_cone[index] = True
+                stack.append(customer)
+    return np.packbits(in_cone, bitorder="little")
+
+
+def in_customer_cone(self, asn: int, cone_bitmap: NDArray[np.uint8]) -> bool:
+    """Returns True if the AS is within the bitmap of get_customer_cone_bitmap"""
+
+    index = self.get_arrays().asn_to_index[asn]
+    return bool((cone_bitmap[index >> 3] >> (index & 7)) & 1)
+
+
+def customer_cone_asns(self, cone_bitmap: NDArray[np.uint8]) -> frozenset[int]:
+    """Returns the ASNs within the bitmap of get_customer_cone_bitmap"""
+
+    arrays = self.get_arrays()
+    in_cone = np.unpackbits(cone_bitmap, count=len(arrays), bitorder="little")
+    return frozenset(arrays.asns[in_cone.astype(np.bool_)].tolist())
 
 
 def _get_as_rank(self) -> None:
@@ -4,21 +4,34 @@ from .base_as import AS
 
 
 def _assign_propagation_ranks(self):
-    """Assigns propagation ranks from the leafs to input_clique"""
-
-    for as_obj in self:
-        self._assign_ranks_helper(as_obj, 0)
-
-
-def _assign_ranks_helper(self, as_obj: AS, rank: int):
-    """Assigns ranks to all ases in customer/provider chain recursively"""
-
-    if as_obj.propagation_rank is None or as_obj.propagation_rank < rank:
-        as_obj.propagation_rank = rank
-        # Only update it's providers if it's rank becomes higher
-        # This avoids a double for loop of writes
-        for provider_obj in as_obj.providers:
-            self._assign_ranks_helper(provider_obj, rank + 1)
+    """Assigns propagation ranks from the leafs to input_clique
+
+    An AS's rank is one more than the highest rank of its customers
+    (and 0 if it has none). Ranks are assigned one rank at a time
+    (a topological sort of the customer provider DAG), so an AS is only
+    ranked once all of its customers have been ranked. This visits
+    each customer provider link once, and doesn't recurse
+    """
+
+    # {asn: number of customers that haven't been ranked yet}
+    unranked_customers: dict[int, int] = {
+        as_obj.asn: len(as_obj.customers) for as_obj in self
+    }
+    rank: int = 0
+    current_rank: list[AS] = [x for x in self if not x.customers]
+    num_ranked: int = 0
+    while current_rank:
+        next_rank: list[AS] = list()
+        for as_obj in current_rank:
+            as_obj.propagation_rank = rank
+            for provider_obj in as_obj.providers:
+                unranked_customers[provider_obj.asn] -= 1
+                if unranked_customers[provider_obj.asn] == 0:
+                    next_rank.append(provider_obj)
+        num_ranked += len(current_rank)
+        current_rank = next_rank
+        rank += 1
+    assert num_ranked == len(self), "Customer provider cycle in the AS graph"
 
 
 def _get_propagation_ranks(self) -> tuple[tuple[AS, ...], ...]:
@@ -1,12 +1,15 @@
 from abc import ABC, abstractmethod
 import csv
+import hashlib
 from frozendict import frozendict
 from pathlib import Path
 from typing import Optional, TYPE_CHECKING
 
+from .as_graph import ASGraphSnapshot
+from .as_graph_info import ASGraphInfo
+
 if TYPE_CHECKING:
     from .as_graph_collector import ASGraphCollector
-    from .as_graph_info import ASGraphInfo
     from .as_graph import ASGraph
 
 
@@ -19,8 +22,14 @@ class ASGraphConstructor(ABC):
         as_graph_kwargs=frozendict(),
         tsv_path: Optional[Path] = None,
         stubs: bool = True,
+        snapshot_path: Optional[Path] = None,
     ) -> None:
-        """Stores download time and cache_dir instance vars and creates dir"""
+        """Stores download time and cache_dir instance vars and creates dir
+
+        If snapshot_path is set, the graph is loaded from that binary snapshot
+        when it was built from the same file (and settings), and otherwise
+        the snapshot is written after building the graph
+        """
 
         self.as_graph_collector: "ASGraphCollector" = ASGraphCollectorCls(
             **as_graph_collector_kwargs
@@ -29,19 +38,30 @@ class ASGraphConstructor(ABC):
         self.as_graph_kwargs = as_graph_kwargs
         self.tsv_path: Optional[Path] = tsv_path
         self.stubs: bool = stubs
+        self.snapshot_path: Optional[Path] = snapshot_path
 
     def run(self) -> "ASGraph":
         """Generates AS graph in the following steps:
 
         1. download file from source using the GraphCollector
         2. parse downloaded file to get ASGraphInfo object
+           (or load the graph from the snapshot if it's valid)
         3. Generate the graph based on ASGraphInfo object
-        4. Write to tsv_path if it is set
+        4. Write to snapshot_path and tsv_path if they are set
         5. Return ASGraph
         """
 
         # Download file (for ex: from CAIDA)
         dl_path = self.as_graph_collector.run()
+
+        if self.snapshot_path:
+            snapshot_key = self._get_snapshot_key(dl_path)
+            snapshot = ASGraphSnapshot.read(self.snapshot_path, key=snapshot_key)
+            if snapshot is not None:
+                as_graph = self.get_as_graph_from_snapshot(snapshot)
+                self.write_tsv(as_graph, self.tsv_path)
+                return as_graph
+
         # Get ASGraphInfo from downloaded file
         as_graph_info = self._get_as_graph_info(dl_path)
         # Generate AS Graph from ASGraphInfo
@@ -53,10 +73,35 @@ class ASGraphConstructor(ABC):
             # Generate AS Graph from ASGraphInfo
             as_graph = self._get_as_graph(as_graph_info)
 
+        if self.snapshot_path:
+            ASGraphSnapshot.from_as_graph(as_graph, snapshot_key).write(
+                self.snapshot_path
+            )
         # Write to TSV if tsv_path is set
         self.write_tsv(as_graph, self.tsv_path)
         return as_graph
 
+    def _get_snapshot_key(self, dl_path: Path) -> str:
+        """Returns the key of the snapshot built from dl_path
+
+        Hash of the source file, along with the settings that change the graph
+        """
+
+        file_hash = hashlib.sha256()
+        with dl_path.open("rb") as f:
+            for chunk in iter(lambda: f.read(1 << 20), b""):
+                file_hash.update(chunk)
+        customer_cones = self.as_graph_kwargs.get("customer_cones", True)
+        return (
+            f"{file_hash.hexdigest()}|{self.ASGraphCls.__name__}"
+            f"|stubs={self.stubs}|customer_cones={customer_cones}"
+        )
+
+    def get_as_graph_from_snapshot(self, snapshot: ASGraphSnapshot) -> "ASGraph":
+        """Returns AS Graph loaded from the snapshot"""
+
+        return self.ASGraphCls(ASGraphInfo(), snapshot=snapshot, **self.as_graph_kwargs)
+
     def remove_stubs(self, as_graph: "ASGraph") -> None:
         """Removes stubs from as graph"""
 
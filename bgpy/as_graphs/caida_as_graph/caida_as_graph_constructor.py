@@ -1,7 +1,13 @@
+import bz2
+from io import BytesIO
 from pathlib import Path
-from typing import Optional
+import re
+from typing import IO, Optional
+import warnings
 
 from frozendict import frozendict
+import numpy as np
+from numpy.typing import NDArray
 
 from bgpy.as_graphs.base import (
     ASGraphCollector,
@@ -16,6 +22,9 @@ from .caida_as_graph_collector import CAIDAASGraphCollector
 from .caida_as_graph import CAIDAASGraph
 
 
+_COMMENT_LINE_RE = re.compile(rb"^#.*(?:\n|$)", re.MULTILINE)
+
+
 class CAIDAASGraphConstructor(ASGraphConstructor):
     # Add an optional default to ASGraphCollectorCls and ASGraphCls
     def __init__(
@@ -26,6 +35,8 @@ class CAIDAASGraphConstructor(ASGraphConstructor):
         as_graph_kwargs=frozendict(),
         tsv_path: Optional[Path] = None,
         stubs: bool = True,
+        snapshot_path: Optional[Path] = None,
+        parse_chunk_size: int = 1 << 24,
     ) -> None:
         super().__init__(
             ASGraphCollectorCls,
@@ -34,7 +45,14 @@ class CAIDAASGraphConstructor(ASGraphConstructor):
             as_graph_kwargs=as_graph_kwargs,
             tsv_path=tsv_path,
             stubs=stubs,
+            snapshot_path=snapshot_path,
         )
+        # Bytes read from the file at once when parsing
+        self.parse_chunk_size: int = parse_chunk_size
+        self._relationship_arrays_cache: dict[
+            Path,
+            tuple[frozenset[int], frozenset[int], NDArray[np.int64], NDArray[np.int64]],
+        ] = dict()
 
     ####################
     # Abstract methods #
@@ -42,39 +60,34 @@ class CAIDAASGraphConstructor(ASGraphConstructor):
     def _get_as_graph_info(
         self, dl_path: Path, invalid_asns: frozenset[int] = frozenset()
     ) -> ASGraphInfo:
-        """Gets AS Graph info from the downloaded file"""
+        """Gets AS Graph info from the downloaded file
 
-        input_clique_asns: set[int] = set()
-        ixp_asns: set[int] = set()
-        # Customer provider links
-        cp_links: set[CPLink] = set()
-        # Peer links
-        peer_links: set[PeerLink] = set()
-
-        with dl_path.open() as f:
-            for line in f:
-                # Get Caida input clique. See paper on site for what this is
-                if line.startswith("# input clique"):
-                    self._extract_input_clique_asns(
-                        line, input_clique_asns, invalid_asns
-                    )
-                # Get detected Caida IXPs. See paper on site for what this is
-                elif line.startswith("# IXP ASes"):
-                    self._extract_ixp_asns(line, ixp_asns, invalid_asns)
-                # Not a comment, must be a relationship
-                elif not line.startswith("#"):
-                    # Extract all customer provider pairs
-                    if "-1" in line:
-                        self._extract_provider_customers(line, cp_links, invalid_asns)
-                    # Extract all peers
-                    else:
-                        self._extract_peers(line, peer_links, invalid_asns)
+        The file is only parsed once (into arrays), so removing invalid_asns
+        (such as the stubs) is just a mask over the arrays
+        """
+
+        input_clique_asns, ixp_asns, cp_array, peer_array = (
+            self._get_relationship_arrays(dl_path)
+        )
+        if invalid_asns:
+            invalid_array = np.fromiter(invalid_asns, dtype=np.int64)
+            cp_array = cp_array[~np.isin(cp_array, invalid_array).any(axis=1)]
+            peer_array = peer_array[~np.isin(peer_array, invalid_array).any(axis=1)]
+            input_clique_asns = input_clique_asns - invalid_asns
+            ixp_asns = ixp_asns - invalid_asns
 
         return ASGraphInfo(
-            customer_provider_links=frozenset(cp_links),
-            peer_links=frozenset(peer_links),
-            ixp_asns=frozenset(ixp_asns),
-            input_clique_asns=frozenset(input_clique_asns),
+            customer_provider_links=frozenset(
+                [
+                    CPLink(customer_asn=customer_asn, provider_asn=provider_asn)
+                    for provider_asn, customer_asn in cp_array.tolist()
+                ]
+            ),
+            peer_links=frozenset(
+                [PeerLink(asn1, asn2) for asn1, asn2 in peer_array.tolist()]
+            ),
+            ixp_asns=ixp_asns,
+            input_clique_asns=input_clique_asns,
         )
 
     def _get_as_graph(self, as_graph_info: ASGraphInfo) -> ASGraph:
@@ -86,6 +99,133 @@ class CAIDAASGraphConstructor(ASGraphConstructor):
     # Parsing funcs #
     #################
 
+    def _get_relationship_arrays(
+        self, dl_path: Path
+    ) -> tuple[frozenset[int], frozenset[int], NDArray[np.int64], NDArray[np.int64]]:
+        """Parses the file into input clique ASNs, IXP ASNs, and link arrays
+
+        Customer provider links are rows of (provider, customer), and peer
+        links are rows of sorted ASNs. Both are deduplicated (and sorted).
+
+        Rather than splitting each line in python, the file is read in large
+        chunks (and .bz2 files are decompressed on the fly), and each chunk
+        is converted to integers in bulk by numpy. Results are cached, since
+        the file is parsed again when removing stubs
+
+        Raises a ValueError with the line number for malformed lines
+        """
+
+        cached = self._relationship_arrays_cache.get(dl_path)
+        if cached is not None:
+            return cached
+
+        input_clique_asns: set[int] = set()
+        ixp_asns: set[int] = set()
+        rel_arrays: list[NDArray[np.int64]] = list()
+
+        f: IO[bytes] = (
+            bz2.open(dl_path, "rb") if dl_path.suffix == ".bz2" else dl_path.open("rb")
+        )
+        with f:
+            leftover = b""
+            # Line number of the first line of the next chunk that's parsed
+            line_num = 1
+            for chunk in iter(lambda: f.read(self.parse_chunk_size), b""):
+                # Only parse complete lines
+                lines_end = chunk.rfind(b"\n") + 1
+                if lines_end == 0:
+                    leftover += chunk
+                    continue
+                data = leftover + chunk[:lines_end]
+                rel_arrays.append(
+                    self._parse_chunk(
+                        data, input_clique_asns, ixp_asns, dl_path, line_num
+                    )
+                )
+                line_num += data.count(b"\n")
+                leftover = chunk[lines_end:]
+            if leftover:
+                rel_arrays.append(
+                    self._parse_chunk(
+                        leftover + b"\n", input_clique_asns, ixp_asns, dl_path, line_num
+                    )
+                )
+
+        rel_array = np.concatenate([np.zeros((0, 3), dtype=np.int64), *rel_arrays])
+        # <provider-as>|<customer-as>|-1
+        cp_array = np.unique(rel_array[rel_array[:, 2] == -1, :2], axis=0)
+        # <peer-as>|<peer-as>|0
+        peer_array = np.unique(
+            np.sort(rel_array[rel_array[:, 2] != -1, :2], axis=1), axis=0
+        )
+        # Ensure rows are 2D even when empty
+        cp_array = cp_array.reshape(-1, 2)
+        peer_array = peer_array.reshape(-1, 2)
+
+        rv = (frozenset(input_clique_asns), frozenset(ixp_asns), cp_array, peer_array)
+        self._relationship_arrays_cache[dl_path] = rv
+        return rv
+
+    def _parse_chunk(
+        self,
+        data: bytes,
+        input_clique_asns: set[int],
+        ixp_asns: set[int],
+        dl_path: Path,
+        first_line_num: int,
+    ) -> NDArray[np.int64]:
+        """Parses complete lines into rows of (asn, asn, relationship)
+
+        Comment lines are only used for the input clique and IXPs.
+        first_line_num is the line number of the chunk's first line,
+        which is used in the error for malformed lines
+        """
+
+        for match in _COMMENT_LINE_RE.finditer(data):
+            line = match.group(0).decode()
+            # Get Caida input clique. See paper on site for what this is
+            if line.startswith("# input clique"):
+                self._extract_input_clique_asns(line, input_clique_asns, frozenset())
+            # Get detected Caida IXPs. See paper on site for what this is
+            elif line.startswith("# IXP ASes"):
+                self._extract_ixp_asns(line, ixp_asns, frozenset())
+        try:
+            with warnings.catch_warnings():
+                # Chunks can be all comments
+                warnings.filterwarnings("ignore", "loadtxt: input contained no data")
+                # Skips comments and drops the source column
+                return np.loadtxt(
+                    BytesIO(data),
+                    dtype=np.int64,
+                    delimiter="|",
+                    comments="#",
+                    usecols=(0, 1, 2),
+                    ndmin=2,
+                )
+        except ValueError as e:
+            line_num = first_line_num + self._get_malformed_line_index(data)
+            raise ValueError(
+                f"Malformed relationships file {dl_path}, line {line_num}: {e}"
+            ) from e
+
+    @staticmethod
+    def _get_malformed_line_index(data: bytes) -> int:
+        """Returns the index of the first malformed line within the data"""
+
+        for i, line in enumerate(data.split(b"\n")):
+            if not line.strip() or line.startswith(b"#"):
+                continue
+            cols = line.split(b"|")
+            try:
+                if len(cols) < 3 or any(
+                    not -(2**63) <= int(x) < 2**63 for x in cols[:3]
+                ):
+                    return i
+            except ValueError:
+                return i
+        # Shouldn't happen, since numpy found a malformed line
+        return 0
+
     def _extract_input_clique_asns(
         self, line: str, input_clique_asns: set[int], invalid_asns: frozenset[int]
     ) -> None:
@@ -106,23 +246,3 @@ class CAIDAASGraphConstructor(ASGraphConstructor):
         for asn in line.split(":")[-1].strip().split(" "):
             if int(asn) not in invalid_asns:
                 ixp_asns.add(int(asn))
-
-    def _extract_provider_customers(
-        self, line: str, cp_links: set[CPLink], invalid_asns: frozenset[int]
-    ) -> None:
-        """Extracts provider customers: <provider-as>|<customer-as>|-1"""
-
-        provider_asn, customer_asn, _, source = line.split("|")
-        if all(int(x) not in invalid_asns for x in (provider_asn, customer_asn)):
-            cp_links.add(
-                CPLink(customer_asn=int(customer_asn), provider_asn=int(provider_asn))
-            )
-
-    def _extract_peers(
-        self, line: str, peer_links: set[PeerLink], invalid_asns: frozenset[int]
-    ) -> None:
-        """Extracts peers: <peer-as>|<peer-as>|0|<source>"""
-
-        peer1_asn, peer2_asn, _, source = line.split("|")
-        if all(int(x) not in invalid_asns for x in (peer1_asn, peer2_asn)):
-            peer_links.add(PeerLink(int(peer1_asn), int(peer2_asn)))
@@ -1,4 +1,7 @@
 from .announcement import Announcement
+from .linked_as_path import LinkedASPath
+from .linked_announcement import LinkedAnnouncement
+from .slim_announcement import get_slim_ann_cls
 
 from .ann_containers import LocalRIB
 from .ann_containers import RIBsIn
@@ -49,9 +52,15 @@ from .policies import ASPAFull as ASPAPolicy
 
 from .simulation_engines import BaseSimulationEngine
 from .simulation_engines import SimulationEngine
+from .simulation_engines import NumPySimulationEngine
+
+from .profiler import Profiler
 
 __all__ = [
     "Announcement",
+    "LinkedASPath",
+    "LinkedAnnouncement",
+    "get_slim_ann_cls",
     "LocalRIB",
     "RIBsIn",
     "RIBsOut",
@@ -96,4 +105,6 @@ __all__ = [
     "ASPAPolicy",
     "BaseSimulationEngine",
     "SimulationEngine",
+    "NumPySimulationEngine",
+    "Profiler",
 ]
@@ -1,15 +1,24 @@
-from .recv_queue import RecvQueue
-from .send_queue import SendQueue, SendInfo
-from .local_rib import LocalRIB
-from .ribs_out import RIBsOut
-from .ribs_in import RIBsIn, AnnInfo
+from .ann_container import AnnContainer
+from .fast_ann_container import FastAnnContainer
+from .recv_queue import RecvQueue, FastRecvQueue
+from .send_queue import SendQueue, SendInfo, FastSendQueue
+from .local_rib import LocalRIB, FastLocalRIB
+from .ribs_out import RIBsOut, FastRIBsOut
+from .ribs_in import RIBsIn, AnnInfo, FastRIBsIn
 
 __all__ = [
+    "AnnContainer",
+    "FastAnnContainer",
     "RecvQueue",
+    "FastRecvQueue",
     "SendQueue",
     "SendInfo",
+    "FastSendQueue",
     "LocalRIB",
+    "FastLocalRIB",
     "RIBsOut",
+    "FastRIBsOut",
     "RIBsIn",
     "AnnInfo",
+    "FastRIBsIn",
 ]
@@ -28,6 +28,20 @@ class AnnContainer(UserDict[KeyType, ValueType], Generic[KeyType, ValueType]):
         super().__init_subclass__(*args, **kwargs)
         AnnContainer.subclasses.add(cls)  # type: ignore
 
+    def clear(self) -> None:
+        """Removes all entries
+
+        UserDict inherits clear from MutableMapping, which pops the
+        items one at a time
+        """
+
+        self.data.clear()
+
+    def to_ann_container(self) -> "AnnContainer[KeyType, ValueType]":
+        """Already YamlAble (see FastAnnContainer.to_ann_container)"""
+
+        return self
+
     def __str__(self) -> str:
         """Returns contents of the container as str"""
 
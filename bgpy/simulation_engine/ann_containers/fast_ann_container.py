@@ -0,0 +1,44 @@
+import pprint
+from typing import Any, Generic, TypeVar
+
+from .ann_container import AnnContainer
+
+KeyType = TypeVar("KeyType")
+ValueType = TypeVar("ValueType")
+
+
+class FastAnnContainer(dict[KeyType, ValueType], Generic[KeyType, ValueType]):
+    """Container for announcements backed directly by a dict
+
+    AnnContainer inherits from UserDict, so every get, items, etc goes
+    through a python level method before reaching the dict. This doesn't,
+    and since it never overrides the dict access methods, it doesn't run
+    into the PyPy dict subclass differences that AnnContainer avoids.
+    Subclasses that must track mutations (see FastLocalRIB) override every
+    mutating method, since neither CPython nor PyPy promise that the
+    builtin dict methods call each other.
+
+    This is not YamlAble. Call to_ann_container to convert it to the
+    equivalent AnnContainer for dumping to YAML
+    """
+
+    # The equivalent UserDict based (YamlAble) container
+    AnnContainerCls: type[AnnContainer[Any, Any]] = AnnContainer
+
+    __slots__ = ()
+
+    @property
+    def data(self) -> dict[KeyType, ValueType]:
+        """Same interface as AnnContainer, so that methods can be shared"""
+
+        return self
+
+    def to_ann_container(self) -> AnnContainer[KeyType, ValueType]:
+        """Returns an equivalent AnnContainer, which can be dumped to YAML"""
+
+        return self.AnnContainerCls(self)
+
+    def __str__(self) -> str:
+        """Returns contents of the container as str"""
+
+        return pprint.pformat(dict(self), indent=4)
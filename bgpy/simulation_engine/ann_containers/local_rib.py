@@ -1,16 +1,137 @@
-from typing import TYPE_CHECKING
+from typing import Any, Optional, TYPE_CHECKING
 
 from .ann_container import AnnContainer
+from .fast_ann_container import FastAnnContainer
 
 
 if TYPE_CHECKING:
     from bgpy.simulation_engine import Announcement as Ann
+    from bgpy.simulation_framework.scenarios import PrefixRegistry
+
+
+def get_most_specific_ann(self, prefix_registry: "PrefixRegistry") -> Optional["Ann"]:
+    """Returns the ann of the most specific prefix within the local rib
+
+    The pointer to the most specific prefix is only found again (with the
+    ranks of the scenario's PrefixRegistry) if the RIB changed since
+    """
+
+    data = self.data
+    if not data:
+        return None
+    if self._most_specific_version != self._version:
+        self._most_specific_prefix = prefix_registry.get_most_specific_prefix(data)
+        self._most_specific_version = self._version
+    ann: "Ann" = data[self._most_specific_prefix]
+    return ann
+
+
+@property  # type: ignore
+def version(self) -> int:
+    """Changes whenever the local RIB does"""
+
+    version: int = self._version
+    return version
 
 
 class LocalRIB(AnnContainer[str, "Ann"]):
-    """Local RIB for a BGP AS"""
+    """Local RIB for a BGP AS
+
+    Keeps a pointer to its most specific prefix, so that the traceback
+    doesn't have to scan every prefix. UserDict routes every other
+    mutating method through __setitem__ and __delitem__
+
+    version changes whenever the RIB does, so that the engine can tell
+    whether processing incoming anns changed anything
+    """
+
+    get_most_specific_ann = get_most_specific_ann
+    version = version
+
+    def __init__(self, *args, **kwargs) -> None:
+        self._version: int = 0
+        # Valid only while it was found at the current version
+        self._most_specific_prefix: Optional[str] = None
+        self._most_specific_version: int = -1
+        super().__init__(*args, **kwargs)
 
     def add_ann(self, ann: "Ann"):
         """Adds an announcement to local rib with prefix as key"""
 
+        self._version += 1
         self.data[ann.prefix] = ann
+
+    def __setitem__(self, prefix: str, ann: "Ann") -> None:
+        self._version += 1
+        self.data[prefix] = ann
+
+    def __delitem__(self, prefix: str) -> None:
+        # UserDict's pop goes through here
+        self._version += 1
+        del self.data[prefix]
+
+    def clear(self) -> None:
+        self._version += 1
+        self.data.clear()
+
+
+class FastLocalRIB(FastAnnContainer[str, "Ann"]):
+    """LocalRIB backed directly by a dict
+
+    dict methods never call each other (and PyPy differs on which do),
+    so every mutating method is overridden to change the version.
+    add_ann sets the dict directly, so that the hot path only pays
+    for the version
+    """
+
+    AnnContainerCls = LocalRIB
+
+    __slots__ = ("_version", "_most_specific_prefix", "_most_specific_version")
+
+    get_most_specific_ann = get_most_specific_ann
+    version = version
+
+    def __init__(self, *args, **kwargs) -> None:
+        self._version: int = 0
+        # Valid only while it was found at the current version
+        self._most_specific_prefix: Optional[str] = None
+        self._most_specific_version: int = -1
+        super().__init__(*args, **kwargs)
+
+    def add_ann(self, ann: "Ann"):
+        """Adds an announcement to local rib with prefix as key"""
+
+        self._version += 1
+        dict.__setitem__(self, ann.prefix, ann)
+
+    def __setitem__(self, prefix: str, ann: "Ann") -> None:
+        self._version += 1
+        super().__setitem__(prefix, ann)
+
+    def setdefault(self, prefix: str, ann: "Ann") -> "Ann":  # type: ignore
+        self._version += 1
+        return super().setdefault(prefix, ann)
+
+    def update(self, *args: Any, **kwargs: Any) -> None:
+        self._version += 1
+        super().update(*args, **kwargs)
+
+    def __ior__(self, other: Any) -> "FastLocalRIB":  # type: ignore
+        self.update(other)
+        return self
+
+    def __delitem__(self, prefix: str) -> None:
+        self._version += 1
+        super().__delitem__(prefix)
+
+    def pop(self, prefix: str, *args: Any) -> Any:
+        self._version += 1
+        return super().pop(prefix, *args)
+
+    def popitem(self) -> tuple[str, "Ann"]:
+        self._version += 1
+        return super().popitem()
+
+    def clear(self) -> None:
+        self._version += 1
+        super().clear()
@@ -1,4 +1,5 @@
 from .ann_container import AnnContainer
+from .fast_ann_container import FastAnnContainer
 
 from bgpy.simulation_engine import Announcement as Ann
 
@@ -32,3 +33,25 @@ class RecvQueue(AnnContainer[str, list["Ann"]]):
 
         # mypy can't handle this, just ignore
         return self.data.get(prefix, list())  # type: ignore
+
+
+class FastRecvQueue(FastAnnContainer[str, list["Ann"]]):
+    """RecvQueue backed directly by a dict"""
+
+    AnnContainerCls = RecvQueue
+
+    __slots__ = ()
+
+    def add_ann(self, ann: "Ann"):
+        """Appends ann to the list of recieved ann for that prefix"""
+
+        list_of_anns = self.get(ann.prefix)
+        if list_of_anns:
+            list_of_anns.append(ann)
+        else:
+            self[ann.prefix] = [ann]
+
+    def get_ann_list(self, prefix: str) -> list["Ann"]:
+        """Returns recevied ann list for a given prefix"""
+
+        return self.get(prefix, list())
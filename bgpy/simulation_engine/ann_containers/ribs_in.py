@@ -1,9 +1,10 @@
 import dataclasses
-from typing import Iterator, Optional, TYPE_CHECKING
+from typing import Iterator, Optional, Union, TYPE_CHECKING
 
 from yamlable import YamlAble, yaml_info
 
 from .ann_container import AnnContainer
+from .fast_ann_container import FastAnnContainer
 
 if TYPE_CHECKING:
     from bgpy.enums import Relationships
@@ -32,7 +33,7 @@ class RIBsIn(AnnContainer[int, dict[str, AnnInfo]]):
     """
 
     def get_unprocessed_ann_recv_rel(
-        self, neighbor_asn: int, prefix: str
+        self: Union["RIBsIn", "FastRIBsIn"], neighbor_asn: int, prefix: str
     ) -> Optional[AnnInfo]:
         """Returns AnnInfo for a neighbor ASN and prefix
 
@@ -42,7 +43,7 @@ class RIBsIn(AnnContainer[int, dict[str, AnnInfo]]):
         return self.data.get(neighbor_asn, dict()).get(prefix)
 
     def add_unprocessed_ann(
-        self,
+        self: Union["RIBsIn", "FastRIBsIn"],
         unprocessed_ann: "Ann",
         recv_relationship: "Relationships",
     ):
@@ -63,7 +64,9 @@ class RIBsIn(AnnContainer[int, dict[str, AnnInfo]]):
                 unprocessed_ann=unprocessed_ann, recv_relationship=recv_relationship
             )
 
-    def get_ann_infos(self, prefix: str) -> Iterator[AnnInfo]:
+    def get_ann_infos(
+        self: Union["RIBsIn", "FastRIBsIn"], prefix: str
+    ) -> Iterator[AnnInfo]:
         """Returns AnnInfos for a given prefix"""
 
         default_ann_info: AnnInfo = AnnInfo(
@@ -72,7 +75,23 @@ class RIBsIn(AnnContainer[int, dict[str, AnnInfo]]):
         for prefix_ann_info in self.data.values():
             yield prefix_ann_info.get(prefix, default_ann_info)
 
-    def remove_entry(self, neighbor_asn: int, prefix: str):
+    def remove_entry(
+        self: Union["RIBsIn", "FastRIBsIn"], neighbor_asn: int, prefix: str
+    ):
         """Removes AnnInfo from RibsIn"""
 
         del self.data[neighbor_asn][prefix]
+
+
+class FastRIBsIn(FastAnnContainer[int, dict[str, AnnInfo]]):
+    """RIBsIn backed directly by a dict"""
+
+    AnnContainerCls = RIBsIn
+
+    __slots__ = ()
+
+    # Methods only use self.data, which FastAnnContainer provides
+    get_unprocessed_ann_recv_rel = RIBsIn.get_unprocessed_ann_recv_rel
+    add_unprocessed_ann = RIBsIn.add_unprocessed_ann
+    get_ann_infos = RIBsIn.get_ann_infos
+    remove_entry = RIBsIn.remove_entry
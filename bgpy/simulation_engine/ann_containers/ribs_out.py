@@ -1,6 +1,7 @@
-from typing import Iterator, Optional
+from typing import Iterator, Optional, Union
 
 from .ann_container import AnnContainer
+from .fast_ann_container import FastAnnContainer
 
 from bgpy.simulation_engine import Announcement as Ann
 
@@ -11,12 +12,16 @@ class RIBsOut(AnnContainer[int, dict[str, Ann]]):
     neighbor: {prefix: announcement}
     """
 
-    def get_ann(self, neighbor_asn: int, prefix: str) -> Optional[Ann]:
+    def get_ann(
+        self: Union["RIBsOut", "FastRIBsOut"], neighbor_asn: int, prefix: str
+    ) -> Optional[Ann]:
         """Returns Ann for a given neighbor asn and prefix"""
 
         return self.data.get(neighbor_asn, dict()).get(prefix)
 
-    def add_ann(self, neighbor_asn: int, ann: Ann) -> None:
+    def add_ann(
+        self: Union["RIBsOut", "FastRIBsOut"], neighbor_asn: int, ann: Ann
+    ) -> None:
         """Adds announcement to the ribs out"""
 
         if neighbor_asn in self.data:
@@ -24,12 +29,28 @@ class RIBsOut(AnnContainer[int, dict[str, Ann]]):
         else:
             self.data[neighbor_asn] = {ann.prefix: ann}
 
-    def remove_entry(self, neighbor_asn: int, prefix: str) -> None:
+    def remove_entry(
+        self: Union["RIBsOut", "FastRIBsOut"], neighbor_asn: int, prefix: str
+    ) -> None:
         """Removes ann from ribs out"""
 
         del self.data[neighbor_asn][prefix]
 
-    def neighbors(self) -> Iterator[int]:
+    def neighbors(self: Union["RIBsOut", "FastRIBsOut"]) -> Iterator[int]:
         """Return all neighbors from the ribs out"""
 
         return self.data.keys()  # type: ignore
+
+
+class FastRIBsOut(FastAnnContainer[int, dict[str, Ann]]):
+    """RIBsOut backed directly by a dict"""
+
+    AnnContainerCls = RIBsOut
+
+    __slots__ = ()
+
+    # Methods only use self.data, which FastAnnContainer provides
+    get_ann = RIBsOut.get_ann
+    add_ann = RIBsOut.add_ann
+    remove_entry = RIBsOut.remove_entry
+    neighbors = RIBsOut.neighbors
@@ -1,9 +1,10 @@
 from dataclasses import dataclass
-from typing import Iterator, Optional, TYPE_CHECKING
+from typing import Iterator, Optional, Union, TYPE_CHECKING
 
 from yamlable import YamlAble, yaml_info
 
 from .ann_container import AnnContainer
+from .fast_ann_container import FastAnnContainer
 
 from bgpy.simulation_engine import Announcement as Ann
 
@@ -31,7 +32,7 @@ class SendQueue(AnnContainer[int, dict[str, SendInfo]]):
     {neighbor: {prefix: SendInfo}}
     """
 
-    def add_ann(self, neighbor_asn: int, ann: Ann):
+    def add_ann(self: Union["SendQueue", "FastSendQueue"], neighbor_asn: int, ann: Ann):
         """Adds Ann to be sent"""
 
         # Used to be done by the defaultdict
@@ -68,12 +69,16 @@ class SendQueue(AnnContainer[int, dict[str, SendInfo]]):
             # Add announcement
             send_info.ann = ann
 
-    def get_send_info(self, neighbor_obj: "AS", prefix: str) -> Optional[Ann]:
+    def get_send_info(
+        self: Union["SendQueue", "FastSendQueue"], neighbor_obj: "AS", prefix: str
+    ) -> Optional[Ann]:
         """Returns the SendInfo for a neighbor AS and prefix"""
 
         return self.data.get(neighbor_obj.asn, dict()).get(prefix)
 
-    def info(self, neighbors: list["AS"]) -> Iterator[tuple["AS", str, Ann]]:
+    def info(
+        self: Union["SendQueue", "FastSendQueue"], neighbors: list["AS"]
+    ) -> Iterator[tuple["AS", str, Ann]]:
         """Returns neighbor obj, prefix, announcement"""
 
         for neighbor_obj in neighbors:
@@ -81,3 +86,16 @@ class SendQueue(AnnContainer[int, dict[str, SendInfo]]):
             for prefix, send_info in self.data.get(neighbor_obj.asn, dict()).items():
                 for ann in send_info.anns:
                     yield neighbor_obj, prefix, ann
+
+
+class FastSendQueue(FastAnnContainer[int, dict[str, SendInfo]]):
+    """SendQueue backed directly by a dict"""
+
+    AnnContainerCls = SendQueue
+
+    __slots__ = ()
+
+    # Methods only use self.data, which FastAnnContainer provides
+    add_ann = SendQueue.add_ann
+    get_send_info = SendQueue.get_send_info
+    info = SendQueue.info
@@ -69,7 +69,8 @@ class Announcement(YamlAble):
 
         if ann is None:
             return False
-        elif isinstance(ann, Announcement):
+        # type(self) for the generated slim Announcement classes
+        elif isinstance(ann, (Announcement, type(self))):
             return (ann.prefix, ann.as_path) == (self.prefix, self.as_path)
         else:
             raise NotImplementedError
@@ -0,0 +1,315 @@
+from dataclasses import FrozenInstanceError
+from typing import Any, Optional, Union
+
+from frozendict import frozendict
+from yamlable import YamlAble, yaml_info
+
+from bgpy.enums import Relationships
+
+from .linked_as_path import LinkedASPath
+
+
+def _cold_attr(name: str) -> property:
+    """Property that reads an optional attribute from the ann's delta"""
+
+    def getter(self: "LinkedAnnouncement") -> Any:
+        return self._delta.get(name, LinkedAnnouncement._defaults[name])
+
+    def setter(self: "LinkedAnnouncement", value: Any) -> None:
+        # Only reachable through object.__setattr__, like a frozen dataclass
+        # The delta may be shared with other anns, so never mutate it
+        object.__setattr__(self, "_delta", {**self._delta, name: value})
+
+    return property(getter, setter, doc=f"{name} (stored in the attribute delta)")
+
+
+@yaml_info(yaml_tag="LinkedAnnouncement")
+class LinkedAnnouncement(YamlAble):
+    """BGP Announcement that copies without copying
+
+    Drop in replacement for Announcement (set it as the ScenarioConfig's AnnCls)
+
+    Copying an Announcement replaces a large frozen dataclass and builds a new
+    tuple for the AS path, which is the bottleneck for BGPy. Here, the AS path
+    is a LinkedASPath, so prepending an ASN is a single node that shares the
+    rest of the path. The optional attributes are stored as a delta dict over
+    the shared defaults, and that delta is shared between copies unless one of
+    them is overwritten. The fields that change on every hop are the only ones
+    that are stored on the ann itself.
+    """
+
+    prefix: str
+    as_path: Union[LinkedASPath, tuple[int, ...]]
+    next_hop_asn: int
+    seed_asn: Optional[int]
+    recv_relationship: Relationships
+    traceback_end: bool
+    _delta: dict[str, Any]
+
+    # The attributes that (almost) every copy sets
+    __slots__ = (
+        "prefix",
+        "as_path",
+        "next_hop_asn",
+        "seed_asn",
+        "recv_relationship",
+        "traceback_end",
+        "_delta",
+    )
+
+    # Defaults of the optional attributes, shared by all anns
+    # See Announcement for what each of these is used for
+    _defaults: frozendict[str, Any] = frozendict(
+        {
+            "timestamp": 0,
+            "withdraw": False,
+            "roa_valid_length": None,
+            "roa_origin": None,
+            "bgpsec_next_asn": None,
+            "bgpsec_as_path": (),
+            "only_to_customers": None,
+            "rovpp_blackhole": False,
+        }
+    )
+
+    # Same order as the fields of Announcement
+    field_names: tuple[str, ...] = (
+        "prefix",
+        "as_path",
+        "next_hop_asn",
+        "seed_asn",
+        "recv_relationship",
+        "timestamp",
+        "withdraw",
+        "traceback_end",
+        "roa_valid_length",
+        "roa_origin",
+        "bgpsec_next_asn",
+        "bgpsec_as_path",
+        "only_to_customers",
+        "rovpp_blackhole",
+    )
+
+    timestamp = _cold_attr("timestamp")
+    withdraw = _cold_attr("withdraw")
+    roa_valid_length = _cold_attr("roa_valid_length")
+    roa_origin = _cold_attr("roa_origin")
+    bgpsec_next_asn = _cold_attr("bgpsec_next_asn")
+    bgpsec_as_path = _cold_attr("bgpsec_as_path")
+    only_to_customers = _cold_attr("only_to_customers")
+    rovpp_blackhole = _cold_attr("rovpp_blackhole")
+
+    def __init__(
+        self,
+        prefix: str,
+        as_path: Union[tuple[int, ...], LinkedASPath],
+        next_hop_asn: Optional[int] = None,
+        seed_asn: Optional[int] = None,
+        recv_relationship: Relationships = Relationships.ORIGIN,
+        traceback_end: bool = False,
+        **optional_attrs: Any,
+    ) -> None:
+        for name in optional_attrs:
+            if name not in self._defaults:
+                raise TypeError(f"{self.__class__.__name__} has no attribute {name}")
+        self._init(
+            prefix,
+            as_path,
+            next_hop_asn,
+            seed_asn,
+            recv_relationship,
+            traceback_end,
+            # Don't store values that are just the defaults
+            {k: v for k, v in optional_attrs.items() if v != self._defaults[k]},
+        )
+
+    def _init(
+        self,
+        prefix: str,
+        as_path: Any,
+        next_hop_asn: Optional[int],
+        seed_asn: Optional[int],
+        recv_relationship: Relationships,
+        traceback_end: bool,
+        delta: dict[str, Any],
+    ) -> None:
+        """Sets all slots, defaulting seed_asn and next_hop_asn
+
+        Same defaults as Announcement.__post_init__
+        """
+
+        if isinstance(as_path, tuple):
+            as_path = LinkedASPath.from_tuple(as_path) or ()
+        if seed_asn is None and len(as_path) == 1:
+            seed_asn = as_path[0]
+        if next_hop_asn is None:
+            if len(as_path) == 1:
+                next_hop_asn = as_path[0]
+            else:
+                raise ValueError("Must set next_hop_asn")
+
+        setter = object.__setattr__
+        setter(self, "prefix", prefix)
+        setter(self, "as_path", as_path)
+        setter(self, "next_hop_asn", next_hop_asn)
+        setter(self, "seed_asn", seed_asn)
+        setter(self, "recv_relationship", recv_relationship)
+        setter(self, "traceback_end", traceback_end)
+        setter(self, "_delta", delta)
+
+    def __setattr__(self, name: str, value: Any) -> None:
+        raise FrozenInstanceError(f"cannot assign to field '{name}'")
+
+    def __delattr__(self, name: str) -> None:
+        raise FrozenInstanceError(f"cannot delete field '{name}'")
+
+    def copy(
+        self, overwrite_default_kwargs: Optional[dict[Any, Any]] = None
+    ) -> "LinkedAnnouncement":
+        """Creates a new ann with proper sim attrs
+
+        Same semantics as Announcement.copy, but the AS path and the
+        optional attributes are shared with this ann rather than copied
+        """
+
+        kwargs = overwrite_default_kwargs or {}
+        delta = self._delta
+        for k, v in kwargs.items():
+            if k in self._defaults:
+                # Copy on write, the delta is shared with this ann
+                if delta is self._delta:
+                    delta = dict(delta)
+                if v == self._defaults[k]:
+                    delta.pop(k, None)
+                else:
+                    delta[k] = v
+            elif k not in self.__slots__:
+                raise TypeError(f"{self.__class__.__name__} has no attribute {k}")
+
+        ann = object.__new__(self.__class__)
+        ann._init(
+            kwargs.get("prefix", self.prefix),
+            kwargs.get("as_path", self.as_path),
+            kwargs.get("next_hop_asn", self.next_hop_asn),
+            # Replace seed asn and traceback end every time by default
+            kwargs.get("seed_asn"),
+            kwargs.get("recv_relationship", self.recv_relationship),
+            kwargs.get("traceback_end", False),
+            delta,
+        )
+        return ann
+
+    def prefix_path_attributes_eq(self, ann: Optional[Any]) -> bool:
+        """Checks prefix and as path equivalency"""
+
+        if ann is None:
+            return False
+        else:
+            return (ann.prefix, ann.as_path) == (self.prefix, self.as_path)
+
+    def bgpsec_valid(self, asn: int) -> bool:
+        """Returns True if valid by BGPSec else False"""
+
+        return bool(self.bgpsec_next_asn == asn and self.bgpsec_as_path == self.as_path)
+
+    @property
+    def invalid_by_roa(self) -> bool:
+        """Returns True if Ann is invalid by ROA
+
+        False means ann is either valid or unknown
+        """
+
+        # Not covered by ROA, unknown
+        if self.roa_origin is None:
+            return False
+        else:
+            return bool(self.origin != self.roa_origin or not self.roa_valid_length)
+
+    @property
+    def valid_by_roa(self) -> bool:
+        """Returns True if Ann is valid by ROA
+
+        False means ann is either invalid or unknown
+        """
+
+        return bool(self.origin == self.roa_origin and self.roa_valid_length)
+
+    @property
+    def unknown_by_roa(self) -> bool:
+        """Returns True if ann is not covered by roa"""
+
+        return not self.invalid_by_roa and not self.valid_by_roa
+
+    @property
+    def covered_by_roa(self) -> bool:
+        """Returns if an announcement has a roa"""
+
+        return not self.unknown_by_roa
+
+    @property
+    def roa_routed(self) -> bool:
+        """Returns bool for if announcement is routed according to ROA"""
+
+        return bool(self.roa_origin != 0)
+
+    @property
+    def origin(self) -> int:
+        """Returns the origin of the announcement"""
+
+        return self.as_path[-1]
+
+    def _values(self) -> tuple[Any, ...]:
+        """Returns the attribute values, in the order of field_names"""
+
+        return tuple(getattr(self, name) for name in self.field_names)
+
+    def __eq__(self, other: object) -> bool:
+        """Equal to any ann (including Announcement) with the same attributes"""
+
+        if isinstance(other, LinkedAnnouncement):
+            return self._values() == other._values()
+        try:
+            other_values = tuple(getattr(other, name) for name in self.field_names)
+        except AttributeError:
+            return NotImplemented
+        return self._values() == other_values
+
+    def __hash__(self) -> int:
+        return hash(self._values())
+
+    def __str__(self) -> str:
+        return f"{self.prefix} {self.as_path} {self.recv_relationship}"
+
+    def __repr__(self) -> str:
+        attrs = ", ".join(f"{k}={v!r}" for k, v in self.__to_yaml_dict__().items())
+        return f"{self.__class__.__name__}({attrs})"
+
+    def __reduce__(self) -> tuple[Any, ...]:
+        """Slots + frozen setattr doesn't work with the default pickling"""
+
+        return (self.__class__._from_kwargs, (self.__to_yaml_dict__(),))
+
+    @classmethod
+    def _from_kwargs(cls, kwargs: dict[str, Any]) -> "LinkedAnnouncement":
+        return cls(**kwargs)
+
+    ##############
+    # Yaml funcs #
+    ##############
+
+    def __to_yaml_dict__(self) -> dict[str, Any]:
+        """This optional method is called when you call yaml.dump()"""
+
+        dct = {name: getattr(self, name) for name in self.field_names}
+        # Store paths as tuples so that the YAML matches Announcement
+        for name in ("as_path", "bgpsec_as_path"):
+            dct[name] = tuple(dct[name])
+        return dct
+
+    @classmethod
+    def __from_yaml_dict__(
+        cls: type["LinkedAnnouncement"], dct: dict[str, Any], yaml_tag: Any
+    ) -> "LinkedAnnouncement":
+        """This optional method is called when you call yaml.load()"""
+
+        return cls(**dct)
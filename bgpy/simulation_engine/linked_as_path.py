@@ -0,0 +1,138 @@
+from typing import Any, Iterator, Optional, Union, overload
+
+
+class LinkedASPath:
+    """Persistent AS path where every hop references its parent path
+
+    Prepending an ASN creates a single node that points at the path it was
+    received with, so all announcements derived from the same seed share
+    their common suffix instead of each holding a full tuple.
+
+    Behaves like a tuple[int, ...] for indexing, iterating, len, membership,
+    equality and hashing, so existing policies can use it unchanged.
+    Index 0 is the most recent ASN, index -1 is the origin
+    """
+
+    __slots__ = ("asn", "parent", "origin", "_len", "_hash")
+
+    def __init__(self, asn: int, parent: Optional["LinkedASPath"] = None) -> None:
+        self.asn: int = asn
+        self.parent: Optional[LinkedASPath] = parent
+        if parent is None:
+            self.origin: int = asn
+            self._len: int = 1
+        else:
+            self.origin = parent.origin
+            self._len = parent._len + 1
+        self._hash: Optional[int] = None
+
+    @classmethod
+    def from_tuple(cls, as_path: tuple[int, ...]) -> Optional["LinkedASPath"]:
+        """Builds a linked path from a tuple, returns None for an empty path"""
+
+        path: Optional[LinkedASPath] = None
+        for asn in reversed(as_path):
+            path = cls(asn, path)
+        return path
+
+    def prepend(self, asn: int) -> "LinkedASPath":
+        """Returns a new path with asn in front, sharing this path"""
+
+        return LinkedASPath(asn, self)
+
+    def as_tuple(self) -> tuple[int, ...]:
+        """Returns the path as a plain tuple"""
+
+        return tuple(self)
+
+    #####################
+    # Sequence protocol #
+    #####################
+
+    def __len__(self) -> int:
+        return self._len
+
+    def __iter__(self) -> Iterator[int]:
+        node: Optional[LinkedASPath] = self
+        while node is not None:
+            yield node.asn
+            node = node.parent
+
+    def __contains__(self, asn: object) -> bool:
+        node: Optional[LinkedASPath] = self
+        while node is not None:
+            if node.asn == asn:
+                return True
+            node = node.parent
+        return False
+
+    @overload
+    def __getitem__(self, index: int) -> int: ...
+
+    @overload
+    def __getitem__(self, index: slice) -> tuple[int, ...]: ...
+
+    def __getitem__(self, index: Union[int, slice]) -> Union[int, tuple[int, ...]]:
+        if isinstance(index, slice):
+            return self.as_tuple()[index]
+        # Fast paths for the indexes that policies use the most
+        if index == 0:
+            return self.asn
+        elif index == -1 or index == self._len - 1:
+            return self.origin
+        if index < 0:
+            index += self._len
+        if not 0 <= index < self._len:
+            raise IndexError("LinkedASPath index out of range")
+        node = self
+        for _ in range(index):
+            # Can't be None, index was bounds checked above
+            node = node.parent  # type: ignore
+        return node.asn
+
+    def __add__(self, other: tuple[int, ...]) -> tuple[int, ...]:
+        """Appending to the origin side can't share nodes, so return a tuple"""
+
+        return self.as_tuple() + tuple(other)
+
+    def __radd__(self, other: tuple[int, ...]) -> "LinkedASPath":
+        """Supports (asn,) + path, which is how policies prepend"""
+
+        path = self
+        for asn in reversed(other):
+            path = LinkedASPath(asn, path)
+        return path
+
+    def __eq__(self, other: object) -> bool:
+        if isinstance(other, LinkedASPath):
+            if self is other:
+                return True
+            elif self._len != other._len:
+                return False
+            a: Optional[LinkedASPath] = self
+            b: Optional[LinkedASPath] = other
+            while a is not None and b is not None:
+                if a is b:
+                    return True
+                elif a.asn != b.asn:
+                    return False
+                a, b = a.parent, b.parent
+            return True
+        elif isinstance(other, tuple):
+            return self._len == len(other) and self.as_tuple() == other
+        else:
+            return NotImplemented
+
+    def __hash__(self) -> int:
+        # Must hash the same as the equivalent tuple
+        if self._hash is None:
+            self._hash = hash(self.as_tuple())
+        return self._hash
+
+    def __repr__(self) -> str:
+        return repr(self.as_tuple())
+
+    def __reduce__(self) -> tuple[Any, ...]:
+        """Pickles as a tuple so that deep paths don't hit recursion limits"""
+
+        return (LinkedASPath.from_tuple, (self.as_tuple(),))
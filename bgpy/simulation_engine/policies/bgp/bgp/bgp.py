@@ -1,4 +1,4 @@
-from typing import Any, Optional, TYPE_CHECKING
+from typing import Any, Optional, TYPE_CHECKING, Union
 from weakref import CallableProxyType
 
 # Propagation functionality
@@ -15,6 +15,7 @@ from .process_incoming_funcs import seed_ann
 from .process_incoming_funcs import receive_ann
 from .process_incoming_funcs import process_incoming_anns
 from .process_incoming_funcs import _valid_ann
+from .process_incoming_funcs import _counted_valid_ann
 from .process_incoming_funcs import _copy_and_process
 from .process_incoming_funcs import _reset_q
 
@@ -26,7 +27,9 @@ from .gao_rexford import _get_best_ann_by_lowest_neighbor_asn_tiebreaker
 
 from bgpy.simulation_engine.policies.policy import Policy
 from bgpy.simulation_engine.ann_containers import LocalRIB
+from bgpy.simulation_engine.ann_containers import FastLocalRIB
 from bgpy.simulation_engine.ann_containers import RecvQueue
+from bgpy.simulation_engine.ann_containers import FastRecvQueue
 
 if TYPE_CHECKING:
     from bgpy.as_graphs import AS
@@ -34,11 +37,15 @@ if TYPE_CHECKING:
 
 class BGP(Policy):
     name: str = "BGP"
+    # Dict backed containers are much faster than the UserDict (YamlAble) ones
+    # They are only converted to the YamlAble containers in __to_yaml_dict__
+    LocalRIBCls: type[Union[LocalRIB, FastLocalRIB]] = FastLocalRIB
+    RecvQueueCls: type[Union[RecvQueue, FastRecvQueue]] = FastRecvQueue
 
     def __init__(
         self,
-        _local_rib: Optional[LocalRIB] = None,
-        _recv_q: Optional[RecvQueue] = None,
+        _local_rib: Optional[Union[LocalRIB, FastLocalRIB]] = None,
+        _recv_q: Optional[Union[RecvQueue, FastRecvQueue]] = None,
         as_: Optional["AS"] = None,
     ) -> None:
         """Add local rib and data structures here
@@ -49,11 +56,44 @@ class BGP(Policy):
         This is also useful for regenerating an AS from YAML
         """
 
-        self._local_rib = _local_rib if _local_rib else LocalRIB()
-        self._recv_q = _recv_q if _recv_q else RecvQueue()
+        self._local_rib: Union[LocalRIB, FastLocalRIB] = (
+            _local_rib if _local_rib else self.LocalRIBCls()
+        )
+        self._recv_q: Union[RecvQueue, FastRecvQueue] = (
+            _recv_q if _recv_q else self.RecvQueueCls()
+        )
         # This gets set within the AS class so it's fine
         self.as_: CallableProxyType["AS"] = as_  # type: ignore
 
+    def reset(self) -> None:
+        """Clears the containers in place so the policy can be reused
+
+        Subclasses that add containers must extend this
+        """
+
+        self._local_rib.clear()
+        self._recv_q.clear()
+
+    ##################
+    # Frontier funcs #
+    ##################
+
+    def has_incoming_anns(self) -> bool:
+        return bool(self._recv_q)
+
+    def clear_incoming_anns(self) -> None:
+        self._recv_q.clear()
+
+    def has_anns_to_send(self) -> bool:
+        return bool(self._local_rib) or self.has_queued_anns()
+
+    def has_queued_anns(self) -> bool:
+        return False
+
+    @property
+    def local_rib_version(self) -> Optional[int]:
+        return self._local_rib.version
+
     # Propagation functionality
     propagate_to_providers = propagate_to_providers
     propagate_to_customers = propagate_to_customers
@@ -68,6 +108,7 @@ class BGP(Policy):
     receive_ann = receive_ann
     process_incoming_anns = process_incoming_anns
     _valid_ann = _valid_ann
+    _counted_valid_ann = _counted_valid_ann
     _copy_and_process = _copy_and_process
     _reset_q = _reset_q
 
@@ -86,7 +127,10 @@ class BGP(Policy):
     def __to_yaml_dict__(self) -> dict[Any, Any]:
         """This optional method is called when you call yaml.dump()"""
 
-        return {"_local_rib": self._local_rib, "_recv_q": self._recv_q}
+        return {
+            "_local_rib": self._local_rib.to_ann_container(),
+            "_recv_q": self._recv_q.to_ann_container(),
+        }
 
     @classmethod
     def __from_yaml_dict__(cls, dct, yaml_tag) -> Policy:
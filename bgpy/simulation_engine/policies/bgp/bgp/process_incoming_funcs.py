@@ -1,6 +1,5 @@
 from typing import Any, Optional, TYPE_CHECKING
 
-from bgpy.simulation_engine.ann_containers import RecvQueue
 
 if TYPE_CHECKING:
     from bgpy.enums import Relationships
@@ -41,6 +40,13 @@ def process_incoming_anns(
 ) -> None:
     """Process all announcements that were incoming from a specific rel"""
 
+    # Only set while profiling (see Profiler). Counted up front or through
+    # _counted_valid_ann, so that the loop below doesn't count per ann
+    ann_counts = self._ann_counts
+    valid_ann = self._valid_ann
+    if ann_counts is not None:
+        ann_counts["received"] += sum(map(len, self._recv_q.values()))
+        valid_ann = self._counted_valid_ann
     # For each prefix, get all anns recieved
     for prefix, ann_list in self._recv_q.items():
         # Get announcement currently in local rib
@@ -54,7 +60,7 @@ def process_incoming_anns(
         for new_ann in ann_list:
             # Make sure there are no loops
             # In ROV subclass also check roa validity
-            if self._valid_ann(new_ann, from_rel):
+            if valid_ann(new_ann, from_rel):
                 new_ann_processed = self._copy_and_process(new_ann, from_rel)
 
                 current_ann = self._get_best_ann_by_gao_rexford(
@@ -66,6 +72,8 @@ def process_incoming_anns(
             assert current_ann, "mypy type check"
             # Save to local rib
             self._local_rib.add_ann(current_ann)
+            if ann_counts is not None:
+                ann_counts["accepted"] += 1
 
     self._reset_q(reset_q)
 
@@ -81,6 +89,18 @@ def _valid_ann(
     return self.as_.asn not in ann.as_path
 
 
+def _counted_valid_ann(
+    self: "BGP",
+    ann: "Ann",
+    recv_relationship: "Relationships",
+) -> bool:
+    """_valid_ann that counts the ann as copied or rejected while profiling"""
+
+    valid = self._valid_ann(ann, recv_relationship)
+    self._ann_counts["copied" if valid else "rejected"] += 1  # type: ignore
+    return valid
+
+
 def _copy_and_process(
     self: "BGP",
     ann: "Ann",
@@ -104,7 +124,10 @@ def _copy_and_process(
 
 
 def _reset_q(self: "BGP", reset_q: bool) -> None:
-    """Resets the recieve q"""
+    """Resets the recieve q
+
+    Cleared in place rather than replaced to avoid reallocating it
+    """
 
     if reset_q:
-        self._recv_q = RecvQueue()
+        self._recv_q.clear()
@@ -1,4 +1,4 @@
-from typing import Optional, TYPE_CHECKING
+from typing import Optional, TYPE_CHECKING, Union
 
 from .propagate_funcs import _propagate
 from .propagate_funcs import _process_outgoing_ann
@@ -14,8 +14,11 @@ from .process_incoming_funcs import _select_best_ribs_in
 from bgpy.simulation_engine.policies.bgp import BGP
 
 from bgpy.simulation_engine.ann_containers import RIBsIn
+from bgpy.simulation_engine.ann_containers import FastRIBsIn
 from bgpy.simulation_engine.ann_containers import RIBsOut
+from bgpy.simulation_engine.ann_containers import FastRIBsOut
 from bgpy.simulation_engine.ann_containers import SendQueue
+from bgpy.simulation_engine.ann_containers import FastSendQueue
 
 
 if TYPE_CHECKING:
@@ -25,19 +28,40 @@ if TYPE_CHECKING:
 
 class BGPFull(BGP):
     name = "BGP Full"
+    required_ann_attrs: frozenset[str] = frozenset({"withdraw"})
+    RIBsInCls: type[Union[RIBsIn, FastRIBsIn]] = FastRIBsIn
+    RIBsOutCls: type[Union[RIBsOut, FastRIBsOut]] = FastRIBsOut
+    SendQueueCls: type[Union[SendQueue, FastSendQueue]] = FastSendQueue
 
     def __init__(
         self,
         *args,
-        _ribs_in: Optional[RIBsIn] = None,
-        _ribs_out: Optional[RIBsOut] = None,
-        _send_q: Optional[SendQueue] = None,
+        _ribs_in: Optional[Union[RIBsIn, FastRIBsIn]] = None,
+        _ribs_out: Optional[Union[RIBsOut, FastRIBsOut]] = None,
+        _send_q: Optional[Union[SendQueue, FastSendQueue]] = None,
         **kwargs,
     ):
         super(BGPFull, self).__init__(*args, **kwargs)
-        self._ribs_in: RIBsIn = _ribs_in if _ribs_in else RIBsIn()
-        self._ribs_out: RIBsOut = _ribs_out if _ribs_out else RIBsOut()
-        self._send_q: SendQueue = _send_q if _send_q else SendQueue()
+        self._ribs_in: Union[RIBsIn, FastRIBsIn] = (
+            _ribs_in if _ribs_in else self.RIBsInCls()
+        )
+        self._ribs_out: Union[RIBsOut, FastRIBsOut] = (
+            _ribs_out if _ribs_out else self.RIBsOutCls()
+        )
+        self._send_q: Union[SendQueue, FastSendQueue] = (
+            _send_q if _send_q else self.SendQueueCls()
+        )
+
+    def reset(self) -> None:
+        """Clears the containers in place so the policy can be reused"""
+
+        super(BGPFull, self).reset()
+        self._ribs_in.clear()
+        self._ribs_out.clear()
+        self._send_q.clear()
+
+    def has_queued_anns(self) -> bool:
+        return bool(self._send_q)
 
     # Propagation functions
     _propagate = _propagate
@@ -75,9 +99,9 @@ class BGPFull(BGP):
         as_dict = super(BGPFull, self).__to_yaml_dict__()
         as_dict.update(
             {
-                "_ribs_in": self._ribs_in,
-                "_ribs_out": self._ribs_out,
-                "_send_q": self._send_q,
+                "_ribs_in": self._ribs_in.to_ann_container(),
+                "_ribs_out": self._ribs_out.to_ann_container(),
+                "_send_q": self._send_q.to_ann_container(),
             }
         )
         return as_dict
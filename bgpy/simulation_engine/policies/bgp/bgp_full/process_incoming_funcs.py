@@ -22,6 +22,13 @@ def process_incoming_anns(
 ):
     """Process all announcements that were incoming from a specific rel"""
 
+    # Only set while profiling (see Profiler). Counted up front or through
+    # _counted_valid_ann, so that the loop below doesn't count per ann
+    ann_counts = self._ann_counts
+    valid_ann = self._valid_ann
+    if ann_counts is not None:
+        ann_counts["received"] += sum(map(len, self._recv_q.values()))
+        valid_ann = self._counted_valid_ann
     for prefix, anns in self._recv_q.items():
         # Get announcement currently in local rib
         _local_rib_ann: Optional["Ann"] = self._local_rib.get(prefix)
@@ -84,7 +91,7 @@ def process_incoming_anns(
                             current_processed = True
 
             # If it's valid, process it
-            elif self._valid_ann(ann, from_rel):
+            elif valid_ann(ann, from_rel):
                 new_ann_is_better = self._new_ann_better(
                     current_ann, current_processed, from_rel, ann, False, from_rel
                 )
@@ -115,6 +122,8 @@ def process_incoming_anns(
             current_ann = self._copy_and_process(current_ann, from_rel)
             # Save to local rib
             self._local_rib.add_ann(current_ann)
+            if ann_counts is not None:
+                ann_counts["accepted"] += 1
 
     self._reset_q(reset_q)
 
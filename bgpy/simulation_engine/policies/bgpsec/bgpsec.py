@@ -19,6 +19,9 @@ class BGPSec(BGP):
     """
 
     name = "BGPSec"
+    required_ann_attrs: frozenset[str] = frozenset(
+        {"bgpsec_next_asn", "bgpsec_as_path"}
+    )
 
     def seed_ann(self, ann: "Ann") -> None:  # type: ignore
         """Seeds announcement at this AS and initializes BGPSec path"""
@@ -12,6 +12,7 @@ class OnlyToCustomers(BGP):
     """An Policy that deploys OnlyToCustomers"""
 
     name: str = "OnlyToCustomers"
+    required_ann_attrs: frozenset[str] = frozenset({"only_to_customers"})
 
     def _valid_ann(self, ann: "Ann", from_rel: Relationships) -> bool:  # type: ignore
         """Returns False if from peer/customer when only_to_customers is set"""
@@ -1,16 +1,41 @@
 from abc import ABCMeta, abstractmethod
-from typing import Any, TYPE_CHECKING
+from typing import Any, Optional, TYPE_CHECKING
 
 from yamlable import YamlAble, yaml_info_decorate
 
 if TYPE_CHECKING:
+    from collections import Counter
+
     from bgpy.enums import Relationships
     from bgpy.simulation_engine import Announcement as Ann
     from bgpy.simulation_framework import Scenario
 
 
 class Policy(YamlAble, metaclass=ABCMeta):
+    """Base class for the policy of an AS
+
+    The SimulationEngine only calls process_incoming_anns for ASes that were
+    sent anns (see has_incoming_anns), and only ASes whose local RIB
+    changed (see local_rib_version) or that have anns queued to send
+    (see has_queued_anns) propagate afterwards. By default policies
+    are always processed and always propagate.
+
+    process_incoming_anns_when_idle: set this to True if the policy changes
+        its local RIB even when it was sent nothing, such as ROV++V1 Lite,
+        which adds blackholes for non routed prefixes. Otherwise these ASes
+        are silently skipped by the engine
+    """
+
     name: str = "AbstractPolicy"
+    # See the class docstring
+    process_incoming_anns_when_idle: bool = False
+    # Counts of anns received, rejected, copied and accepted, which
+    # process_incoming_anns adds to. Only set while profiling (see Profiler)
+    _ann_counts: Optional["Counter[str]"] = None
+    # Optional Announcement attributes that this policy reads or writes
+    # Subclasses only list their own, parents' attrs are added automatically
+    # Used to generate slim Announcement classes (see slim_announcement.py)
+    required_ann_attrs: frozenset[str] = frozenset()
     subclass_to_name_dict: dict[type["Policy"], str] = {}
     name_to_subclass_dict: dict[str, type["Policy"]] = {}
 
@@ -24,6 +49,9 @@ class Policy(YamlAble, metaclass=ABCMeta):
         assert hasattr(cls, "name"), "Policy must have a name"
         # yamlable not up to date with mypy
         yaml_info_decorate(cls, yaml_tag=cls.name)  # type: ignore
+        cls.required_ann_attrs = frozenset().union(
+            *[vars(Cls).get("required_ann_attrs", ()) for Cls in cls.__mro__]
+        )
         cls.subclass_to_name_dict[cls] = cls.name
         cls.name_to_subclass_dict[cls.name] = cls
 
@@ -41,6 +69,54 @@ class Policy(YamlAble, metaclass=ABCMeta):
         else:
             return NotImplemented
 
+    def reset(self) -> None:
+        """Clears all announcements so that the policy can be reused
+
+        Called by the engine instead of creating a new policy when the AS
+        keeps the same class for the next scenario. Policies with their
+        own containers should clear them in place (see BGP)
+        """
+
+        # Default for policies that don't know how to clear themselves
+        self.__init__(as_=self.as_)  # type: ignore
+
+    ##################
+    # Frontier funcs #
+    ##################
+
+    def has_incoming_anns(self) -> bool:
+        """Returns True if the policy may have been sent anns to process"""
+
+        return True
+
+    def clear_incoming_anns(self) -> None:
+        """Drops the anns that were sent to the policy, without processing them"""
+
+        pass
+
+    def has_anns_to_send(self) -> bool:
+        """Returns True if propagating from the policy may send anns"""
+
+        return True
+
+    def has_queued_anns(self) -> bool:
+        """Returns True if the policy has anns queued to send
+
+        Such policies propagate even if their local RIB didn't change
+        """
+
+        return True
+
+    @property
+    def local_rib_version(self) -> Optional[int]:
+        """Changes whenever the local RIB does
+
+        None if the local RIB isn't tracked, in which case the
+        policy always propagates after processing incoming anns
+        """
+
+        return None
+
     ##########################
     # Process incoming funcs #
     ##########################
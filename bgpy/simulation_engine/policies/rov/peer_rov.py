@@ -11,6 +11,7 @@ class PeerROV(BGP):
     """An Policy that deploys ROV only for peers"""
 
     name: str = "PeerROV"
+    required_ann_attrs: frozenset[str] = frozenset({"roa_valid_length", "roa_origin"})
 
     # mypy doesn't understand that this func is valid
     def _valid_ann(self, ann: "Ann", *args, **kwargs) -> bool:  # type: ignore
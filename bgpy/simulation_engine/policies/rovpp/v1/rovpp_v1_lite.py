@@ -16,6 +16,9 @@ class ROVPPV1Lite(ROV):
     """
 
     name: str = "ROV++V1 Lite"
+    # Non routed blackholes are added even without incoming anns
+    process_incoming_anns_when_idle: bool = True
+    required_ann_attrs: frozenset[str] = frozenset({"rovpp_blackhole"})
 
     # mypy doesn't understand this subclass
     def _policy_propagate(  # type: ignore
@@ -123,7 +126,7 @@ class ROVPPV1Lite(ROV):
         if ann.recv_relationship == Relationships.ORIGIN:
             return ()
         # For each subprefix in this scenario of the prefix within the local RIB
-        for subprefix in scenario.ordered_prefix_subprefix_dict[ann.prefix]:
+        for subprefix in scenario.prefix_registry.subprefixes(ann.prefix):
             # For each subprefix ann that was recieved
             # NOTE: these wouldn't be in the local RIB since they're invalid
             # and dropped by default (but they are recieved so we can check there)
@@ -139,11 +142,15 @@ class ROVPPV1Lite(ROV):
     def _add_blackholes_to_local_rib(self, blackholes: tuple["Ann", ...]) -> None:
         """Adds all blackholes to the local RIB"""
 
+        # Only set while profiling (see Profiler)
+        ann_counts = self._ann_counts
         for blackhole in blackholes:
             existing_ann = self._local_rib.get(blackhole.prefix)
             # Don't overwrite valid existing announcements
             if existing_ann is None or existing_ann.invalid_by_roa:
                 self._local_rib.add_ann(blackhole)
+                if ann_counts is not None:
+                    ann_counts["blackholes"] += 1
 
     def _recount_holes(self, propagation_round: int) -> None:
         # It's possible that we had a previously valid prefix
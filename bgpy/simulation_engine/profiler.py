@@ -0,0 +1,194 @@
+from collections import Counter, defaultdict
+from contextlib import contextmanager
+import json
+from pathlib import Path
+from time import perf_counter
+from typing import Any, Iterator, TYPE_CHECKING
+
+if TYPE_CHECKING:
+    from bgpy.enums import Relationships
+    from bgpy.simulation_engine import Policy
+    from bgpy.simulation_framework import Scenario
+
+
+class Profiler:
+    """Opt-in instrumentation for simulations
+
+    Pass one to the Simulation (or directly to a SimulationEngine) to record
+    wall time per phase (propagation to providers/peers/customers,
+    scenario construction, analyzer, metric tracking, etc), per rank
+    of each propagation phase, and per policy class, along with counts of
+    announcements received, accepted, rejected and copied.
+
+    Counts are taken by the policies themselves within
+    process_incoming_anns (BGP and BGPFull), into the policy's _ann_counts,
+    which is only set while the profiler times the call:
+    received: anns in the recv_q
+    rejected: received anns that fail _valid_ann
+    copied: received anns that pass _valid_ann and are processed
+    accepted: new best anns saved to the local RIB
+    blackholes: blackholes saved to the local RIB (ROV++V1 Lite)
+    Anns for seeded prefixes are received but never processed
+
+    Profilers (such as those of each worker process) merge with +
+    """
+
+    def __init__(self) -> None:
+        # NOTE: no lambda default factories, since this must be picklable
+        # for multiprocessing
+        # phase: seconds
+        self.phase_times: defaultdict[str, float] = defaultdict(float)
+        # phase: number of times it was timed
+        self.phase_calls: Counter[str] = Counter()
+        # phase: rank: seconds
+        self.rank_times: dict[str, defaultdict[int, float]] = dict()
+        # policy name: func name: seconds
+        self.policy_times: dict[str, defaultdict[str, float]] = dict()
+        # policy name: counter of ann counts
+        self.ann_counts: defaultdict[str, Counter[str]] = defaultdict(Counter)
+
+    ##################
+    # Timing methods #
+    ##################
+
+    @contextmanager
+    def phase(self, phase: str) -> Iterator[None]:
+        """Times everything within the context as the phase"""
+
+        start = perf_counter()
+        try:
+            yield
+        finally:
+            self.phase_times[phase] += perf_counter() - start
+            self.phase_calls[phase] += 1
+
+    @contextmanager
+    def rank(self, phase: str, rank: int) -> Iterator[None]:
+        """Times everything within the context as the rank of the phase"""
+
+        start = perf_counter()
+        try:
+            yield
+        finally:
+            self._rank_times(phase)[rank] += perf_counter() - start
+
+    def process_incoming_anns(
+        self,
+        policy: "Policy",
+        *,
+        from_rel: "Relationships",
+        propagation_round: int,
+        scenario: "Scenario",
+    ) -> None:
+        """Times and counts a policy processing its incoming anns"""
+
+        policy._ann_counts = self.ann_counts[policy.name]
+        start = perf_counter()
+        try:
+            policy.process_incoming_anns(
+                from_rel=from_rel,
+                propagation_round=propagation_round,
+                scenario=scenario,
+            )
+        finally:
+            self._policy_times(policy.name)["process_incoming_anns"] += (
+                perf_counter() - start
+            )
+            policy._ann_counts = None
+
+    def propagate(self, policy: "Policy", func_name: str) -> None:
+        """Times a policy's propagate_to_(providers/peers/customers) func"""
+
+        start = perf_counter()
+        getattr(policy, func_name)()
+        self._policy_times(policy.name)[func_name] += perf_counter() - start
+
+    def _rank_times(self, phase: str) -> defaultdict[int, float]:
+        """Returns rank: seconds for the phase"""
+
+        return self.rank_times.setdefault(phase, defaultdict(float))
+
+    def _policy_times(self, name: str) -> defaultdict[str, float]:
+        """Returns func name: seconds for the policy"""
+
+        return self.policy_times.setdefault(name, defaultdict(float))
+
+    #################
+    # Merging funcs #
+    #################
+
+    def __add__(self, other: Any) -> "Profiler":
+        """Merges the other profiler (such as from another process) into a new one"""
+
+        if isinstance(other, Profiler):
+            profiler = self.__class__()
+            for obj in (self, other):
+                for phase, seconds in obj.phase_times.items():
+                    profiler.phase_times[phase] += seconds
+                profiler.phase_calls.update(obj.phase_calls)
+                for phase, rank_times in obj.rank_times.items():
+                    for rank, seconds in rank_times.items():
+                        profiler._rank_times(phase)[rank] += seconds
+                for name, func_times in obj.policy_times.items():
+                    for func_name, seconds in func_times.items():
+                        profiler._policy_times(name)[func_name] += seconds
+                for name, counts in obj.ann_counts.items():
+                    profiler.ann_counts[name].update(counts)
+            return profiler
+        else:
+            return NotImplemented
+
+    def __radd__(self, other: Any) -> "Profiler":
+        # For sum()
+        if other == 0:
+            return self
+        return self.__add__(other)
+
+    ##############
+    # JSON funcs #
+    ##############
+
+    def to_json_dict(self) -> dict[str, Any]:
+        """Returns a JSON serializable summary"""
+
+        return {
+            "phase_times": dict(self.phase_times),
+            "phase_calls": dict(self.phase_calls),
+            # JSON keys must be strs
+            "rank_times": {
+                phase: {str(rank): v for rank, v in sorted(rank_times.items())}
+                for phase, rank_times in self.rank_times.items()
+            },
+            "policy_times": {k: dict(v) for k, v in self.policy_times.items()},
+            "ann_counts": {k: dict(v) for k, v in self.ann_counts.items()},
+        }
+
+    @classmethod
+    def from_json_dict(cls, dct: dict[str, Any]) -> "Profiler":
+        """Inverse of to_json_dict"""
+
+        profiler = cls()
+        profiler.phase_times.update(dct["phase_times"])
+        profiler.phase_calls.update(dct["phase_calls"])
+        for phase, rank_times in dct["rank_times"].items():
+            for rank, seconds in rank_times.items():
+                profiler._rank_times(phase)[int(rank)] = seconds
+        for name, func_times in dct["policy_times"].items():
+            profiler._policy_times(name).update(func_times)
+        for name, counts in dct["ann_counts"].items():
+            profiler.ann_counts[name].update(counts)
+        return profiler
+
+    def write_json(self, path: Path) -> None:
+        """Writes the summary to a JSON file"""
+
+        path.parent.mkdir(parents=True, exist_ok=True)
+        with path.open("w") as f:
+            json.dump(self.to_json_dict(), f, indent=4)
+
+    @classmethod
+    def read_json(cls, path: Path) -> "Profiler":
+        """Reads a summary written with write_json"""
+
+        with path.open() as f:
+            return cls.from_json_dict(json.load(f))
@@ -1,4 +1,5 @@
 from .base_simulation_engine import BaseSimulationEngine
 from .simulation_engine import SimulationEngine
+from .numpy_simulation_engine import NumPySimulationEngine
 
-__all__ = ["BaseSimulationEngine", "SimulationEngine"]
+__all__ = ["BaseSimulationEngine", "SimulationEngine", "NumPySimulationEngine"]
@@ -1,6 +1,7 @@
 from abc import ABC, abstractmethod
+from contextlib import nullcontext
 from pathlib import Path
-from typing import Any, Optional, TYPE_CHECKING
+from typing import Any, ContextManager, Optional, TYPE_CHECKING
 
 from frozendict import frozendict
 from yamlable import YamlAble, yaml_info, yaml_info_decorate
@@ -11,6 +12,7 @@ from ..policies import Policy
 if TYPE_CHECKING:
     from bgpy.as_graphs import ASGraph
     from bgpy.simulation_engine.announcement import Announcement as Ann
+    from bgpy.simulation_engine.profiler import Profiler
     from bgpy.simulation_framework import Scenario
 
 
@@ -39,6 +41,7 @@ class BaseSimulationEngine(YamlAble, ABC):
         # Useful for C++ Engine
         cached_as_graph_tsv_path: Optional[Path] = None,
         ready_to_run_round: int = -1,
+        profiler: Optional["Profiler"] = None,
     ) -> None:
         """Saves read_to_run_rund attr and inits superclass"""
 
@@ -49,6 +52,8 @@ class BaseSimulationEngine(YamlAble, ABC):
         # We use a number instead of a bool so that we can indicate for
         # each round whether it is ready to run or not
         self.ready_to_run_round: int = ready_to_run_round
+        # Opt in instrumentation. Private since it's not part of the YAML
+        self._profiler: Optional["Profiler"] = profiler
 
     def __eq__(self, other) -> bool:
         """Returns if two simulators contain the same BGPDAG's"""
@@ -60,6 +65,48 @@ class BaseSimulationEngine(YamlAble, ABC):
         else:
             return NotImplemented
 
+    @property
+    def profiler(self) -> Optional["Profiler"]:
+        return self._profiler
+
+    @property
+    def equivalence_classes(self) -> frozendict[int, tuple[int, ...]]:
+        """{representative ASN: member ASNs (including the representative)}
+
+        Only the representatives of equivalence classes process anns, and
+        the rest of each class takes their outcomes. Empty by default
+        """
+
+        return frozendict()
+
+    @property
+    def representatives(self) -> frozendict[int, int]:
+        """{member ASN: representative ASN}, excluding the representatives"""
+
+        return frozendict()
+
+    @property
+    def lazy_asns(self) -> frozenset[int]:
+        """Stubs with empty local RIBs whose anns are processed on demand"""
+
+        return frozenset()
+
+    def profile_phase(self, phase: str) -> ContextManager[None]:
+        """Times the phase if profiling, else does nothing"""
+
+        if self._profiler is None:
+            return nullcontext()
+        else:
+            return self._profiler.phase(phase)
+
+    def _profile_rank(self, phase: str, rank: int) -> ContextManager[None]:
+        """Times the rank of the phase if profiling, else does nothing"""
+
+        if self._profiler is None:
+            return nullcontext()
+        else:
+            return self._profiler.rank(phase, rank)
+
     ###############
     # Setup funcs #
     ###############
@@ -0,0 +1,74 @@
+"""Functions to group topologically identical ASes into equivalence classes"""
+
+from typing import TYPE_CHECKING
+
+from frozendict import frozendict
+
+if TYPE_CHECKING:
+    from bgpy.as_graphs import AS
+    from bgpy.simulation_framework import Scenario
+    from .simulation_engine import SimulationEngine
+
+
+def _set_equivalence_classes(self: "SimulationEngine", scenario: "Scenario") -> None:
+    """Sets the equivalence classes for this trial
+
+    ASes without customers that have the same providers, peers, AS groups,
+    and policy class receive the same announcements and make the same
+    decisions. So only the representative of each class (the lowest ASN)
+    processes announcements, and the rest of the class takes its outcomes.
+
+    ASes that seed announcements, attackers, and victims are never in a
+    class, since they don't behave like the rest of the class
+    """
+
+    excluded_asns = (
+        scenario.attacker_asns
+        | scenario.victim_asns
+        | {ann.seed_asn for ann in scenario.announcements}
+    )
+    equivalence_classes: dict[int, tuple[int, ...]] = dict()
+    representatives: dict[int, int] = dict()
+    for topology_class in self._get_topology_classes():
+        # {policy class: member ASNs}
+        policy_classes: dict[type, list[int]] = dict()
+        for as_obj in topology_class:
+            if as_obj.asn not in excluded_asns:
+                Cls = as_obj.policy.__class__
+                policy_classes.setdefault(Cls, list()).append(as_obj.asn)
+        for members in policy_classes.values():
+            if len(members) > 1:
+                equivalence_classes[members[0]] = tuple(members)
+                for member in members[1:]:
+                    representatives[member] = members[0]
+    self._equivalence_classes = frozendict(equivalence_classes)
+    self._representatives = frozendict(representatives)
+    self._represented_asns = frozenset(representatives)
+
+
+def _get_topology_classes(self: "SimulationEngine") -> tuple[tuple["AS", ...], ...]:
+    """Returns classes of ASes without customers with the same neighbors
+
+    AS groups are part of the class too, so that members are weighted
+    within the same groups by the metric tracker. Cached per AS graph,
+    and each class is sorted by ASN
+    """
+
+    if self._topology_classes is None:
+        asn_groups = self.as_graph.asn_groups
+        topology_classes: dict[tuple[object, ...], list["AS"]] = dict()
+        for as_obj in self.as_graph:
+            if as_obj.customers:
+                continue
+            key = (
+                tuple(x.asn for x in as_obj.providers),
+                tuple(x.asn for x in as_obj.peers),
+                tuple(k for k, asns in asn_groups.items() if as_obj.asn in asns),
+            )
+            topology_classes.setdefault(key, list()).append(as_obj)
+        self._topology_classes = tuple(
+            tuple(sorted(x, key=lambda as_obj: as_obj.asn))
+            for x in topology_classes.values()
+            if len(x) > 1
+        )
+    return self._topology_classes
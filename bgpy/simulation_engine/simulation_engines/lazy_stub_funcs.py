@@ -0,0 +1,86 @@
+"""Functions to evaluate stub ASes on demand rather than during propagation"""
+
+from typing import Optional, TYPE_CHECKING
+
+from bgpy.enums import Relationships
+from bgpy.simulation_engine.policies import BGP
+
+if TYPE_CHECKING:
+    from bgpy.as_graphs import AS
+    from bgpy.simulation_engine.announcement import Announcement as Ann
+    from bgpy.simulation_framework import Scenario
+    from .simulation_engine import SimulationEngine
+
+
+def _set_lazy_asns(self: "SimulationEngine", scenario: "Scenario") -> None:
+    """Sets the stubs that are skipped during propagation
+
+    Stubs without customers only receive anns from their one neighbor,
+    and never send what they receive, so nothing else depends on them.
+    Their anns are left in their recv_q, and are only processed on demand
+    (by get_lazy_ann or evaluate_lazy_ases).
+
+    Stubs that seed anns and attackers are never lazy, and neither are
+    policies that don't use BGP's process_incoming_anns (or that process
+    anns when idle), since that's what the lazy evaluation mirrors
+    """
+
+    excluded_asns = scenario.attacker_asns | {
+        ann.seed_asn for ann in scenario.announcements
+    }
+    self._lazy_asns = frozenset(
+        as_obj.asn
+        for as_obj in self.as_graph
+        if as_obj.stub
+        and not as_obj.customers
+        and as_obj.asn not in excluded_asns
+        and as_obj.asn not in self._represented_asns
+        and not as_obj.policy.process_incoming_anns_when_idle
+        and type(as_obj.policy).process_incoming_anns is BGP.process_incoming_anns
+    )
+
+
+def get_lazy_ann(
+    self: "SimulationEngine", as_obj: "AS", prefix: str
+) -> Optional["Ann"]:
+    """Returns the ann a lazy stub would have in its local RIB for the prefix
+
+    Mirrors BGP.process_incoming_anns for the anns in the stub's recv_q,
+    without adding anything to the local RIB
+    """
+
+    policy = as_obj.policy
+    from_rel = _get_lazy_from_rel(as_obj)
+    best_ann: Optional["Ann"] = None
+    for ann in policy._recv_q.get_ann_list(prefix):
+        if policy._valid_ann(ann, from_rel):
+            best_ann = policy._get_best_ann_by_gao_rexford(
+                best_ann, policy._copy_and_process(ann, from_rel)
+            )
+    return best_ann
+
+
+def evaluate_lazy_ases(
+    self: "SimulationEngine", propagation_round: int, scenario: "Scenario"
+) -> None:
+    """Processes the anns of all lazy stubs, filling their local RIBs
+
+    Afterwards they are regular ASes again, such as for further rounds
+    """
+
+    as_dict = self.as_graph.as_dict
+    for asn in sorted(self._lazy_asns):
+        as_obj = as_dict[asn]
+        as_obj.policy.process_incoming_anns(
+            from_rel=_get_lazy_from_rel(as_obj),
+            propagation_round=propagation_round,
+            scenario=scenario,
+        )
+    self._lazy_asns = frozenset()
+    self._skipped_asns = self._represented_asns
+
+
+def _get_lazy_from_rel(as_obj: "AS") -> Relationships:
+    """Returns the relationship of a stub's one neighbor"""
+
+    return Relationships.PROVIDERS if as_obj.providers else Relationships.PEERS
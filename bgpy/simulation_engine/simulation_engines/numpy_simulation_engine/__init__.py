@@ -0,0 +1,4 @@
+from .numpy_simulation_engine import NumPySimulationEngine
+from .propagation_state import PhaseEdges, PropagationState
+
+__all__ = ["NumPySimulationEngine", "PhaseEdges", "PropagationState"]
@@ -0,0 +1,208 @@
+from pathlib import Path
+from typing import Optional, TYPE_CHECKING
+
+from frozendict import frozendict
+
+from bgpy.simulation_engine.policies import Policy
+
+from ..simulation_engine import SimulationEngine
+
+from .propagation_state import PhaseEdges, PropagationState
+
+# Setup funcs
+from .setup_funcs import _get_policy_kinds
+from .setup_funcs import _get_propagation_state
+from .setup_funcs import _get_phase_edges
+from .setup_funcs import _get_csr_edges
+
+# Propagation funcs
+from .propagation_funcs import _vectorized_propagate
+from .propagation_funcs import _relax
+
+# Local RIB funcs
+from .rib_funcs import _populate_local_ribs
+from .rib_funcs import _get_row_anns
+
+# https://stackoverflow.com/a/57005931/8903959
+if TYPE_CHECKING:
+    from bgpy.as_graphs import ASGraph
+    from bgpy.simulation_engine import Announcement as Ann
+    from bgpy.simulation_engine.profiler import Profiler
+    from bgpy.simulation_framework import Scenario
+
+
+class NumPySimulationEngine(SimulationEngine):
+    """Simulation engine that propagates using NumPy arrays
+
+    Routing state is stored per prefix as arrays over the AS indices
+    of ASGraphArrays, and each rank of each phase is propagated with
+    vectorized operations instead of copying announcements per edge.
+    The results are written back to the local RIBs of the policies,
+    so the data plane outcomes are identical to the SimulationEngine.
+
+    Only BGP, ROV and PeerROV (and subclasses that don't change propagation)
+    are supported. Anything else (or propagating on top of a graph that
+    already has announcements, such as a second propagation round)
+    falls back to the SimulationEngine
+
+    Many trials can also be propagated at once with run_batch. Each trial
+    is then loaded into the AS graph one at a time (with select_batch_trial,
+    setup, and run) so that the analyzer and metric tracker work as usual
+    """
+
+    # Setup funcs
+    _get_policy_kinds = _get_policy_kinds
+    _get_propagation_state = _get_propagation_state
+    _get_phase_edges = _get_phase_edges
+    _get_csr_edges = _get_csr_edges
+
+    # Propagation funcs
+    _vectorized_propagate = _vectorized_propagate
+    _relax = _relax
+
+    # Local RIB funcs
+    _populate_local_ribs = _populate_local_ribs
+    _get_row_anns = _get_row_anns
+
+    def __init__(
+        self,
+        as_graph: "ASGraph",
+        cached_as_graph_tsv_path: Optional[Path] = None,
+        ready_to_run_round: int = -1,
+        profiler: Optional["Profiler"] = None,
+    ) -> None:
+        super().__init__(
+            as_graph,
+            cached_as_graph_tsv_path=cached_as_graph_tsv_path,
+            ready_to_run_round=ready_to_run_round,
+            profiler=profiler,
+        )
+        # State for the next propagation. None if it must fall back
+        self._propagation_state: Optional[PropagationState] = None
+        # Built once per AS graph
+        self._phase_edges: Optional[PhaseEdges] = None
+        # State and announcements of trials that were propagated in a batch
+        self._batch_state: Optional[PropagationState] = None
+        self._batch_announcements: tuple[tuple["Ann", ...], ...] = ()
+        # Batch trial to load into the local RIBs on the next run
+        self._batch_trial: Optional[int] = None
+
+    ###############
+    # Setup funcs #
+    ###############
+
+    def setup(
+        self,
+        announcements: tuple["Ann", ...] = (),
+        BasePolicyCls: type[Policy] = Policy,
+        non_default_asn_cls_dict: frozendict[int, type[Policy]] = (
+            frozendict()  # type: ignore
+        ),
+        prev_scenario: Optional["Scenario"] = None,
+        attacker_asns: frozenset[int] = frozenset(),
+        AttackerBasePolicyCls: Optional[type[Policy]] = None,
+    ) -> frozenset[type[Policy]]:
+        """Sets AS classes and seeds announcements, then seeds the arrays"""
+
+        policies_used = super().setup(
+            announcements,
+            BasePolicyCls,
+            non_default_asn_cls_dict,
+            prev_scenario,
+            attacker_asns,
+            AttackerBasePolicyCls,
+        )
+        if self._batch_trial is not None:
+            # Already propagated, so the local RIBs come from the batch
+            err = "Announcements don't match those of the selected batch trial"
+            assert announcements == self._batch_announcements[self._batch_trial], err
+            self._propagation_state = None
+        else:
+            policy_kinds = self._get_policy_kinds(
+                BasePolicyCls,
+                non_default_asn_cls_dict,
+                attacker_asns,
+                AttackerBasePolicyCls,
+            )
+            if policy_kinds is None:
+                self._propagation_state = None
+            else:
+                self._propagation_state = self._get_propagation_state(
+                    (announcements,), (policy_kinds,)
+                )
+        return policies_used
+
+    #####################
+    # Propagation funcs #
+    #####################
+
+    def _propagate(self, propagation_round: int, scenario: "Scenario"):
+        """Propagates using arrays when possible, else falls back"""
+
+        state = self._propagation_state
+        # Arrays are only valid for a freshly seeded graph
+        self._propagation_state = None
+        if self._batch_trial is not None:
+            assert self._batch_state, "mypy"
+            with self.profile_phase("populate_local_ribs"):
+                self._populate_local_ribs(self._batch_state, self._batch_trial)
+            self._batch_trial = None
+        elif state is None:
+            super()._propagate(propagation_round, scenario)
+        else:
+            with self.profile_phase("vectorized_propagate"):
+                self._vectorized_propagate(state)
+            with self.profile_phase("populate_local_ribs"):
+                self._populate_local_ribs(state)
+
+    ###############
+    # Batch funcs #
+    ###############
+
+    def run_batch(self, scenarios: tuple["Scenario", ...]) -> bool:
+        """Propagates the first round of many scenarios at once
+
+        Each scenario is a trial with its own rows in the routing state,
+        so the ranks are only iterated over once for the entire batch.
+        Returns False (and propagates nothing) if any scenario uses a policy
+        or announcement that the NumPy engine doesn't support
+        """
+
+        self._batch_state = None
+        self._batch_announcements = ()
+        self._batch_trial = None
+
+        trial_policy_kinds = list()
+        for scenario in scenarios:
+            policy_kinds = self._get_policy_kinds(
+                scenario.scenario_config.BasePolicyCls,
+                scenario.non_default_asn_cls_dict,
+                scenario.attacker_asns,
+                scenario.scenario_config.AttackerBasePolicyCls,
+            )
+            if policy_kinds is None:
+                return False
+            trial_policy_kinds.append(policy_kinds)
+
+        trial_announcements = tuple(x.announcements for x in scenarios)
+        state = self._get_propagation_state(
+            trial_announcements, tuple(trial_policy_kinds)
+        )
+        if state is None:
+            return False
+        with self.profile_phase("vectorized_propagate"):
+            self._vectorized_propagate(state)
+        self._batch_state = state
+        self._batch_announcements = trial_announcements
+        return True
+
+    def select_batch_trial(self, trial: int) -> None:
+        """Loads the batch trial's local RIBs on the next setup and run
+
+        Setup must still be called (by the trial's scenario) since
+        that sets the policies and seeds the announcements
+        """
+
+        assert self._batch_state is not None, "run_batch must be called first"
+        assert 0 <= trial < len(self._batch_announcements), "Invalid batch trial"
+        self._batch_trial = trial
@@ -0,0 +1,45 @@
+"""Maps policy classes to the kinds of policies the NumPy engine supports"""
+
+from typing import Optional
+
+from bgpy.simulation_engine.policies import BGP, ROV, PeerROV, Policy
+
+# Policy kinds. These only differ in their _valid_ann
+BGP_KIND = 0
+ROV_KIND = 1
+PEER_ROV_KIND = 2
+
+# mypy can't determine the type of funcs that are bound as class attrs
+_VALID_ANN_KINDS = {
+    BGP._valid_ann: BGP_KIND,  # type: ignore
+    ROV._valid_ann: ROV_KIND,  # type: ignore
+    PeerROV._valid_ann: PEER_ROV_KIND,  # type: ignore
+}
+
+# All of the BGP funcs (other than _valid_ann) that must not be overriden
+_BGP_FUNC_NAMES = tuple(
+    name
+    for name, value in vars(BGP).items()
+    if callable(value) and not name.startswith("__") and name != "_valid_ann"
+)
+
+_policy_kinds_cache: dict[type[Policy], Optional[int]] = dict()
+
+
+def get_policy_kind(PolicyCls: type[Policy]) -> Optional[int]:
+    """Returns the policy kind, or None if the policy isn't supported
+
+    Subclasses (such as the Pseudo policies from ScenarioConfig) are supported
+    so long as they don't override any of the propagation funcs
+    """
+
+    try:
+        return _policy_kinds_cache[PolicyCls]
+    except KeyError:
+        kind: Optional[int] = None
+        if issubclass(PolicyCls, BGP) and all(
+            getattr(PolicyCls, name) is getattr(BGP, name) for name in _BGP_FUNC_NAMES
+        ):
+            kind = _VALID_ANN_KINDS.get(PolicyCls._valid_ann)
+        _policy_kinds_cache[PolicyCls] = kind
+        return kind
@@ -0,0 +1,175 @@
+"""Vectorized Gao-Rexford propagation for the NumPySimulationEngine"""
+
+from typing import TYPE_CHECKING
+
+import numpy as np
+from numpy.typing import NDArray
+
+from bgpy.enums import Relationships
+
+from .policy_kinds import PEER_ROV_KIND, ROV_KIND
+
+if TYPE_CHECKING:
+    from .numpy_simulation_engine import NumPySimulationEngine
+    from .propagation_state import PropagationState
+
+
+def _get_send_rels_mask(*send_rels: Relationships) -> NDArray[np.bool_]:
+    """Returns a lookup table of recv_relationship value -> can be sent"""
+
+    mask = np.zeros(max(x.value for x in Relationships) + 1, dtype=bool)
+    for rel in send_rels:
+        mask[rel.value] = True
+    return mask
+
+
+# Anns that have any of these as recv_rel get propagated
+UP_SEND_RELS_MASK = _get_send_rels_mask(Relationships.ORIGIN, Relationships.CUSTOMERS)
+DOWN_SEND_RELS_MASK = _get_send_rels_mask(
+    Relationships.ORIGIN,
+    Relationships.CUSTOMERS,
+    Relationships.PEERS,
+    Relationships.PROVIDERS,
+)
+
+
+def _vectorized_propagate(
+    self: "NumPySimulationEngine", state: "PropagationState"
+) -> None:
+    """Propagates all rows of the state
+
+    to stick with Gao Rexford, we propagate to
+    0. providers
+    2. peers
+    3. customers
+    """
+
+    phase_edges = self._get_phase_edges()
+    # Propagation ranks go from stubs to input_clique in ascending order
+    for senders, receivers in phase_edges.provider_phase:
+        self._relax(
+            state,
+            senders,
+            receivers,
+            phase_edges.provider_send_order,
+            Relationships.CUSTOMERS,
+            UP_SEND_RELS_MASK,
+        )
+    # All ASes send to peers, and only then do they process
+    senders, receivers = phase_edges.peer_phase
+    self._relax(
+        state,
+        senders,
+        receivers,
+        phase_edges.peer_send_order,
+        Relationships.PEERS,
+        UP_SEND_RELS_MASK,
+    )
+    # Start at the input_clique and propagate down
+    for senders, receivers in phase_edges.customer_phase:
+        self._relax(
+            state,
+            senders,
+            receivers,
+            phase_edges.customer_send_order,
+            Relationships.PROVIDERS,
+            DOWN_SEND_RELS_MASK,
+        )
+
+
+def _relax(
+    self: "NumPySimulationEngine",
+    state: "PropagationState",
+    senders: NDArray[np.int32],
+    receivers: NDArray[np.int32],
+    send_order: NDArray[np.int64],
+    from_rel: Relationships,
+    send_rels_mask: NDArray[np.bool_],
+) -> None:
+    """Sends anns over all edges at once, and updates the receivers best anns
+
+    This is the equivalent of propagate_to_x followed by process_incoming_anns
+    for a single rank, for every row at once
+    """
+
+    if len(senders) == 0:
+        return
+
+    # Every (row, edge) where the sender has an ann it can send
+    # and the receiver doesn't have a seeded ann (which is never replaced)
+    sender_rels = state.rel[:, senders]
+    sendable = send_rels_mask[sender_rels] & ~state.seeded[:, receivers]
+    rows, edges = np.nonzero(sendable)
+    if len(rows) == 0:
+        return
+    senders = senders[edges]
+    receivers = receivers[edges]
+    seeds = state.seed[rows, senders]
+
+    # Drop invalid anns (see _valid_ann of BGP, ROV and PeerROV)
+    invalid_by_roa = state.seed_invalid_by_roa[seeds]
+    policy_kinds = state.policy_kinds[rows, receivers]
+    invalid = invalid_by_roa & (
+        (policy_kinds == ROV_KIND)
+        | (
+            (policy_kinds == PEER_ROV_KIND)
+            & (sender_rels[rows, edges] == Relationships.PEERS.value)
+        )
+    )
+    # BGP Loop Prevention Check. Only the seeded part of the AS path
+    # can cause loops, since valley free propagation never sends an ann back
+    # to an AS that would prefer it over it's own
+    if len(state.seed_loop_keys):
+        num_ases = state.rel.shape[1]
+        invalid |= np.isin(
+            seeds.astype(np.int64) * num_ases + receivers, state.seed_loop_keys
+        )
+    if invalid.any():
+        valid = ~invalid
+        rows = rows[valid]
+        senders = senders[valid]
+        receivers = receivers[valid]
+        seeds = seeds[valid]
+
+    # Best ann for each (row, receiver) by as path length, then the
+    # lowest neighbor ASN tiebreaker, then whichever was received first
+    path_lens = state.path_len[rows, senders] + 1
+    tiebreak_asns = state.head_asn[rows, senders]
+    cells = rows.astype(np.int64) * state.rel.shape[1] + receivers
+    order = np.lexsort(
+        (send_order[senders], tiebreak_asns, path_lens, cells)  # type: ignore
+    )
+    sorted_cells = cells[order]
+    first = np.ones(len(order), dtype=bool)
+    first[1:] = sorted_cells[1:] != sorted_cells[:-1]
+    best = order[first]
+    rows = rows[best]
+    senders = senders[best]
+    receivers = receivers[best]
+    seeds = seeds[best]
+    path_lens = path_lens[best]
+    tiebreak_asns = tiebreak_asns[best]
+
+    # Compare against the current ann by Gao Rexford
+    # Ties are broken in favor of the current ann
+    current_rels = state.rel[rows, receivers]
+    current_path_lens = state.path_len[rows, receivers]
+    better = (current_rels < from_rel.value) | (
+        (current_rels == from_rel.value)
+        & (
+            (path_lens < current_path_lens)
+            | (
+                (path_lens == current_path_lens)
+                & (tiebreak_asns < state.tiebreak_asn[rows, receivers])
+            )
+        )
+    )
+    rows = rows[better]
+    receivers = receivers[better]
+
+    state.rel[rows, receivers] = from_rel.value
+    state.path_len[rows, receivers] = path_lens[better]
+    state.head_asn[rows, receivers] = self.as_graph.get_arrays().asns[receivers]
+    state.tiebreak_asn[rows, receivers] = tiebreak_asns[better]
+    state.next_hop[rows, receivers] = senders[better]
+    state.seed[rows, receivers] = seeds[better]
@@ -0,0 +1,70 @@
+from dataclasses import dataclass
+from typing import TYPE_CHECKING
+
+import numpy as np
+from numpy.typing import NDArray
+
+if TYPE_CHECKING:
+    from bgpy.simulation_engine.announcement import Announcement as Ann
+
+
+@dataclass(slots=True)
+class PropagationState:
+    """Routing state for the NumPySimulationEngine
+
+    Each row is one prefix (of one trial), each column is one AS index
+    (see ASGraphArrays). A route is described by:
+
+    rel: recv_relationship value of the best ann (0 if there is no ann)
+    path_len: length of the AS path
+    head_asn: as_path[0], used by receivers for the lowest neighbor tiebreaker
+    tiebreak_asn: as_path[1], the lowest neighbor tiebreaker of this ann
+    next_hop: AS index the ann was received from
+    seed: index into seed_anns of the ann this route originated from
+
+    Rather than storing the AS path, the path is rebuilt from next_hop when
+    the local RIBs are written back to the policies
+    """
+
+    rel: NDArray[np.int8]
+    path_len: NDArray[np.int32]
+    head_asn: NDArray[np.uint32]
+    tiebreak_asn: NDArray[np.uint32]
+    next_hop: NDArray[np.int32]
+    seed: NDArray[np.int32]
+    # Seeded anns are never replaced
+    seeded: NDArray[np.bool_]
+    # Policy kind of each AS for each row (see policy_kinds.py)
+    policy_kinds: NDArray[np.int8]
+    # Prefix of each row
+    row_prefixes: tuple[str, ...]
+    # Trial of each row (only one trial unless running in batches)
+    row_trials: NDArray[np.int32]
+    # Announcements that were seeded, and their ROA validity
+    seed_anns: tuple["Ann", ...]
+    seed_invalid_by_roa: NDArray[np.bool_]
+    # seed * num ASes + AS index for ASes that are in a seeded AS path,
+    # which must reject that ann due to the BGP loop check
+    seed_loop_keys: NDArray[np.int64]
+
+    @property
+    def num_rows(self) -> int:
+        return self.rel.shape[0]
+
+
+@dataclass(frozen=True, slots=True)
+class PhaseEdges:
+    """Edges (sender AS index -> receiver AS index) for each propagation phase
+
+    Provider and customer edges are grouped by the propagation rank of the
+    receiver, in the order the ranks are processed. Send orders mirror the
+    order in which SimulationEngine calls propagate_to_*, which decides
+    which ann is received first (and wins full ties)
+    """
+
+    provider_phase: tuple[tuple[NDArray[np.int32], NDArray[np.int32]], ...]
+    peer_phase: tuple[NDArray[np.int32], NDArray[np.int32]]
+    customer_phase: tuple[tuple[NDArray[np.int32], NDArray[np.int32]], ...]
+    provider_send_order: NDArray[np.int64]
+    peer_send_order: NDArray[np.int64]
+    customer_send_order: NDArray[np.int64]
@@ -0,0 +1,69 @@
+"""Functions to write the NumPySimulationEngine state back to the policies"""
+
+from typing import TYPE_CHECKING
+
+import numpy as np
+
+from bgpy.enums import Relationships
+
+if TYPE_CHECKING:
+    from bgpy.simulation_engine.announcement import Announcement as Ann
+    from .numpy_simulation_engine import NumPySimulationEngine
+    from .propagation_state import PropagationState
+
+
+_RELATIONSHIPS: dict[int, Relationships] = {x.value: x for x in Relationships}
+
+
+def _populate_local_ribs(
+    self: "NumPySimulationEngine", state: "PropagationState", trial: int = 0
+) -> None:
+    """Adds the best ann of every AS to its local RIB for a given trial
+
+    Seeded anns are already in the local RIBs (from seed_ann)
+    """
+
+    for row in np.flatnonzero(state.row_trials == trial):
+        for index, ann in self._get_row_anns(state, row):
+            self.as_graph.ases[index].policy._local_rib.add_ann(ann)
+
+
+def _get_row_anns(
+    self: "NumPySimulationEngine", state: "PropagationState", row: int
+) -> list[tuple[int, "Ann"]]:
+    """Returns (AS index, ann) for every AS that received the row's prefix
+
+    Each AS path is the AS prepended to the AS path of its next hop, so ASes
+    are processed in order of AS path length. The ann is a copy of the
+    seeded ann, just like when it's copied during each hop in the
+    SimulationEngine (which resets seed_asn and traceback_end)
+    """
+
+    asns = self.as_graph.get_arrays().asns
+    rels = state.rel[row]
+    path_lens = state.path_len[row]
+    next_hops = state.next_hop[row]
+    seeds = state.seed[row]
+    seeded = state.seeded[row]
+
+    as_paths: dict[int, tuple[int, ...]] = {
+        int(index): state.seed_anns[seeds[index]].as_path
+        for index in np.flatnonzero(seeded)
+    }
+    received = np.flatnonzero((rels > 0) & ~seeded)
+    received = received[np.argsort(path_lens[received], kind="stable")]
+
+    row_anns: list[tuple[int, "Ann"]] = list()
+    for index in received.tolist():
+        next_hop = int(next_hops[index])
+        as_path = (int(asns[index]),) + as_paths[next_hop]
+        as_paths[index] = as_path
+        ann = state.seed_anns[seeds[index]].copy(
+            {
+                "as_path": as_path,
+                "next_hop_asn": int(asns[next_hop]),
+                "recv_relationship": _RELATIONSHIPS[int(rels[index])],
+            }
+        )
+        row_anns.append((index, ann))
+    return row_anns
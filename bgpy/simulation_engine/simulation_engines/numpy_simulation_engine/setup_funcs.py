@@ -0,0 +1,183 @@
+"""Functions to build the arrays used by the NumPySimulationEngine"""
+
+from typing import Optional, TYPE_CHECKING
+
+from frozendict import frozendict
+import numpy as np
+from numpy.typing import NDArray
+
+from bgpy.simulation_engine.policies import Policy
+
+from .policy_kinds import get_policy_kind
+from .propagation_state import PhaseEdges, PropagationState
+
+if TYPE_CHECKING:
+    from bgpy.simulation_engine.announcement import Announcement as Ann
+    from .numpy_simulation_engine import NumPySimulationEngine
+
+
+def _get_policy_kinds(
+    self: "NumPySimulationEngine",
+    BasePolicyCls: type[Policy],
+    non_default_asn_cls_dict: frozendict[int, type[Policy]],
+    attacker_asns: frozenset[int] = frozenset(),
+    AttackerBasePolicyCls: Optional[type[Policy]] = None,
+) -> Optional[NDArray[np.int8]]:
+    """Returns the policy kind of every AS index, or None if unsupported
+
+    Mirrors the class assignment in SimulationEngine._set_as_classes
+    """
+
+    arrays = self.as_graph.get_arrays()
+    base_kind = get_policy_kind(BasePolicyCls)
+    if base_kind is None:
+        return None
+    policy_kinds = np.full(len(arrays), base_kind, dtype=np.int8)
+    overrides = dict(non_default_asn_cls_dict)
+    if AttackerBasePolicyCls:
+        for asn in attacker_asns:
+            overrides[asn] = AttackerBasePolicyCls
+    for asn, Cls in overrides.items():
+        kind = get_policy_kind(Cls)
+        if kind is None:
+            return None
+        index = arrays.asn_to_index.get(asn)
+        if index is not None:
+            policy_kinds[index] = kind
+    return policy_kinds
+
+
+def _get_propagation_state(
+    self: "NumPySimulationEngine",
+    trial_announcements: tuple[tuple["Ann", ...], ...],
+    trial_policy_kinds: tuple[NDArray[np.int8], ...],
+) -> Optional[PropagationState]:
+    """Returns the propagation state with all announcements seeded
+
+    Each trial gets one row per prefix. Returns None if any announcement
+    can't be propagated by the NumPy engine
+    """
+
+    arrays = self.as_graph.get_arrays()
+    num_ases = len(arrays)
+
+    row_prefixes: list[str] = list()
+    row_trials: list[int] = list()
+    seed_anns: list["Ann"] = list()
+    seed_rows: list[int] = list()
+    for trial, announcements in enumerate(trial_announcements):
+        prefix_rows: dict[str, int] = dict()
+        for ann in announcements:
+            if getattr(ann, "withdraw", False) or ann.seed_asn is None:
+                return None
+            if ann.prefix not in prefix_rows:
+                prefix_rows[ann.prefix] = len(row_prefixes)
+                row_prefixes.append(ann.prefix)
+                row_trials.append(trial)
+            seed_anns.append(ann)
+            seed_rows.append(prefix_rows[ann.prefix])
+
+    num_rows = len(row_prefixes)
+    shape = (num_rows, num_ases)
+    trials = np.array(row_trials, dtype=np.int32)
+    state = PropagationState(
+        rel=np.zeros(shape, dtype=np.int8),
+        path_len=np.zeros(shape, dtype=np.int32),
+        head_asn=np.zeros(shape, dtype=np.uint32),
+        tiebreak_asn=np.zeros(shape, dtype=np.uint32),
+        next_hop=np.full(shape, -1, dtype=np.int32),
+        seed=np.full(shape, -1, dtype=np.int32),
+        seeded=np.zeros(shape, dtype=bool),
+        policy_kinds=(
+            np.stack(trial_policy_kinds)[trials]
+            if num_rows
+            else np.zeros(shape, dtype=np.int8)
+        ),
+        row_prefixes=tuple(row_prefixes),
+        row_trials=trials,
+        seed_anns=tuple(seed_anns),
+        seed_invalid_by_roa=np.array(
+            [ann.invalid_by_roa for ann in seed_anns], dtype=bool
+        ),
+        seed_loop_keys=np.zeros(0, dtype=np.int64),
+    )
+
+    seed_loop_keys: list[int] = list()
+    for seed, (ann, row) in enumerate(zip(seed_anns, seed_rows)):
+        assert ann.seed_asn is not None, "mypy"
+        index = arrays.asn_to_index[ann.seed_asn]
+        # Ensure we aren't replacing anything
+        assert not state.seeded[row, index], "Seeding conflict"
+        state.rel[row, index] = ann.recv_relationship.value
+        state.path_len[row, index] = len(ann.as_path)
+        state.head_asn[row, index] = ann.as_path[0]
+        state.next_hop[row, index] = index
+        state.seed[row, index] = seed
+        state.seeded[row, index] = True
+        for asn in ann.as_path:
+            loop_index = arrays.asn_to_index.get(asn)
+            if loop_index is not None:
+                seed_loop_keys.append(seed * num_ases + loop_index)
+    state.seed_loop_keys = np.unique(np.array(seed_loop_keys, dtype=np.int64))
+    return state
+
+
+def _get_phase_edges(self: "NumPySimulationEngine") -> PhaseEdges:
+    """Returns the edges for each propagation phase, building them once"""
+
+    if self._phase_edges is None:
+        arrays = self.as_graph.get_arrays()
+        num_ases = len(arrays)
+
+        provider_phase = tuple(
+            self._get_csr_edges(
+                arrays.customer_offsets, arrays.customer_indices, rank_indices
+            )
+            for rank_indices in arrays.rank_indices
+        )
+        customer_phase = tuple(
+            self._get_csr_edges(
+                arrays.provider_offsets, arrays.provider_indices, rank_indices
+            )
+            for rank_indices in reversed(arrays.rank_indices)
+        )
+        peer_phase = self._get_csr_edges(
+            arrays.peer_offsets,
+            arrays.peer_indices,
+            np.arange(num_ases, dtype=np.int32),
+        )
+
+        def send_order(ranks: tuple[NDArray[np.int32], ...]) -> NDArray[np.int64]:
+            order = np.empty(num_ases, dtype=np.int64)
+            if ranks:
+                order[np.concatenate(ranks)] = np.arange(num_ases)
+            return order
+
+        self._phase_edges = PhaseEdges(
+            provider_phase=provider_phase,
+            peer_phase=peer_phase,
+            customer_phase=customer_phase,
+            # Providers propagate rank by rank, from stubs to the input clique
+            provider_send_order=send_order(arrays.rank_indices),
+            # All ASes propagate to peers in the order of the AS graph
+            peer_send_order=np.arange(num_ases, dtype=np.int64),
+            customer_send_order=send_order(tuple(reversed(arrays.rank_indices))),
+        )
+    return self._phase_edges
+
+
+def _get_csr_edges(
+    self: "NumPySimulationEngine",
+    offsets: NDArray[np.int64],
+    indices: NDArray[np.int32],
+    receivers: NDArray[np.int32],
+) -> tuple[NDArray[np.int32], NDArray[np.int32]]:
+    """Returns (senders, receivers) for every neighbor of the receivers"""
+
+    starts = offsets[receivers]
+    counts = offsets[receivers + 1] - starts
+    # Position of every edge within indices
+    positions = np.repeat(starts - np.cumsum(counts) + counts, counts) + np.arange(
+        counts.sum()
+    )
+    return indices[positions], np.repeat(receivers, counts)
@@ -1,3 +1,4 @@
+from pathlib import Path
 from typing import Any, Optional, TYPE_CHECKING
 
 from frozendict import frozendict
@@ -7,14 +8,96 @@ from bgpy.simulation_engine import Policy
 
 from .base_simulation_engine import BaseSimulationEngine
 
+# Equivalence class funcs
+from .equivalence_class_funcs import _set_equivalence_classes
+from .equivalence_class_funcs import _get_topology_classes
+
+# Lazy stub funcs
+from .lazy_stub_funcs import _set_lazy_asns
+from .lazy_stub_funcs import get_lazy_ann
+from .lazy_stub_funcs import evaluate_lazy_ases
+
 # https://stackoverflow.com/a/57005931/8903959
 if TYPE_CHECKING:
+    from bgpy.as_graphs import AS, ASGraph
     from bgpy.simulation_engine import Announcement as Ann
+    from bgpy.simulation_engine.profiler import Profiler
     from bgpy.simulation_framework import Scenario
 
 
 class SimulationEngine(BaseSimulationEngine):
-    """Python simulation engine representation"""
+    """Python simulation engine representation
+
+    With equivalence_classes, ASes without customers that have the same
+    providers, peers, AS groups and policy class are grouped into classes,
+    and only one representative per class processes announcements.
+    The others keep empty local RIBs, and the ASGraphAnalyzer and
+    MetricTracker give them the outcomes of their representative.
+    Members are still sent anns, but never process them (their recv_q is
+    cleared after each phase), so this assumes that these ASes never export
+    anns from providers or peers (as with Gao Rexford)
+
+    With lazy_stubs, stubs without customers are skipped during propagation
+    (with the same assumption), and their best anns are computed from their
+    recv_q on demand, such as by the ASGraphAnalyzer. So their local RIBs
+    stay empty unless evaluate_lazy_ases is called. Hooks and metrics that
+    read policy._local_rib directly see empty RIBs for lazy stubs, and must
+    either use get_lazy_ann or call evaluate_lazy_ases first
+    """
+
+    # Equivalence class funcs
+    _set_equivalence_classes = _set_equivalence_classes
+    _get_topology_classes = _get_topology_classes
+
+    # Lazy stub funcs
+    _set_lazy_asns = _set_lazy_asns
+    get_lazy_ann = get_lazy_ann
+    evaluate_lazy_ases = evaluate_lazy_ases
+
+    def __init__(
+        self,
+        as_graph: "ASGraph",
+        cached_as_graph_tsv_path: Optional[Path] = None,
+        ready_to_run_round: int = -1,
+        profiler: Optional["Profiler"] = None,
+        equivalence_classes: bool = False,
+        lazy_stubs: bool = False,
+    ) -> None:
+        super().__init__(
+            as_graph,
+            cached_as_graph_tsv_path=cached_as_graph_tsv_path,
+            ready_to_run_round=ready_to_run_round,
+            profiler=profiler,
+        )
+        # Private since it's not part of the YAML
+        self._use_equivalence_classes: bool = equivalence_classes
+        self._use_lazy_stubs: bool = lazy_stubs
+        # Cached per AS graph
+        self._topology_classes: Optional[tuple[tuple["AS", ...], ...]] = None
+        # {representative ASN: member ASNs (including the representative)}
+        self._equivalence_classes: frozendict[int, tuple[int, ...]] = frozendict()
+        # {member ASN: representative ASN}, excluding the representatives
+        self._representatives: frozendict[int, int] = frozendict()
+        # Members that never process announcements
+        self._represented_asns: frozenset[int] = frozenset()
+        # Stubs that only process announcements on demand
+        self._lazy_asns: frozenset[int] = frozenset()
+        # ASes that aren't on the frontier (represented or lazy)
+        self._skipped_asns: frozenset[int] = frozenset()
+        # Skipped ASes are set once per setup
+        self._skipped_asns_set: bool = False
+
+    @property
+    def equivalence_classes(self) -> frozendict[int, tuple[int, ...]]:
+        return self._equivalence_classes
+
+    @property
+    def representatives(self) -> frozendict[int, int]:
+        return self._representatives
+
+    @property
+    def lazy_asns(self) -> frozenset[int]:
+        return self._lazy_asns
 
     ###############
     # Setup funcs #
@@ -33,14 +116,19 @@ class SimulationEngine(BaseSimulationEngine):
     ) -> frozenset[type[Policy]]:
         """Sets AS classes and seeds announcements"""
 
-        policies_used: frozenset[type[Policy]] = self._set_as_classes(
-            BasePolicyCls,
-            non_default_asn_cls_dict,
-            prev_scenario,
-            attacker_asns,
-            AttackerBasePolicyCls,
-        )
-        self._seed_announcements(announcements, prev_scenario)
+        with self.profile_phase("set_as_classes"):
+            policies_used: frozenset[type[Policy]] = self._set_as_classes(
+                BasePolicyCls,
+                non_default_asn_cls_dict,
+                prev_scenario,
+                attacker_asns,
+                AttackerBasePolicyCls,
+            )
+        # Set on the next run, since that's when the scenario is passed in
+        self._lazy_asns = frozenset()
+        self._skipped_asns_set = False
+        with self.profile_phase("seed_announcements"):
+            self._seed_announcements(announcements, prev_scenario)
         self.ready_to_run_round = 0
         return policies_used
 
@@ -58,18 +146,26 @@ class SimulationEngine(BaseSimulationEngine):
         to allow for easy overriding. If scenario controls seeding,
         it doesn't make sense for engine to control resetting either
         and have each do half and half
+
+        Policies that keep the same class as the last scenario are reset
+        in place rather than reallocated (most ASes in most trials), so only
+        the ASes whose class changed get a new policy
         """
 
         policy_classes_used = set()
         # Done here to save as much time  as possible
         for as_obj in self.as_graph:
-            # Delete the old policy and remove references so that RAM can be reclaimed
-            del as_obj.policy.as_
             # set the AS class to be the proper type of AS
             Cls = non_default_asn_cls_dict.get(as_obj.asn, BasePolicyCls)
             if AttackerBasePolicyCls and as_obj.asn in attacker_asns:
                 Cls = AttackerBasePolicyCls
-            as_obj.policy = Cls(as_=as_obj)
+            policy = as_obj.policy
+            if policy.__class__ is Cls:
+                policy.reset()
+            else:
+                # Delete the old policy and remove references so RAM can be reclaimed
+                del policy.as_
+                as_obj.policy = Cls(as_=as_obj)
             policy_classes_used.add(Cls)
 
         # NOTE: even though the code below is more efficient than the code
@@ -117,14 +213,30 @@ class SimulationEngine(BaseSimulationEngine):
             raise Exception(f"Engine not set up to run for {propagation_round} round")
         assert scenario, "This can't be empty"
 
-        # import time
-        # start = time.perf_counter()
+        if self._lazy_asns:
+            # Lazy stubs would have processed their anns in the last round
+            self.evaluate_lazy_ases(propagation_round - 1, scenario)
+        if not self._skipped_asns_set:
+            self._set_skipped_asns(scenario)
+
         # Propogate anns
-        self._propagate(propagation_round, scenario)
-        # print(f"prop time {time.perf_counter() - start}")
+        with self.profile_phase("propagation"):
+            self._propagate(propagation_round, scenario)
         # Increment the ready to run round
         self.ready_to_run_round += 1
 
+    def _set_skipped_asns(self, scenario: "Scenario") -> None:
+        """Sets the ASes that aren't on the frontier until the next setup"""
+
+        if self._use_equivalence_classes:
+            with self.profile_phase("set_equivalence_classes"):
+                self._set_equivalence_classes(scenario)
+        if self._use_lazy_stubs:
+            with self.profile_phase("set_lazy_asns"):
+                self._set_lazy_asns(scenario)
+        self._skipped_asns = self._represented_asns | self._lazy_asns
+        self._skipped_asns_set = True
+
     def _propagate(self, propagation_round: int, scenario: "Scenario"):
         """Propogates announcements
 
@@ -132,76 +244,197 @@ class SimulationEngine(BaseSimulationEngine):
         0. providers
         2. peers
         3. customers
+
+        Only ASes on the frontier do any work. Senders are ASes that
+        may have anns to send (they were seeded or their local RIB changed),
+        and receivers are neighbors that were actually sent anns.
+        Skipped ASes would have been no-ops, and the frontier is iterated
+        in the same order as the ranks, so outcomes are unchanged
+        """
+
+        self._set_frontier()
+        with self.profile_phase("propagate_to_providers"):
+            self._propagate_to_providers(propagation_round, scenario)
+        with self.profile_phase("propagate_to_peers"):
+            self._propagate_to_peers(propagation_round, scenario)
+        with self.profile_phase("propagate_to_customers"):
+            self._propagate_to_customers(propagation_round, scenario)
+
+    def _set_frontier(self) -> None:
+        """Sets the ASNs of senders and receivers (by rank) for this round
+
+        Any AS that has anns (or has anns to send/process) starts on the
+        frontier, since scenarios may alter ASes between rounds.
+        See the frontier funcs of Policy.
+        Members of equivalence classes (other than the representative)
+        and lazy stubs are never on the frontier
         """
 
-        self._propagate_to_providers(propagation_round, scenario)
-        self._propagate_to_peers(propagation_round, scenario)
-        self._propagate_to_customers(propagation_round, scenario)
+        num_ranks = len(self.as_graph.propagation_ranks)
+        self._senders: list[set[int]] = [set() for _ in range(num_ranks)]
+        self._receivers: list[set[int]] = [set() for _ in range(num_ranks)]
+        self._idle_processors: list[set[int]] = [set() for _ in range(num_ranks)]
+        skipped_asns = self._skipped_asns
+        for as_obj in self.as_graph:
+            if as_obj.asn in skipped_asns:
+                continue
+            policy = as_obj.policy
+            rank: int = as_obj.propagation_rank  # type: ignore
+            if policy.has_anns_to_send():
+                self._senders[rank].add(as_obj.asn)
+            if policy.has_incoming_anns():
+                self._receivers[rank].add(as_obj.asn)
+            if policy.process_incoming_anns_when_idle:
+                self._idle_processors[rank].add(as_obj.asn)
+
+    def _process_frontier(
+        self,
+        rank: int,
+        from_rel: Relationships,
+        propagation_round: int,
+        scenario: "Scenario",
+    ) -> None:
+        """Processes incoming anns for all receivers of a given rank
+
+        Receivers whose local RIB changed (or that have anns queued to send)
+        become senders. Policies without a local RIB version always do
+        """
+
+        as_dict = self.as_graph.as_dict
+        profiler = self._profiler
+        receivers = self._receivers[rank] | self._idle_processors[rank]
+        if self._skipped_asns:
+            # Members never process their anns (their representative does),
+            # so drop them rather than letting their recv_q grow
+            for asn in receivers & self._represented_asns:
+                as_dict[asn].policy.clear_incoming_anns()
+            # Processed by their representative, or on demand if lazy
+            receivers -= self._skipped_asns
+        senders = self._senders[rank]
+        # Sorted so that runs are deterministic
+        for asn in sorted(receivers):
+            policy = as_dict[asn].policy
+            version = policy.local_rib_version
+            if profiler is None:
+                policy.process_incoming_anns(
+                    from_rel=from_rel,
+                    propagation_round=propagation_round,
+                    scenario=scenario,
+                )
+            else:
+                profiler.process_incoming_anns(
+                    policy,
+                    from_rel=from_rel,
+                    propagation_round=propagation_round,
+                    scenario=scenario,
+                )
+            if (
+                version is None
+                or policy.local_rib_version != version
+                or policy.has_queued_anns()
+            ):
+                senders.add(asn)
+        self._receivers[rank] = set()
+
+    def _mark_receivers(self, neighbors: tuple["AS", ...]) -> None:
+        """Adds the neighbors that were actually sent anns to the frontier
+
+        See Policy.has_incoming_anns
+        """
+
+        receivers = self._receivers
+        for neighbor in neighbors:
+            if neighbor.policy.has_incoming_anns():
+                receivers[neighbor.propagation_rank].add(neighbor.asn)  # type: ignore
 
     def _propagate_to_providers(self, propagation_round: int, scenario: "Scenario"):
         """Propogate to providers"""
 
+        as_dict = self.as_graph.as_dict
+        profiler = self._profiler
         # Propogation ranks go from stubs to input_clique in ascending order
         # By customer provider pairs (peers are ignored for the ranks)
-        for i, rank in enumerate(self.as_graph.propagation_ranks):
-            # Nothing to process at the start
-            if i > 0:
-                # Process first because maybe it recv from lower ranks
-                for as_obj in rank:
-                    as_obj.policy.process_incoming_anns(
-                        from_rel=Relationships.CUSTOMERS,
-                        propagation_round=propagation_round,
-                        scenario=scenario,
+        for i in range(len(self.as_graph.propagation_ranks)):
+            with self._profile_rank("propagate_to_providers", i):
+                # Nothing to process at the start
+                if i > 0:
+                    # Process first because maybe it recv from lower ranks
+                    self._process_frontier(
+                        i, Relationships.CUSTOMERS, propagation_round, scenario
                     )
-            # Send to the higher ranks
-            for as_obj in rank:
-                as_obj.policy.propagate_to_providers()
+                # Send to the higher ranks
+                # Must be sorted, since the order anns are received in breaks ties
+                for asn in sorted(self._senders[i]):
+                    as_obj = as_dict[asn]
+                    if profiler is None:
+                        as_obj.policy.propagate_to_providers()
+                    else:
+                        profiler.propagate(as_obj.policy, "propagate_to_providers")
+                    self._mark_receivers(as_obj.providers)
 
     def _propagate_to_peers(
         self, propagation_round: int, scenario: Optional["Scenario"]
     ):
         """Propagate to peers"""
 
+        profiler = self._profiler
         # The reason you must separate this for loop here
         # is because propagation ranks do not take into account peering
         # It'd be impossible to take into account peering
         # since different customers peer to different ranks
         # So first do customer to provider propagation, then peer propagation
+        senders = set().union(*self._senders)
+        # Must be in the order of the AS graph, since the order anns are
+        # received in breaks ties
         for as_obj in self.as_graph:
-            as_obj.policy.propagate_to_peers()
-        for as_obj in self.as_graph:
-            as_obj.policy.process_incoming_anns(
-                from_rel=Relationships.PEERS,
-                propagation_round=propagation_round,
-                scenario=scenario,
-            )
+            if as_obj.asn not in senders:
+                continue
+            if profiler is None:
+                as_obj.policy.propagate_to_peers()
+            else:
+                profiler.propagate(as_obj.policy, "propagate_to_peers")
+            self._mark_receivers(as_obj.peers)
+        for i in range(len(self.as_graph.propagation_ranks)):
+            with self._profile_rank("propagate_to_peers", i):
+                self._process_frontier(
+                    i, Relationships.PEERS, propagation_round, scenario  # type: ignore
+                )
 
     def _propagate_to_customers(self, propagation_round: int, scenario: "Scenario"):
         """Propagate to customers"""
 
+        as_dict = self.as_graph.as_dict
+        profiler = self._profiler
         # Propogation ranks go from stubs to input_clique in ascending order
         # By customer provider pairs (peers are ignored for the ranks)
         # So here we start at the highest rank(input_clique) and propagate down
-        for i, rank in enumerate(reversed(self.as_graph.propagation_ranks)):
-            # There are no incomming Anns at the top
-            if i > 0:
-                for as_obj in rank:
-                    as_obj.policy.process_incoming_anns(
-                        from_rel=Relationships.PROVIDERS,
-                        propagation_round=propagation_round,
-                        scenario=scenario,
+        for i in reversed(range(len(self.as_graph.propagation_ranks))):
+            with self._profile_rank("propagate_to_customers", i):
+                # There are no incomming Anns at the top
+                if i < len(self.as_graph.propagation_ranks) - 1:
+                    self._process_frontier(
+                        i, Relationships.PROVIDERS, propagation_round, scenario
                     )
-            for as_obj in rank:
-                as_obj.policy.propagate_to_customers()
+                # Must be sorted, since the order anns are received in breaks ties
+                for asn in sorted(self._senders[i]):
+                    as_obj = as_dict[asn]
+                    if profiler is None:
+                        as_obj.policy.propagate_to_customers()
+                    else:
+                        profiler.propagate(as_obj.policy, "propagate_to_customers")
+                    self._mark_receivers(as_obj.customers)
 
     ##############
     # Yaml funcs #
     ##############
 
     def __to_yaml_dict__(self) -> dict[str, Any]:
-        """This optional method is called when you call yaml.dump()"""
+        """This optional method is called when you call yaml.dump()
+
+        Private attributes (such as caches) aren't part of the engine's state
+        """
 
-        return dict(vars(self))
+        return {k: v for k, v in vars(self).items() if not k.startswith("_")}
 
     @classmethod
     def __from_yaml_dict__(
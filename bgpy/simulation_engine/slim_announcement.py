@@ -0,0 +1,183 @@
+"""Generates Announcement classes with only the attributes that are used
+
+Announcement copying is the bottleneck for BGPy, and smaller dataclasses
+copy much faster. Rather than hand writing an Announcement subclass for
+every set of policies, each Policy declares the optional Announcement
+attributes it needs (Policy.required_ann_attrs) and the ScenarioConfig
+generates a slim class from those, once per process per set of attributes.
+
+The generated classes are dumped to YAML exactly like an Announcement
+(dropped attributes are written with their defaults) and compare equal to
+an Announcement with the same attributes, so outputs don't change.
+
+They can't inherit from Announcement, since slotted subclasses keep every
+slot of their parent. Instead they are registered as virtual subclasses,
+so that isinstance and issubclass checks against Announcement still pass.
+"""
+
+from dataclasses import MISSING, asdict, fields, make_dataclass
+from types import FunctionType
+from typing import Any, Iterable
+
+from .announcement import Announcement
+
+
+# Attributes that every Announcement needs
+# On top of the core attrs, the Scenario always sets the timestamp and ROA
+# info on seeded anns, and copy resets traceback_end
+BASE_ANN_ATTRS: frozenset[str] = frozenset(
+    {
+        "prefix",
+        "as_path",
+        "next_hop_asn",
+        "seed_asn",
+        "recv_relationship",
+        "timestamp",
+        "traceback_end",
+        "roa_valid_length",
+        "roa_origin",
+    }
+)
+
+_SLIM_ANN_CLS_PREFIX: str = "SlimAnnouncement"
+
+# Methods that dataclass generates for each class, so they aren't copied over
+_DATACLASS_FUNCS: frozenset[str] = frozenset(
+    {
+        "__init__",
+        "__repr__",
+        "__eq__",
+        "__hash__",
+        "__setattr__",
+        "__delattr__",
+        "__getstate__",
+        "__setstate__",
+        "__to_yaml_dict__",
+    }
+)
+
+_slim_ann_cls_dict: dict[frozenset[str], type[Announcement]] = dict()
+
+
+def get_slim_ann_cls(ann_attrs: Iterable[str]) -> type[Announcement]:
+    """Returns an Announcement class with only BASE_ANN_ATTRS + ann_attrs
+
+    Classes are cached, so they are only generated once per process
+    """
+
+    field_names = {x.name for x in fields(Announcement)}
+    optional_attrs = frozenset(ann_attrs) - BASE_ANN_ATTRS
+    assert optional_attrs.issubset(field_names), (
+        f"Policies require {optional_attrs - field_names}, "
+        "which are not Announcement attributes"
+    )
+
+    SlimAnnCls = _slim_ann_cls_dict.get(optional_attrs)
+    if SlimAnnCls is None:
+        SlimAnnCls = _make_slim_ann_cls(optional_attrs)
+        _slim_ann_cls_dict[optional_attrs] = SlimAnnCls
+        # Must set for pickling purposes
+        globals()[SlimAnnCls.__name__] = SlimAnnCls
+    return SlimAnnCls
+
+
+def is_slim_ann_cls(AnnCls: type[Any]) -> bool:
+    """Returns True if the AnnCls was generated by get_slim_ann_cls"""
+
+    return AnnCls in _slim_ann_cls_dict.values()
+
+
+def _make_slim_ann_cls(optional_attrs: frozenset[str]) -> type[Announcement]:
+    """Generates the slotted, frozen dataclass for the given attributes"""
+
+    name = "__".join([_SLIM_ANN_CLS_PREFIX, *sorted(optional_attrs)])
+    ann_attrs = BASE_ANN_ATTRS | optional_attrs
+
+    slim_fields: list[Any] = list()
+    # Dropped fields are stored so that YAML and eq can fill them back in
+    dropped_defaults: dict[str, Any] = dict()
+    for field_ in fields(Announcement):
+        if field_.name not in ann_attrs:
+            dropped_defaults[field_.name] = field_.default
+        elif field_.default is MISSING:
+            slim_fields.append((field_.name, field_.type))
+        else:
+            slim_fields.append((field_.name, field_.type, field_.default))
+
+    # Reuse all of the Announcement methods (copy, properties, etc)
+    namespace: dict[str, Any] = {
+        k: v
+        for k, v in vars(Announcement).items()
+        if isinstance(v, (FunctionType, property, classmethod, staticmethod))
+        and k not in _DATACLASS_FUNCS
+    }
+    full_field_names = tuple(x.name for x in fields(Announcement))
+
+    def __to_yaml_dict__(self) -> dict[str, Any]:
+        """Same YAML as an Announcement with the same attributes"""
+
+        dct = asdict(self)
+        return {k: dct.get(k, dropped_defaults.get(k)) for k in full_field_names}
+
+    def _full_values(self) -> tuple[Any, ...]:
+        """Values of all Announcement fields, in Announcement's order"""
+
+        return tuple(
+            getattr(self, k) if k not in dropped_defaults else dropped_defaults[k]
+            for k in full_field_names
+        )
+
+    def __eq__(self, other: object) -> bool:
+        """Equal to any Announcement with the same attributes"""
+
+        if other.__class__ is self.__class__:
+            return _full_values(self) == _full_values(other)
+        elif isinstance(other, Announcement):
+            other_dct: dict[str, Any] = other.__to_yaml_dict__()  # type: ignore
+            return bool(self.__to_yaml_dict__() == other_dct)
+        else:
+            return NotImplemented
+
+    def __hash__(self) -> int:
+        # Same as the hash of an equivalent Announcement
+        return hash(_full_values(self))
+
+    @classmethod  # type: ignore
+    def is_yaml_tag_supported(cls, yaml_tag: str) -> bool:
+        """Always load as Announcement (which is equivalent)"""
+
+        return False
+
+    namespace.update(
+        {
+            "__doc__": f"Announcement with only {', '.join(sorted(ann_attrs))}",
+            "__module__": __name__,
+            "__to_yaml_dict__": __to_yaml_dict__,
+            "__eq__": __eq__,
+            "__hash__": __hash__,
+            "is_yaml_tag_supported": is_yaml_tag_supported,
+            # Dumps with the same tag as Announcement
+            "__yaml_tag_suffix__": Announcement.__yaml_tag_suffix__,  # type: ignore
+        }
+    )
+
+    SlimAnnCls: type[Announcement] = make_dataclass(  # type: ignore
+        name,
+        slim_fields,
+        bases=Announcement.__bases__,
+        namespace=namespace,
+        frozen=True,
+        slots=True,
+    )
+    # So that isinstance(ann, Announcement) holds (Announcement is an ABC)
+    Announcement.register(SlimAnnCls)
+    return SlimAnnCls
+
+
+def __getattr__(name: str) -> type[Announcement]:
+    """Regenerates slim classes on unpickling in processes that lack them"""
+
+    if name.startswith(_SLIM_ANN_CLS_PREFIX):
+        return get_slim_ann_cls(name.split("__")[1:])
+    else:
+        raise AttributeError(f"module {__name__!r} has no attribute {name!r}")
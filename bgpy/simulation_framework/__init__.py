@@ -1,8 +1,10 @@
 from .as_graph_analyzers import BaseASGraphAnalyzer, ASGraphAnalyzer
 from .graph_factory import GraphFactory
 from .metric_tracker import MetricTracker
+from .metric_tracker import ResultsStore
 
 from .scenarios import preprocess_anns_funcs
+from .scenarios import PrefixRegistry
 from .scenarios import ROAInfo
 from .scenarios import ScenarioConfig
 from .scenarios import Scenario
@@ -24,7 +26,9 @@ __all__ = [
     "BaseASGraphAnalyzer",
     "GraphFactory",
     "MetricTracker",
+    "ResultsStore",
     "preprocess_anns_funcs",
+    "PrefixRegistry",
     "ROAInfo",
     "ScenarioConfig",
     "Scenario",
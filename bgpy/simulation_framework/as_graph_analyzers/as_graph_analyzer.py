@@ -1,4 +1,8 @@
-from typing import Optional, TYPE_CHECKING
+from typing import Iterable, Optional, TYPE_CHECKING
+import warnings
+
+from frozendict import frozendict
+import numpy as np
 
 from bgpy.as_graphs import AS
 from bgpy.enums import Plane, Outcomes, Relationships
@@ -22,13 +26,21 @@ class ASGraphAnalyzer(BaseASGraphAnalyzer):
         scenario: "Scenario",
         data_plane_tracking: bool = True,
         control_plane_tracking: bool = False,
+        # Trace back the data plane of all ASes at once with pointer jumping
+        # rather than recursively AS by AS
+        array_traceback: bool = False,
     ) -> None:
         self.engine: BaseSimulationEngine = engine
         self.scenario: "Scenario" = scenario
+        # Members of equivalence classes take the outcome of their representative
+        self._representatives: frozendict[int, int] = engine.representatives
+        # Stubs whose anns are only processed on demand
+        self._lazy_asns: frozenset[int] = engine.lazy_asns
         self._most_specific_ann_dict: dict[AS, Optional["Ann"]] = {
             # Get the most specific ann in the rib
             as_obj: self._get_most_specific_ann(as_obj)
             for as_obj in engine.as_graph
+            if as_obj.asn not in self._representatives
         }
         self._data_plane_outcomes: dict[int, int] = dict()
         self._control_plane_outcomes: dict[int, int] = dict()
@@ -38,31 +50,66 @@ class ASGraphAnalyzer(BaseASGraphAnalyzer):
         }
         self.data_plane_tracking: bool = data_plane_tracking
         self.control_plane_tracking: bool = control_plane_tracking
+        self.array_traceback: bool = array_traceback
 
     def _get_most_specific_ann(self, as_obj: AS) -> Optional["Ann"]:
         """Returns the most specific announcement that exists in a rib
 
         as_obj is the as
-        ordered prefixes are prefixes ordered from most specific to least
         """
 
-        for prefix in self.scenario.ordered_prefix_subprefix_dict:
-            most_specific_ann = as_obj.policy._local_rib.get(prefix)
+        if as_obj.asn in self._lazy_asns:
+            return self._get_lazy_most_specific_ann(as_obj)
+
+        # The local RIB keeps a pointer to its most specific prefix
+        return as_obj.policy._local_rib.get_most_specific_ann(  # type: ignore
+            self.scenario.prefix_registry
+        )
+
+    def _get_lazy_most_specific_ann(self, as_obj: AS) -> Optional["Ann"]:
+        """Returns the most specific announcement of a lazy stub
+
+        Lazy stubs (see SimulationEngine) have empty local RIBs, so the
+        engine computes their anns from their recv_q, most specific first
+        """
+
+        recv_q = as_obj.policy._recv_q
+        # Most stubs only receive one prefix, so only scan them all if needed
+        prefixes: Iterable[str] = (
+            tuple(recv_q)
+            if len(recv_q) <= 1
+            else self.scenario.prefix_registry.prefixes
+        )
+        get_lazy_ann = self.engine.get_lazy_ann  # type: ignore
+        for prefix in prefixes:
+            most_specific_ann: Optional["Ann"] = get_lazy_ann(as_obj, prefix)
             if most_specific_ann:
-                # Mypy doesn't recognize that this is always an annoucnement
-                return most_specific_ann  # type: ignore
+                return most_specific_ann
         return None
 
     def analyze(self) -> dict[int, dict[int, int]]:
-        """Takes in engine and outputs traceback for ctrl + data plane data"""
+        """Takes in engine and outputs traceback for ctrl + data plane data
 
+        Members of equivalence classes (see SimulationEngine) get the outcomes
+        of their representative, and are skipped by the other outcome hook
+        """
+
+        representatives = self._representatives
+        if self.data_plane_tracking and self.array_traceback:
+            self._set_data_plane_outcomes_with_arrays()
         for as_obj in self.engine.as_graph:
-            if self.data_plane_tracking:
+            if as_obj.asn in representatives:
+                continue
+            if self.data_plane_tracking and not self.array_traceback:
                 # Gets AS outcome and stores it in the outcomes dict
                 self._get_as_outcome_data_plane(as_obj)
             if self.control_plane_tracking:
                 self._get_as_outcome_ctrl_plane(as_obj)
             self._get_other_as_outcome_hook(as_obj)
+        for outcomes in self.outcomes.values():
+            if outcomes:
+                for asn, representative_asn in representatives.items():
+                    outcomes[asn] = outcomes[representative_asn]
         return self.outcomes
 
     ####################
@@ -97,6 +144,63 @@ class ASGraphAnalyzer(BaseASGraphAnalyzer):
             self._data_plane_outcomes[as_obj.asn] = outcome_int
             return outcome_int
 
+    def _set_data_plane_outcomes_with_arrays(self) -> None:
+        """Sets the data plane outcomes of all ASes at once
+
+        Each AS either has an outcome of its own, or points to its next hop
+        (and members of equivalence classes point to their representative).
+        Then pointer jumping (next_hops = next_hops[next_hops]) resolves all
+        ASes in log(longest path) steps, and ASes that still don't reach an
+        outcome are in (or lead into) a forwarding loop.
+        Those are disconnected, since their traffic never arrives
+        """
+
+        as_graph = self.engine.as_graph
+        arrays = as_graph.get_arrays()
+        asn_to_index = arrays.asn_to_index
+        representatives = self._representatives
+        undetermined = Outcomes.UNDETERMINED.value
+
+        outcomes = np.full(len(arrays), undetermined, dtype=np.int64)
+        # ASes with an outcome point to themselves
+        next_hops = np.arange(len(arrays), dtype=np.int64)
+        for i, as_obj in enumerate(as_graph):
+            if as_obj.asn in representatives:
+                next_hops[i] = asn_to_index[representatives[as_obj.asn]]
+                continue
+            most_specific_ann = self._most_specific_ann_dict[as_obj]
+            outcome_int = self._determine_as_outcome_data_plane(
+                as_obj, most_specific_ann
+            )
+            if outcome_int == undetermined:
+                # NOTE: Starting in v4, this is the next hop,
+                # not the next ASN in the AS PATH
+                next_hops[i] = asn_to_index[
+                    most_specific_ann.next_hop_asn  # type: ignore
+                ]
+            else:
+                outcomes[i] = outcome_int
+
+        # Paths are at most len(arrays) long, so this many jumps reach the end
+        # Pointers within loops never settle, so the number of jumps is bounded
+        for _ in range(len(arrays).bit_length() + 1):
+            jumped = next_hops[next_hops]
+            if np.array_equal(jumped, next_hops):
+                break
+            next_hops = jumped
+        outcomes = outcomes[next_hops]
+
+        looped = outcomes == undetermined
+        if looped.any():
+            warnings.warn(
+                f"{int(looped.sum())} ASes have forwarding loops on the data "
+                "plane, so they are disconnected",
+                RuntimeWarning,
+            )
+            outcomes[looped] = Outcomes.DISCONNECTED.value
+
+        self._data_plane_outcomes.update(zip(arrays.asns.tolist(), outcomes.tolist()))
+
     def _determine_as_outcome_data_plane(
         self, as_obj: AS, most_specific_ann: Optional["Ann"]
     ) -> int:
@@ -0,0 +1,146 @@
+"""Functions to checkpoint work units of a Simulation, and resume from them"""
+
+from dataclasses import fields, is_dataclass
+from hashlib import sha256
+import json
+import os
+import pickle
+import random
+import shutil
+from typing import Any, Optional, TYPE_CHECKING, Union
+
+from bgpy.enums import SpecialPercentAdoptions
+
+if TYPE_CHECKING:
+    from .metric_tracker import MetricTracker
+    from .simulation import Simulation
+
+
+def _get_unit_id(
+    self: "Simulation",
+    unit_kind: str,
+    unit_index: int,
+    percent_adopt_trials: list[tuple[Union[float, SpecialPercentAdoptions], int]],
+) -> Optional[str]:
+    """Returns a deterministic ID of a work unit (chunk or task)
+
+    The ID changes along with anything that changes the unit's results,
+    (such as its trials, seed, and scenario configs) so that checkpoints
+    of a different sweep are never resumed. None if not checkpointing
+    """
+
+    if self.checkpoint_trials is None:
+        return None
+
+    unit_key = {
+        "unit_kind": unit_kind,
+        "unit_index": unit_index,
+        "percent_adopt_trials": percent_adopt_trials,
+        "python_hash_seed": self.python_hash_seed,
+        "scenario_configs": self.scenario_configs,
+        "metric_keys": self.metric_keys,
+        "batch_size": self.batch_size,
+        "ASGraphConstructorCls": self.ASGraphConstructorCls,
+        "as_graph_constructor_kwargs": self.as_graph_constructor_kwargs,
+        "SimulationEngineCls": self.SimulationEngineCls,
+        "ASGraphAnalyzerCls": self.ASGraphAnalyzerCls,
+        "MetricTrackerCls": self.MetricTrackerCls,
+        "data_plane_tracking": self.data_plane_tracking,
+        "control_plane_tracking": self.control_plane_tracking,
+        "equivalence_classes": self.equivalence_classes,
+        "lazy_stubs": self.lazy_stubs,
+        "running_metric_stats": self.running_metric_stats,
+        "array_traceback": self.array_traceback,
+    }
+    unit_hash = sha256(
+        json.dumps(unit_key, sort_keys=True, default=_get_unit_key_value).encode()
+    ).hexdigest()
+    return f"{unit_kind}_{unit_index}_{unit_hash[:16]}"
+
+
+def _get_unit_key_value(obj: Any) -> Any:
+    """Returns a JSON serializable value of obj for the unit ID
+
+    Classes and functions are replaced by their names, since their reprs
+    contain memory addresses that change from run to run
+    """
+
+    if isinstance(obj, type) or callable(obj):
+        return f"{obj.__module__}.{obj.__qualname__}"
+    elif is_dataclass(obj):
+        return {x.name: getattr(obj, x.name) for x in fields(obj)}
+    elif isinstance(obj, (set, frozenset)):
+        return sorted(obj, key=repr)
+    elif hasattr(obj, "items"):
+        return {str(k): v for k, v in obj.items()}
+    else:
+        return str(obj)
+
+
+def _checkpoint_due(
+    self: "Simulation", trials_done: int, checkpointed_trials: int, num_trials: int
+) -> bool:
+    """Returns True if the next checkpoint of a unit should be written
+
+    Always written once all trials of the unit are done, so that
+    completed units can be skipped entirely
+    """
+
+    assert self.checkpoint_trials is not None, "Not checkpointing"
+    return (
+        trials_done - checkpointed_trials >= self.checkpoint_trials
+        or trials_done == num_trials
+    )
+
+
+def _read_checkpoint(
+    self: "Simulation", unit_id: Optional[str]
+) -> Optional[dict[str, Any]]:
+    """Returns the last checkpoint of the unit, if there is one
+
+    The checkpoint contains the number of trials that are done, the
+    metric tracker of those trials, and the random state after them
+    """
+
+    if unit_id is None:
+        return None
+    path = self.checkpoint_dir / f"{unit_id}.pickle"
+    if not path.exists():
+        return None
+    with path.open("rb") as f:
+        checkpoint: dict[str, Any] = pickle.load(f)
+        return checkpoint
+
+
+def _write_checkpoint(
+    self: "Simulation",
+    unit_id: str,
+    trials_done: int,
+    metric_tracker: "MetricTracker",
+) -> None:
+    """Writes the checkpoint of the unit
+
+    Written to a temporary file first, so that a crash while writing
+    never leaves a partial checkpoint behind
+    """
+
+    self.checkpoint_dir.mkdir(parents=True, exist_ok=True)
+    path = self.checkpoint_dir / f"{unit_id}.pickle"
+    tmp_path = path.with_name(f"{path.name}.{os.getpid()}.tmp")
+    with tmp_path.open("wb") as f:
+        pickle.dump(
+            {
+                "trials_done": trials_done,
+                "random_state": random.getstate(),
+                "metric_tracker": metric_tracker,
+            },
+            f,
+        )
+    os.replace(tmp_path, path)
+
+
+def _remove_checkpoints(self: "Simulation") -> None:
+    """Removes all checkpoints, once the results have been written"""
+
+    if self.checkpoint_trials is not None:
+        shutil.rmtree(self.checkpoint_dir, ignore_errors=True)
@@ -1,16 +1,22 @@
 from collections import defaultdict
 from functools import cached_property
 import gc
+from hashlib import sha256
 from itertools import product
+import json
+from multiprocessing import Pool
 from pathlib import Path
 import pickle
-from typing import Any
+from typing import Any, Optional
 
 import matplotlib  # type: ignore
 import matplotlib.pyplot as plt  # type: ignore
+import numpy as np
+from numpy.typing import NDArray
 from tqdm import tqdm
 
 from .metric_tracker.metric_key import MetricKey
+from .metric_tracker.results_store import ResultsStore
 from .utils import get_all_metric_keys
 
 from bgpy.enums import SpecialPercentAdoptions
@@ -22,7 +28,8 @@ class GraphFactory:
 
     def __init__(
         self,
-        pickle_path: Path,
+        # Can be None if results_path is passed
+        pickle_path: Optional[Path],
         graph_dir: Path,
         # A nice way to substitute labels post run
         label_replacement_dict=None,
@@ -31,29 +38,30 @@ class GraphFactory:
         x_limit: int = 100,
         y_limit: int = 100,
         metric_keys: tuple[MetricKey, ...] = tuple(list(get_all_metric_keys())),
+        # Columnar results (see ResultsStore). Used instead of the pickle
+        # if it exists, since it doesn't have to be unpickled
+        results_path: Optional[Path] = None,
+        # Graphs are rendered in parallel with this many processes
+        parse_cpus: int = 1,
     ) -> None:
-        self.pickle_path: Path = pickle_path
-        with self.pickle_path.open("rb") as f:
-            self.graph_rows = pickle.load(f)
-            max_prop_round = max(
-                x["data_key"].propagation_round for x in self.graph_rows
-            )
-            self.graph_rows = [
-                x
-                for x in self.graph_rows
-                if x["data_key"].propagation_round == max_prop_round
-            ]
+        self.pickle_path: Optional[Path] = pickle_path
+        self.results_path: Optional[Path] = results_path
+        results = self._read_results()
+        max_prop_round = results.propagation_rounds.max(initial=0)
+        self.results: ResultsStore = results.select(
+            results.propagation_rounds == max_prop_round
+        )
 
-            propagation_rounds = [
-                x["data_key"].scenario_config.propagation_rounds
-                for x in self.graph_rows
-            ]
-            if len(set(propagation_rounds)) != 1:
-                raise NotImplementedError(
-                    "Default grapher doesn't account for differing propagation rounds, "
-                    "You'll need to write your own GraphFactory and pass it into "
-                    "sim.run with sim.run(GraphFactoryCls=MyGraphFactoryCls)"
-                )
+        propagation_rounds = {
+            self.results.scenario_configs[x].propagation_rounds
+            for x in np.unique(self.results.scenario_config_ids).tolist()
+        }
+        if len(propagation_rounds) != 1:
+            raise NotImplementedError(
+                "Default grapher doesn't account for differing propagation rounds, "
+                "You'll need to write your own GraphFactory and pass it into "
+                "sim.run with sim.run(GraphFactoryCls=MyGraphFactoryCls)"
+            )
         self.graph_dir: Path = graph_dir
         self.graph_dir.mkdir(parents=True, exist_ok=True)
 
@@ -72,42 +80,207 @@ class GraphFactory:
         self.y_limit = y_limit
 
         self.metric_keys: tuple[MetricKey, ...] = metric_keys
+        self.parse_cpus: int = parse_cpus
 
     def generate_graphs(self) -> None:
-        """Generates default graphs"""
+        """Generates default graphs
+
+        Graphs whose rows (and settings) haven't changed since they were
+        last written are skipped. The rest are rendered in parallel
+        if parse_cpus > 1
+        """
 
         # Each metric key here contains plane, as group, and outcome
         # In other words, aech type of graph
 
         graph_infos = list(product(self.metric_keys, [True, False, Any]))
+        results = self._get_graph_results()
+        graph_row_indices = self._get_graph_row_indices(results)
+        graph_hashes = self._read_graph_hashes()
+
+        # (metric_key, relevant_rows, adopting) of graphs that must be rendered
+        graph_args: list[tuple[MetricKey, list[dict[str, Any]], Any]] = list()
+        for metric_key, adopting in graph_infos:
+            row_indices = graph_row_indices.get(
+                (metric_key.plane, metric_key.as_group, metric_key.outcome, adopting)
+            )
+            if row_indices is None:
+                continue
+            relevant_rows = results.select(row_indices).to_pickle_data()
+            graph_name = self._get_graph_name(metric_key, relevant_rows, adopting)
+            graph_hash = self._get_graph_hash(graph_name, relevant_rows)
+            if (
+                graph_hashes.get(graph_name) == graph_hash
+                and (self.graph_dir / graph_name).exists()
+            ):
+                continue
+            graph_hashes[graph_name] = graph_hash
+            graph_args.append((metric_key, relevant_rows, adopting))
+
+        if self.parse_cpus > 1 and len(graph_args) > 1:
+            with Pool(min(self.parse_cpus, len(graph_args))) as p:
+                p.starmap(self._generate_graph, graph_args)
+        else:
+            for metric_key, relevant_rows, adopting in tqdm(
+                graph_args, total=len(graph_args), desc="Writing Graphs"
+            ):
+                self._generate_graph(metric_key, relevant_rows, adopting=adopting)
+        self._write_graph_hashes(graph_hashes)
+
+    def _get_graph_results(self) -> ResultsStore:
+        """Returns the results to graph
+
+        Subclasses that override (or set) graph_rows to filter or replace
+        the rows are graphed from those rows instead
+        """
+
+        overridden = type(self).graph_rows is not GraphFactory.graph_rows
+        if overridden or "graph_rows" in vars(self):
+            return ResultsStore.from_pickle_data(self.graph_rows)
+        return self.results
+
+    def _get_graph_row_indices(
+        self, results: ResultsStore
+    ) -> dict[tuple[Any, ...], NDArray[np.int64]]:
+        """Returns {(plane, as_group, outcome, adopting): row indices}
+
+        Rows are grouped once, rather than scanned once per graph.
+        Adopting graphs use the rows of the AdoptPolicyCls, non adopting
+        graphs use the rows of the BasePolicyCls, and Any uses all ASes
+        """
+
+        # {PolicyCls: ID}, so that the policy classes of rows are arrays
+        PolicyCls_ids: dict[Optional[type[Policy]], int] = dict()
+
+        def get_row_PolicyCls_ids(
+            table_ids: NDArray[np.int32], PolicyClses: list[Optional[type[Policy]]]
+        ) -> NDArray[np.int64]:
+            """Returns the ID of the policy class of each row's table entry"""
+
+            ids = np.array(
+                [PolicyCls_ids.setdefault(x, len(PolicyCls_ids)) for x in PolicyClses],
+                dtype=np.int64,
+            )
+            return ids[table_ids]
+
+        row_PolicyClses = get_row_PolicyCls_ids(
+            results.metric_key_ids, [x.PolicyCls for x in results.metric_keys]
+        )
+        adopting_PolicyClses = {
+            True: get_row_PolicyCls_ids(
+                results.scenario_config_ids,
+                [x.AdoptPolicyCls for x in results.scenario_configs],
+            ),
+            False: get_row_PolicyCls_ids(
+                results.scenario_config_ids,
+                [x.BasePolicyCls for x in results.scenario_configs],
+            ),
+            Any: get_row_PolicyCls_ids(
+                np.zeros(len(results), dtype=np.int32), [Policy]
+            ),
+        }
+
+        # (plane, as_group, outcome) of each row
+        graph_keys: dict[tuple[Any, ...], int] = dict()
+        metric_key_graph_ids = np.array(
+            [
+                graph_keys.setdefault((x.plane, x.as_group, x.outcome), len(graph_keys))
+                for x in results.metric_keys
+            ],
+            dtype=np.int64,
+        )
+        row_graph_ids = metric_key_graph_ids[results.metric_key_ids]
+        graph_key_list = list(graph_keys)
+
+        graph_row_indices: dict[tuple[Any, ...], NDArray[np.int64]] = dict()
+        for adopting, graph_PolicyClses in adopting_PolicyClses.items():
+            row_indices = np.flatnonzero(row_PolicyClses == graph_PolicyClses)
+            # Stable, so rows stay in the same order within each graph
+            row_indices = row_indices[
+                np.argsort(row_graph_ids[row_indices], kind="stable")
+            ]
+            graph_ids = row_graph_ids[row_indices]
+            splits = np.flatnonzero(np.diff(graph_ids)) + 1
+            starts = [0, *splits.tolist()]
+            for start, indices in zip(starts, np.split(row_indices, splits)):
+                if len(indices):
+                    graph_key = graph_key_list[int(graph_ids[start])]
+                    graph_row_indices[(*graph_key, adopting)] = indices
+        return graph_row_indices
+
+    ###############
+    # Graph cache #
+    ###############
+
+    @property
+    def graph_hashes_path(self) -> Path:
+        return self.graph_dir / "graph_hashes.json"
+
+    def _get_graph_hash(self, graph_name: str, relevant_rows) -> str:
+        """Returns a hash of everything that's drawn on the graph"""
+
+        content = {
+            "graph_name": graph_name,
+            "rows": [
+                (
+                    row["data_key"].scenario_config.scenario_label,
+                    float(row["data_key"].percent_adopt),
+                    row["value"],
+                    row["yerr"],
+                )
+                for row in relevant_rows
+            ],
+            "label_replacement_dict": self.label_replacement_dict,
+            "x_axis_label_replacement_dict": self.x_axis_label_replacement_dict,
+            "y_axis_label_replacement_dict": self.y_axis_label_replacement_dict,
+            "x_limit": self.x_limit,
+            "y_limit": self.y_limit,
+            "GraphFactoryCls": self.__class__.__qualname__,
+        }
+        return sha256(
+            json.dumps(content, sort_keys=True, default=str).encode()
+        ).hexdigest()
 
-        for metric_key, adopting in tqdm(
-            graph_infos, total=len(graph_infos), desc="Writing Graphs"
-        ):
-            relevant_rows = list()
-            for row in self.graph_rows:
-                # Get all the rows that correspond to that type of graph
-                BasePolicyCls = row["data_key"].scenario_config.BasePolicyCls
-                AdoptPolicyCls = row["data_key"].scenario_config.AdoptPolicyCls
-                if (
-                    row["metric_key"].plane == metric_key.plane
-                    and row["metric_key"].as_group == metric_key.as_group
-                    and row["metric_key"].outcome == metric_key.outcome
-                    and (
-                        (
-                            row["metric_key"].PolicyCls == BasePolicyCls
-                            and adopting is False
-                        )
-                        or (
-                            row["metric_key"].PolicyCls == AdoptPolicyCls
-                            and adopting is True
-                        )
-                        or (row["metric_key"].PolicyCls == Policy and adopting is Any)
-                    )
-                ):
-                    relevant_rows.append(row)
-
-            self._generate_graph(metric_key, relevant_rows, adopting=adopting)
+    def _read_graph_hashes(self) -> dict[str, str]:
+        """Returns {graph name: hash} of the graphs that were last written"""
+
+        if self.graph_hashes_path.exists():
+            with self.graph_hashes_path.open() as f:
+                graph_hashes: dict[str, str] = json.load(f)
+                return graph_hashes
+        return dict()
+
+    def _write_graph_hashes(self, graph_hashes: dict[str, str]) -> None:
+        with self.graph_hashes_path.open("w") as f:
+            json.dump(graph_hashes, f, indent=4, sort_keys=True)
+
+    def __getstate__(self) -> dict[str, Any]:
+        """Workers only render graphs, so they don't need the results"""
+
+        state = self.__dict__.copy()
+        state.pop("results", None)
+        state.pop("graph_rows", None)
+        return state
+
+    @cached_property
+    def graph_rows(self) -> list[dict[str, Any]]:
+        """Rows of the last propagation round, same as the pickle
+
+        Override (or set) this to filter or replace the rows that are graphed
+        """
+
+        return self.results.to_pickle_data()
+
+    def _read_results(self) -> ResultsStore:
+        """Reads the columnar results if they exist, else the pickle"""
+
+        if self.results_path is not None:
+            results = ResultsStore.read(self.results_path)
+            if results is not None:
+                return results
+        assert self.pickle_path is not None, "No results_path or pickle_path"
+        with self.pickle_path.open("rb") as f:
+            return ResultsStore.from_pickle_data(pickle.load(f))
 
     def _generate_graph(self, metric_key: MetricKey, relevant_rows, adopting) -> None:
         """Writes a graph to the graph dir"""
@@ -127,16 +300,7 @@ class GraphFactory:
 
         if not relevant_rows:
             return
-        adopting_str = str(adopting) if isinstance(adopting, bool) else "Any"
-        scenario_config = relevant_rows[0]["data_key"].scenario_config
-        mod_name = scenario_config.preprocess_anns_func.__name__
-        graph_name = (
-            f"{scenario_config.ScenarioCls.__name__}_{mod_name}"
-            f"/{metric_key.as_group.value}"
-            f"/adopting_is_{adopting_str}"
-            f"/{metric_key.plane.name}"
-            f"/{metric_key.outcome.name}.png"
-        ).replace(" ", "")
+        graph_name = self._get_graph_name(metric_key, relevant_rows, adopting)
         label_rows_dict = defaultdict(list)
         for row in relevant_rows:
             label_rows_dict[row["data_key"].scenario_config.scenario_label].append(row)
@@ -215,6 +379,20 @@ class GraphFactory:
         # this bug leaks enough memory to crash the server, so we must garbage collect
         gc.collect()
 
+    def _get_graph_name(self, metric_key: MetricKey, relevant_rows, adopting) -> str:
+        """Returns the path of the graph within the graph dir"""
+
+        adopting_str = str(adopting) if isinstance(adopting, bool) else "Any"
+        scenario_config = relevant_rows[0]["data_key"].scenario_config
+        mod_name = scenario_config.preprocess_anns_func.__name__
+        return (
+            f"{scenario_config.ScenarioCls.__name__}_{mod_name}"
+            f"/{metric_key.as_group.value}"
+            f"/adopting_is_{adopting_str}"
+            f"/{metric_key.plane.name}"
+            f"/{metric_key.outcome.name}.png"
+        ).replace(" ", "")
+
     @cached_property
     def markers(self) -> tuple[str, ...]:
         # Leaving this as a list here for mypy
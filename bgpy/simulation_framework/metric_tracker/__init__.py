@@ -1,5 +1,7 @@
 from .data_key import DataKey
 from .metric import Metric
 from .metric_tracker import MetricTracker
+from .results_store import ResultsStore
+from .running_stats import RunningStats
 
-__all__ = ["DataKey", "Metric", "MetricTracker"]
+__all__ = ["DataKey", "Metric", "MetricTracker", "ResultsStore", "RunningStats"]
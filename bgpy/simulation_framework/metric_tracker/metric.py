@@ -2,6 +2,9 @@ from collections import defaultdict
 from dataclasses import replace
 from typing import Optional, Type
 
+import numpy as np
+from numpy.typing import NDArray
+
 from bgpy.enums import Plane
 from bgpy.as_graphs import AS
 from bgpy.simulation_engine import Policy, BaseSimulationEngine
@@ -73,23 +76,68 @@ class Metric:
         scenario: Scenario,
         ctrl_plane_outcome: int,
         data_plane_outcome: int,
+        weight: int = 1,
     ):
-        within_denom = self._add_denominator(
-            as_obj=as_obj,
-            engine=engine,
-            scenario=scenario,
-            ctrl_plane_outcome=ctrl_plane_outcome,
-            data_plane_outcome=data_plane_outcome,
-        )
+        """Adds the outcome of an AS
+
+        weight is the number of ASes with this outcome (such as members of
+        an equivalence class, see SimulationEngine). It's only passed on when
+        it isn't 1, so subclasses that override _add_numerator and
+        _add_denominator without it still work without equivalence classes
+        """
+
+        kwargs = {
+            "as_obj": as_obj,
+            "engine": engine,
+            "scenario": scenario,
+            "ctrl_plane_outcome": ctrl_plane_outcome,
+            "data_plane_outcome": data_plane_outcome,
+        }
+        if weight != 1:
+            kwargs["weight"] = weight
+
+        within_denom = self._add_denominator(**kwargs)  # type: ignore
 
         if within_denom:
-            self._add_numerator(
-                as_obj=as_obj,
-                engine=engine,
-                scenario=scenario,
-                ctrl_plane_outcome=ctrl_plane_outcome,
-                data_plane_outcome=data_plane_outcome,
+            self._add_numerator(**kwargs)  # type: ignore
+
+    def add_data_arrays(
+        self,
+        *,
+        engine: BaseSimulationEngine,
+        ctrl_plane_outcomes: NDArray[np.int64],
+        data_plane_outcomes: NDArray[np.int64],
+        weights: NDArray[np.int64],
+        policy_indices: NDArray[np.int64],
+        PolicyClses: list[type[Policy]],
+    ) -> None:
+        """Adds the outcomes of all ASes at once, same as add_data for each AS
+
+        Arrays are indexed the same as the AS graph's arrays. weights are 0
+        for ASes that aren't counted, and PolicyClses[policy_indices[i]] is
+        the policy class of the AS at index i
+        """
+
+        if self.metric_key.plane == Plane.DATA:
+            outcomes = data_plane_outcomes
+        elif self.metric_key.plane == Plane.CTRL:
+            outcomes = ctrl_plane_outcomes
+        else:
+            raise NotImplementedError
+
+        as_group_masks = engine.as_graph.get_asn_group_masks()
+        denom_weights = weights * as_group_masks[self.metric_key.as_group.value]
+        num_weights = denom_weights * (outcomes == self.metric_key.outcome.value)
+        for totals, weights_array in (
+            (self._denominators, denom_weights),
+            (self._numerators, num_weights),
+        ):
+            counts = np.bincount(
+                policy_indices, weights=weights_array, minlength=len(PolicyClses)
             )
+            for i in np.flatnonzero(counts).tolist():
+                totals[PolicyClses[i]] += int(counts[i])
+                totals[Policy] += int(counts[i])  # type: ignore
 
     def _add_numerator(
         self,
@@ -99,6 +147,7 @@ class Metric:
         scenario: Scenario,
         ctrl_plane_outcome: int,
         data_plane_outcome: int,
+        weight: int = 1,
     ) -> None:
         """Adds to numerator if it is within the as group and the outcome is correct"""
 
@@ -114,8 +163,8 @@ class Metric:
             outcome == self.metric_key.outcome.value
             and as_obj.asn in engine.as_graph.asn_groups[self.metric_key.as_group.value]
         ):
-            self._numerators[as_obj.policy.__class__] += 1
-            self._numerators[Policy] += 1  # type: ignore
+            self._numerators[as_obj.policy.__class__] += weight
+            self._numerators[Policy] += weight  # type: ignore
 
     def _add_denominator(
         self,
@@ -125,12 +174,13 @@ class Metric:
         scenario: Scenario,
         ctrl_plane_outcome: int,
         data_plane_outcome: int,
+        weight: int = 1,
     ) -> bool:
         """Adds to the denominator if it is within the as group"""
 
         if as_obj.asn in engine.as_graph.asn_groups[self.metric_key.as_group.value]:
-            self._denominators[as_obj.policy.__class__] += 1
-            self._denominators[Policy] += 1  # type: ignore
+            self._denominators[as_obj.policy.__class__] += weight
+            self._denominators[Policy] += weight  # type: ignore
             return True
         else:
             return False
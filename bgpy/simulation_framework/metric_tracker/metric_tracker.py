@@ -5,14 +5,19 @@ from pathlib import Path
 import pickle
 from statistics import mean
 from statistics import stdev
-from typing import Any, Optional, Union
+from typing import Any, Iterator, Optional, Union
+
+import numpy as np
+from numpy.typing import NDArray
 
 from .data_key import DataKey
 from .metric import Metric
 from .metric_key import MetricKey
+from .results_store import ResultsStore
+from .running_stats import RunningStats
 
 from bgpy.enums import Plane, SpecialPercentAdoptions, Outcomes
-from bgpy.simulation_engine import BaseSimulationEngine
+from bgpy.simulation_engine import BaseSimulationEngine, Policy
 from bgpy.simulation_framework.scenarios import Scenario
 from bgpy.simulation_framework.utils import get_all_metric_keys
 
@@ -24,8 +29,15 @@ class MetricTracker:
         self,
         data: Optional[defaultdict[DataKey, list[Metric]]] = None,
         metric_keys: tuple[MetricKey, ...] = tuple(list(get_all_metric_keys())),
+        running_stats: bool = False,
+        stats: Optional[defaultdict[DataKey, dict[MetricKey, RunningStats]]] = None,
     ):
-        """Inits data"""
+        """Inits data
+
+        If running_stats, rather than keeping every trial's metrics in data,
+        only the running stats of each metric are kept in stats. Then memory
+        doesn't grow with the number of trials, and merging is O(keys)
+        """
 
         # This is a list of all the trial info
         # You must save info trial by trial, so that you can join
@@ -39,6 +51,14 @@ class MetricTracker:
 
         self.metric_keys: tuple[MetricKey, ...] = metric_keys
 
+        self.running_stats: bool = running_stats
+        # key DataKey, value is {MetricKey (with PolicyCls): RunningStats}
+        if stats:
+            self.stats: defaultdict[DataKey, dict[MetricKey, RunningStats]] = stats
+        else:
+            self.stats = defaultdict(dict)
+        assert not (running_stats and self.data), "Running stats don't keep data"
+
     #############
     # Add Funcs #
     #############
@@ -50,7 +70,21 @@ class MetricTracker:
         from the various processes that were spawned
         """
 
-        if isinstance(other, MetricTracker):
+        if isinstance(other, MetricTracker) and (
+            self.running_stats or other.running_stats
+        ):
+            new_stats: defaultdict[DataKey, dict[MetricKey, RunningStats]] = (
+                defaultdict(dict)
+            )
+            for obj in (self, other):
+                for data_key, metric_stats in obj.stats.items():
+                    new_metric_stats = new_stats[data_key]
+                    for metric_key, stats in metric_stats.items():
+                        new_metric_stats[metric_key] = (
+                            new_metric_stats.get(metric_key, RunningStats()) + stats
+                        )
+            return self.__class__(running_stats=True, stats=new_stats)
+        elif isinstance(other, MetricTracker):
             # Deepcopy is slow, but fine here since it's only called once after sims
             # For BGPy __main__ using 100 trials, 3 percent adoptions, 1 scenario
             # on a lenovo laptop
@@ -80,8 +114,12 @@ class MetricTracker:
         self,
         csv_path: Path,
         pickle_path: Path,
+        results_path: Optional[Path] = None,
     ) -> None:
-        """Writes data to CSV and pickles it"""
+        """Writes data to CSV and pickles it
+
+        If there's a results_path, also writes the columnar ResultsStore
+        """
 
         with csv_path.open("w") as f:
             rows = self.get_csv_rows()
@@ -89,15 +127,62 @@ class MetricTracker:
             writer.writeheader()
             writer.writerows(rows)
 
+        pickle_data = self.get_pickle_data()
         with pickle_path.open("wb") as f:
-            pickle.dump(self.get_pickle_data(), f)
+            pickle.dump(pickle_data, f)
+
+        if results_path is not None:
+            ResultsStore.from_pickle_data(pickle_data).write(results_path)
 
     def get_csv_rows(self) -> list[dict[str, Any]]:
         """Returns rows for a CSV"""
 
         rows = list()
+        for data_key, metric_key, value, yerr in self._get_aggregates():
+            assert metric_key.PolicyCls
+            row = {
+                "scenario_cls": data_key.scenario_config.ScenarioCls.__name__,
+                "AdoptingPolicyCls": (data_key.scenario_config.AdoptPolicyCls.__name__),
+                "BasePolicyCls": data_key.scenario_config.BasePolicyCls.__name__,
+                "PolicyCls": metric_key.PolicyCls.__name__,
+                "outcome_type": metric_key.plane.name,
+                "as_group": metric_key.as_group.value,
+                "outcome": metric_key.outcome.name,
+                "percent_adopt": data_key.percent_adopt,
+                "propagation_round": data_key.propagation_round,
+                "value": value,
+                "yerr": yerr,
+                "scenario_config_label": data_key.scenario_config.csv_label,
+                "scenario_label": data_key.scenario_config.scenario_label,
+            }
+            rows.append(row)
+        return rows
+
+    def get_pickle_data(self):
+        agg_data = list()
+        for data_key, metric_key, value, yerr in self._get_aggregates():
+            row = {
+                "data_key": data_key,
+                "metric_key": metric_key,
+                "value": value,
+                "yerr": yerr,
+            }
+            agg_data.append(row)
+        return agg_data
+
+    def _get_aggregates(
+        self,
+    ) -> Iterator[tuple[DataKey, MetricKey, Optional[float], float]]:
+        """Yields the data key, metric key, mean, and yerr of each metric"""
+
+        if self.running_stats:
+            for data_key, metric_stats in self.stats.items():
+                for metric_key, stats in metric_stats.items():
+                    yield data_key, metric_key, stats.value, self._get_stats_yerr(stats)
+            return
+
         for data_key, metric_list in self.data.items():
-            agg_percents = sum(metric_list, start=metric_list[0]).percents
+            agg_percents = sum(metric_list[1:], start=metric_list[0]).percents
             # useful for debugging individual trials
             # from pprint import pprint
             # pprint(data_key)
@@ -106,46 +191,14 @@ class MetricTracker:
             #     pprint(x.percents)
             # input("waiting")
             for metric_key, trial_data in agg_percents.items():
-                assert metric_key.PolicyCls
-                row = {
-                    "scenario_cls": data_key.scenario_config.ScenarioCls.__name__,
-                    "AdoptingPolicyCls": (
-                        data_key.scenario_config.AdoptPolicyCls.__name__
-                    ),
-                    "BasePolicyCls": data_key.scenario_config.BasePolicyCls.__name__,
-                    "PolicyCls": metric_key.PolicyCls.__name__,
-                    "outcome_type": metric_key.plane.name,
-                    "as_group": metric_key.as_group.value,
-                    "outcome": metric_key.outcome.name,
-                    "percent_adopt": data_key.percent_adopt,
-                    "propagation_round": data_key.propagation_round,
-                    # trial_data can sometimes be empty
-                    # for example, if we have 1 adopting AS for stubs_and_multihomed
-                    # and that AS is multihomed, and not a stub, then for stubs,
-                    # no ASes adopt, and trial_data is empty
-                    # This is the proper way to do it, rather than defaulting trial_data
-                    # to [0], which skews results when aggregating trials
-                    "value": mean(trial_data) if trial_data else None,
-                    "yerr": self._get_yerr(trial_data),
-                    "scenario_config_label": data_key.scenario_config.csv_label,
-                    "scenario_label": data_key.scenario_config.scenario_label,
-                }
-                rows.append(row)
-        return rows
-
-    def get_pickle_data(self):
-        agg_data = list()
-        for data_key, metric_list in self.data.items():
-            agg_percents = sum(metric_list, start=metric_list[0]).percents
-            for metric_key, trial_data in agg_percents.items():
-                row = {
-                    "data_key": data_key,
-                    "metric_key": metric_key,
-                    "value": mean(trial_data) if trial_data else None,
-                    "yerr": self._get_yerr(trial_data),
-                }
-                agg_data.append(row)
-        return agg_data
+                # trial_data can sometimes be empty
+                # for example, if we have 1 adopting AS for stubs_and_multihomed
+                # and that AS is multihomed, and not a stub, then for stubs,
+                # no ASes adopt, and trial_data is empty
+                # This is the proper way to do it, rather than defaulting trial_data
+                # to [0], which skews results when aggregating trials
+                value = mean(trial_data) if trial_data else None
+                yield data_key, metric_key, value, self._get_yerr(trial_data)
 
     def _get_yerr(self, trial_data: list[float]) -> float:
         """Returns 90% confidence interval for graphing"""
@@ -157,6 +210,14 @@ class MetricTracker:
         else:
             return 0
 
+    def _get_stats_yerr(self, stats: RunningStats) -> float:
+        """Returns 90% confidence interval for graphing from running stats"""
+
+        if stats.count > 1:
+            return float(1.645 * 2 * stats.stdev / sqrt(stats.count))
+        else:
+            return 0
+
     ######################
     # Track Metric Funcs #
     ######################
@@ -220,7 +281,15 @@ class MetricTracker:
                 scenario_config=scenario.scenario_config,
                 metric_key=metric.metric_key,
             )
-            self.data[key].append(metric)
+            if self.running_stats:
+                metric_stats = self.stats[key]
+                for metric_key, percents in metric.percents.items():
+                    # Kept even without values, so that the row still exists
+                    stats = metric_stats.setdefault(metric_key, RunningStats())
+                    for percent in percents:
+                        stats.add(percent)
+            else:
+                self.data[key].append(metric)
 
     def _populate_metrics(
         self,
@@ -232,16 +301,38 @@ class MetricTracker:
     ) -> None:
         """Populates all metrics with data"""
 
+        if self._vectorizable(metrics):
+            self._populate_metrics_arrays(
+                metrics=metrics, engine=engine, scenario=scenario, outcomes=outcomes
+            )
+            return
+
         ctrl_plane_outcomes = outcomes[Plane.CTRL.value]
         data_plane_outcomes = outcomes[Plane.DATA.value]
 
         # Don't count these!
         uncountable_asns = scenario._untracked_asns
+        # Members of equivalence classes are counted with their representative
+        # (they share the outcomes, AS groups and policy class)
+        equivalence_classes = engine.equivalence_classes
+        representatives = engine.representatives
 
         for as_obj in engine.as_graph:
+            if as_obj.asn in representatives:
+                continue
+            elif as_obj.asn in equivalence_classes:
+                weight = sum(
+                    x not in uncountable_asns for x in equivalence_classes[as_obj.asn]
+                )
+                if weight == 0:
+                    continue
             # Don't count preset ASNs
-            if as_obj.asn in uncountable_asns:
+            elif as_obj.asn in uncountable_asns:
                 continue
+            else:
+                weight = 1
+            # Only passed when needed, for subclasses that override add_data
+            weight_kwargs = {"weight": weight} if weight != 1 else {}
             for metric in metrics:
                 # Must use .get, since if this tracking is turned off,
                 # this will be an empty dict
@@ -258,11 +349,100 @@ class MetricTracker:
                     scenario=scenario,
                     ctrl_plane_outcome=ctrl_plane_outcome,
                     data_plane_outcome=data_plane_outcome,
+                    **weight_kwargs,
                 )
         # Only call this once or else it adds significant amounts of time
         for metric in metrics:
             metric.save_percents()
 
+    def _vectorizable(self, metrics: list[Metric]) -> bool:
+        """Whether the metrics can be populated with arrays
+
+        Metrics that change how data is added must go AS by AS
+        """
+
+        return all(
+            all(
+                getattr(type(metric), x) is getattr(Metric, x)
+                for x in ("add_data", "_add_numerator", "_add_denominator")
+            )
+            for metric in metrics
+        )
+
+    def _populate_metrics_arrays(
+        self,
+        *,
+        metrics: list[Metric],
+        engine: BaseSimulationEngine,
+        scenario: Scenario,
+        outcomes: dict[int, dict[int, int]],
+    ) -> None:
+        """Populates all metrics with data, same as _populate_metrics
+
+        Rather than adding each AS to each metric, the outcomes, weights,
+        and policy classes of all ASes are put into arrays once, and then
+        each metric is reduced with bincount
+        """
+
+        arrays = engine.as_graph.get_arrays()
+        asn_to_index = arrays.asn_to_index
+
+        def get_outcomes(plane_outcomes: dict[int, int]) -> NDArray[np.int64]:
+            # Must default, since if this tracking is turned off,
+            # this will be an empty dict
+            outcomes_array = np.full(
+                len(arrays), Outcomes.UNDETERMINED.value, dtype=np.int64
+            )
+            indices = np.fromiter(
+                map(asn_to_index.__getitem__, plane_outcomes),
+                dtype=np.int64,
+                count=len(plane_outcomes),
+            )
+            outcomes_array[indices] = np.fromiter(
+                plane_outcomes.values(), dtype=np.int64, count=len(plane_outcomes)
+            )
+            return outcomes_array
+
+        ctrl_plane_outcomes = get_outcomes(outcomes[Plane.CTRL.value])
+        data_plane_outcomes = get_outcomes(outcomes[Plane.DATA.value])
+
+        # Don't count these!
+        uncountable_asns = scenario._untracked_asns
+        weights = np.ones(len(arrays), dtype=np.int64)
+        for asn in uncountable_asns:
+            if asn in asn_to_index:
+                weights[asn_to_index[asn]] = 0
+        # Members of equivalence classes are counted with their representative
+        for asn in engine.representatives:
+            weights[asn_to_index[asn]] = 0
+        for asn, members in engine.equivalence_classes.items():
+            weights[asn_to_index[asn]] = sum(x not in uncountable_asns for x in members)
+
+        # {policy class: index}
+        policy_cls_indices: dict[type[Policy], int] = dict()
+        policy_indices = np.fromiter(
+            (
+                policy_cls_indices.setdefault(
+                    as_obj.policy.__class__, len(policy_cls_indices)
+                )
+                for as_obj in engine.as_graph
+            ),
+            dtype=np.int64,
+            count=len(arrays),
+        )
+        PolicyClses = list(policy_cls_indices)
+
+        for metric in metrics:
+            metric.add_data_arrays(
+                engine=engine,
+                ctrl_plane_outcomes=ctrl_plane_outcomes,
+                data_plane_outcomes=data_plane_outcomes,
+                weights=weights,
+                policy_indices=policy_indices,
+                PolicyClses=PolicyClses,
+            )
+            metric.save_percents()
+
     def _track_trial_metrics_hook(
         self,
         *,
@@ -0,0 +1,207 @@
+from dataclasses import dataclass, fields, replace
+import json
+from pathlib import Path
+import pickle
+import shutil
+import os
+from typing import Any, ClassVar, Literal, Optional, Union
+
+import numpy as np
+from numpy.typing import NDArray
+
+from .data_key import DataKey
+from .metric_key import MetricKey
+
+from bgpy.enums import SpecialPercentAdoptions
+from bgpy.simulation_framework.scenarios import ScenarioConfig
+
+
+@dataclass(frozen=True, slots=True)
+class ResultsStore:
+    """Columnar store of aggregated results (the rows of get_pickle_data)
+
+    Every field of a row is a column (one array per field). Scenario configs,
+    metric keys, and percent adoptions are dictionary encoded, so the
+    columns only hold IDs into those (small) tables.
+
+    On disk this is a directory with a .npy file per column, which are
+    memory mapped when read, and a pickle of the tables. So only the tables
+    are unpickled, and only the rows that are used are ever read
+    """
+
+    # Tables that the ID columns index into
+    scenario_configs: tuple[ScenarioConfig, ...]
+    # Both the metric keys of the rows (with a PolicyCls),
+    # and the metric keys of the data keys
+    metric_keys: tuple[MetricKey, ...]
+    percent_adopts: tuple[Union[float, SpecialPercentAdoptions], ...]
+    # Columns
+    scenario_config_ids: NDArray[np.int32]
+    metric_key_ids: NDArray[np.int32]
+    data_key_metric_key_ids: NDArray[np.int32]
+    percent_adopt_ids: NDArray[np.int32]
+    propagation_rounds: NDArray[np.int32]
+    # NaN if there was no data for the row
+    values: NDArray[np.float64]
+    yerrs: NDArray[np.float64]
+
+    VERSION: ClassVar[int] = 1
+    _TABLE_NAMES: ClassVar[tuple[str, ...]] = (
+        "scenario_configs",
+        "metric_keys",
+        "percent_adopts",
+    )
+    _FLOAT_COLUMNS: ClassVar[tuple[str, ...]] = ("values", "yerrs")
+
+    @classmethod
+    def from_pickle_data(cls, rows: list[dict[str, Any]]) -> "ResultsStore":
+        """Creates the store from the rows of MetricTracker.get_pickle_data"""
+
+        # {value: ID} for each table
+        tables: dict[str, dict[Any, int]] = {name: dict() for name in cls._TABLE_NAMES}
+
+        def encode(table_name: str, value: Any) -> int:
+            table = tables[table_name]
+            return table.setdefault(value, len(table))
+
+        columns: dict[str, list[Any]] = {name: list() for name in cls._column_names()}
+        for row in rows:
+            data_key: DataKey = row["data_key"]
+            columns["scenario_config_ids"].append(
+                encode("scenario_configs", data_key.scenario_config)
+            )
+            columns["metric_key_ids"].append(encode("metric_keys", row["metric_key"]))
+            columns["data_key_metric_key_ids"].append(
+                encode("metric_keys", data_key.metric_key)
+            )
+            columns["percent_adopt_ids"].append(
+                encode("percent_adopts", data_key.percent_adopt)
+            )
+            columns["propagation_rounds"].append(data_key.propagation_round)
+            columns["values"].append(np.nan if row["value"] is None else row["value"])
+            columns["yerrs"].append(row["yerr"])
+
+        arrays: dict[str, Any] = {
+            name: np.array(
+                column, dtype=np.float64 if name in cls._FLOAT_COLUMNS else np.int32
+            )
+            for name, column in columns.items()
+        }
+        return cls(
+            **{name: tuple(table) for name, table in tables.items()},  # type: ignore
+            **arrays,
+        )
+
+    def to_pickle_data(self) -> list[dict[str, Any]]:
+        """Returns the rows, same as MetricTracker.get_pickle_data"""
+
+        # Python lists are much faster to iterate over than arrays
+        values: list[float] = self.values.tolist()
+        yerrs: list[float] = self.yerrs.tolist()
+        return [
+            {
+                "data_key": DataKey(
+                    propagation_round=propagation_round,
+                    percent_adopt=self.percent_adopts[percent_adopt_id],
+                    scenario_config=self.scenario_configs[scenario_config_id],
+                    metric_key=self.metric_keys[data_key_metric_key_id],
+                ),
+                "metric_key": self.metric_keys[metric_key_id],
+                "value": None if value != value else value,  # NaN check
+                "yerr": yerr,
+            }
+            for (
+                scenario_config_id,
+                metric_key_id,
+                data_key_metric_key_id,
+                percent_adopt_id,
+                propagation_round,
+                value,
+                yerr,
+            ) in zip(
+                self.scenario_config_ids.tolist(),
+                self.metric_key_ids.tolist(),
+                self.data_key_metric_key_ids.tolist(),
+                self.percent_adopt_ids.tolist(),
+                self.propagation_rounds.tolist(),
+                values,
+                yerrs,
+            )
+        ]
+
+    def select(self, mask: NDArray[Any]) -> "ResultsStore":
+        """Returns the store with only the rows of the mask (or indices)
+
+        Only the selected rows are read (and copied) from memory mapped columns
+        """
+
+        return replace(
+            self, **{name: getattr(self, name)[mask] for name in self._column_names()}
+        )
+
+    def __len__(self) -> int:
+        return len(self.values)
+
+    ##############
+    # File funcs #
+    ##############
+
+    @classmethod
+    def _column_names(cls) -> tuple[str, ...]:
+        return tuple(x.name for x in fields(cls) if x.name not in cls._TABLE_NAMES)
+
+    def write(self, path: Path) -> None:
+        """Writes the store to a directory
+
+        Written to a temporary directory first, so that readers never see
+        a partially written store. An existing store is renamed aside
+        before the new one is renamed into place, so between those two
+        renames read can briefly return None (but never a mix of both)
+        """
+
+        tmp_path = path.with_name(f"{path.name}.{os.getpid()}.tmp")
+        old_path = path.with_name(f"{path.name}.{os.getpid()}.old")
+        shutil.rmtree(tmp_path, ignore_errors=True)
+        tmp_path.mkdir(parents=True)
+        for name in self._column_names():
+            np.save(tmp_path / f"{name}.npy", np.ascontiguousarray(getattr(self, name)))
+        with (tmp_path / "tables.pickle").open("wb") as f:
+            pickle.dump({name: getattr(self, name) for name in self._TABLE_NAMES}, f)
+        with (tmp_path / "header.json").open("w") as f:
+            json.dump({"version": self.VERSION, "num_rows": len(self)}, f)
+        shutil.rmtree(old_path, ignore_errors=True)
+        if path.exists():
+            os.replace(path, old_path)
+        os.replace(tmp_path, path)
+        # Memory mapped columns of the old store stay valid after removal
+        shutil.rmtree(old_path, ignore_errors=True)
+
+    @classmethod
+    def read(cls, path: Path, mmap: bool = True) -> Optional["ResultsStore"]:
+        """Reads the store, memory mapping the columns
+
+        Returns None if the store doesn't exist or is from another version
+        """
+
+        header_path = path / "header.json"
+        if not header_path.exists():
+            return None
+        with header_path.open() as f:
+            header = json.load(f)
+        if header["version"] != cls.VERSION:
+            return None
+
+        with (path / "tables.pickle").open("rb") as f:
+            tables = pickle.load(f)
+        # Empty files can't be memory mapped
+        mmap_mode: Optional[Literal["r"]] = "r" if mmap and header["num_rows"] else None
+        return cls(
+            **tables,
+            **{
+                name: np.load(path / f"{name}.npy", mmap_mode=mmap_mode)
+                for name in cls._column_names()
+            },
+        )
+
+
+__all__ = ["ResultsStore"]
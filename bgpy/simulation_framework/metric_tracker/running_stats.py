@@ -0,0 +1,53 @@
+from dataclasses import dataclass
+from math import sqrt
+from typing import Optional
+
+
+@dataclass(slots=True)
+class RunningStats:
+    """Running count, mean, and sum of squared differences (Welford)
+
+    Used by the MetricTracker instead of keeping every trial's value,
+    so that memory doesn't grow with the number of trials
+    """
+
+    count: int = 0
+    mean: float = 0
+    # Sum of squared differences from the mean
+    m2: float = 0
+
+    def add(self, value: float) -> None:
+        """Adds a single value"""
+
+        self.count += 1
+        delta = value - self.mean
+        self.mean += delta / self.count
+        self.m2 += delta * (value - self.mean)
+
+    def __add__(self, other):
+        """Merges the stats of two sets of values (Chan et al.)"""
+
+        if isinstance(other, RunningStats):
+            count = self.count + other.count
+            if count == 0:
+                return RunningStats()
+            delta = other.mean - self.mean
+            return RunningStats(
+                count=count,
+                mean=self.mean + delta * other.count / count,
+                m2=self.m2 + other.m2 + delta**2 * self.count * other.count / count,
+            )
+        else:
+            return NotImplemented
+
+    @property
+    def value(self) -> Optional[float]:
+        """Returns the mean, or None if there are no values"""
+
+        return self.mean if self.count else None
+
+    @property
+    def stdev(self) -> float:
+        """Returns the sample standard deviation"""
+
+        return sqrt(self.m2 / (self.count - 1)) if self.count > 1 else 0
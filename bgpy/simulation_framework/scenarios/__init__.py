@@ -1,5 +1,6 @@
 from . import preprocess_anns_funcs
 
+from .prefix_registry import PrefixRegistry
 from .roa_info import ROAInfo
 
 from .scenario_config import ScenarioConfig
@@ -17,6 +18,7 @@ from .custom_scenarios import ValidPrefix
 
 __all__ = [
     "preprocess_anns_funcs",
+    "PrefixRegistry",
     "ROAInfo",
     "ScenarioConfig",
     "Scenario",
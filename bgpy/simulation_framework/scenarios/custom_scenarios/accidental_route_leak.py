@@ -1,8 +1,9 @@
 from typing import Optional, Union, TYPE_CHECKING
 import warnings
 
+import numpy as np
+
 from bgpy.enums import ASGroups, Relationships, SpecialPercentAdoptions, Timestamps
-from bgpy.as_graphs.base.as_graph.customer_cone_funcs import _get_cone_size_helper
 
 from .valid_prefix import ValidPrefix
 from ..scenario import Scenario
@@ -31,7 +32,7 @@ class AccidentalRouteLeak(ValidPrefix):
     ):
 
         assert engine, "Need engine for customer cones"
-        self._attackers_customer_cones_asns: set[int] = set()
+        self._attackers_customer_cones_asns: frozenset[int] = frozenset()
         super().__init__(
             scenario_config=scenario_config,
             percent_adoption=percent_adoption,
@@ -56,9 +57,6 @@ class AccidentalRouteLeak(ValidPrefix):
             )
             warnings.warn(msg, RuntimeWarning)
 
-    # Just returns customer cone
-    _get_cone_size_helper = _get_cone_size_helper
-
     def post_propagation_hook(
         self,
         engine: "BaseSimulationEngine",
@@ -145,12 +143,13 @@ class AccidentalRouteLeak(ValidPrefix):
         )
         # Stores customer cones of attacker ASNs
         # used in untrackable func and when selecting victims
-        for attacker_asn in attacker_asns:
-            self._attackers_customer_cones_asns.update(
-                self._get_cone_size_helper(
-                    engine.as_graph.as_dict[attacker_asn],
-                    dict(),
-                ),
+        # (the cones are combined as bitmaps, and only then converted to ASNs)
+        if attacker_asns:
+            as_graph = engine.as_graph
+            self._attackers_customer_cones_asns = as_graph.customer_cone_asns(
+                np.bitwise_or.reduce(
+                    [as_graph.get_customer_cone_bitmap(x) for x in attacker_asns]
+                )
             )
         return attacker_asns
 
@@ -0,0 +1,73 @@
+from ipaddress import ip_network, IPv4Network, IPv6Network
+from typing import Iterable, Optional
+
+
+class PrefixRegistry:
+    """The prefixes within a scenario, most specific first
+
+    The prefixes are parsed once and sorted most specific first, and the
+    subprefixes of each prefix are computed once here, so the engine and
+    analyzers never have to parse prefixes or call subnet_of while propagating.
+
+    NOTE: Announcements and RIBs are still keyed by the prefix str.
+    Python caches str hashes, so int keys wouldn't make RIB lookups any
+    faster, and would change the YAML (and ROA checker) interfaces
+    """
+
+    __slots__ = ("prefixes", "_networks", "_ranks", "_subprefixes_dict")
+
+    def __init__(self, prefixes: Iterable[str]) -> None:
+        networks = sorted(
+            {ip_network(x) for x in prefixes},
+            # Sort prefixes with most specific prefix first
+            # Note that this must be sorted for the traceback to get the
+            # most specific prefix first
+            # (ties are broken deterministically rather than by set order)
+            key=lambda x: (x.num_addresses, x.version, x.network_address),
+        )
+        self.prefixes: tuple[str, ...] = tuple(str(x) for x in networks)
+        self._networks: dict[str, IPv4Network | IPv6Network] = {
+            str(x): x for x in networks
+        }
+        # {prefix: index in prefixes}, so lower is more specific
+        self._ranks: dict[str, int] = {x: i for i, x in enumerate(self.prefixes)}
+        self._subprefixes_dict: dict[str, tuple[str, ...]] = {
+            str(outer_network): tuple(
+                str(network)
+                for network in networks
+                # subnet_of raises a TypeError for mixed IP versions
+                if network.version == outer_network.version
+                and network != outer_network
+                and network.subnet_of(outer_network)  # type: ignore
+            )
+            for outer_network in networks
+        }
+
+    def __len__(self) -> int:
+        return len(self.prefixes)
+
+    def __contains__(self, prefix: object) -> bool:
+        return prefix in self._subprefixes_dict
+
+    def network(self, prefix: str) -> IPv4Network | IPv6Network:
+        """Returns the parsed prefix"""
+
+        return self._networks[prefix]
+
+    def subprefixes(self, prefix: str) -> tuple[str, ...]:
+        """Returns all subprefixes of the prefix, most specific first"""
+
+        return self._subprefixes_dict[prefix]
+
+    def get_most_specific_prefix(self, prefixes: Iterable[str]) -> Optional[str]:
+        """Returns the most specific of the prefixes (None if there are none)"""
+
+        return min(prefixes, key=self._ranks.__getitem__, default=None)
+
+    def get_ordered_prefix_subprefix_dict(self) -> dict[str, list[str]]:
+        """Returns a dict of prefix to subprefixes, most specific first"""
+
+        return {
+            prefix: list(subprefixes)
+            for prefix, subprefixes in self._subprefixes_dict.items()
+        }
@@ -2,7 +2,6 @@ from abc import ABC, abstractmethod
 from dataclasses import replace
 import math
 import random
-from ipaddress import ip_network
 from ipaddress import IPv4Network
 from ipaddress import IPv6Network
 from typing import Any, Optional, Type, Union
@@ -14,10 +13,12 @@ from roa_checker import ROAChecker, ROAValidity
 from bgpy.simulation_engine import Announcement as Ann
 from bgpy.simulation_engine import BaseSimulationEngine
 from bgpy.simulation_engine import Policy
+from bgpy.simulation_engine.slim_announcement import is_slim_ann_cls
 from bgpy.enums import (
     SpecialPercentAdoptions,
 )
 
+from .prefix_registry import PrefixRegistry
 from .preprocess_anns_funcs import noop, PREPROCESS_ANNS_FUNC_TYPE
 from .roa_info import ROAInfo
 from .scenario_config import ScenarioConfig
@@ -79,22 +80,42 @@ class Scenario(ABC):
             self.roa_infos: tuple[ROAInfo, ...] = (
                 self.scenario_config.override_roa_infos
             )
+            self.prefix_registry: PrefixRegistry = self._get_prefix_registry()
         else:
             anns = self._get_announcements(engine=engine, prev_scenario=prev_scenario)
             self.roa_infos = self._get_roa_infos(
                 announcements=anns, engine=engine, prev_scenario=prev_scenario
             )
+            # Built first, so that the ROA checker uses its parsed prefixes
+            self.prefix_registry = self._get_prefix_registry(anns)
             anns = self._add_roa_info_to_anns(
                 announcements=anns, engine=engine, prev_scenario=prev_scenario
             )
             self.announcements = preprocess_anns_func(self, anns, engine, prev_scenario)
-
-        self.ordered_prefix_subprefix_dict: dict[str, list[str]] = (
-            self._get_ordered_prefix_subprefix_dict()
-        )
+            # Only rebuilt if preprocessing added prefixes
+            if any(x.prefix not in self.prefix_registry for x in self.announcements):
+                self.prefix_registry = self._get_prefix_registry()
 
         self.policy_classes_used: frozenset[Type[Policy]] = frozenset()
 
+    def _validate_slim_ann_cls(self) -> None:
+        """Ensures the slim AnnCls has the attrs that all policies require
+
+        The config only knows about its own policies, so this checks
+        the policies that the engine actually set on its ASes
+        """
+
+        required_ann_attrs = frozenset().union(
+            *[x.required_ann_attrs for x in self.policy_classes_used]
+        )
+        missing = required_ann_attrs - set(
+            self.scenario_config.AnnCls.__dataclass_fields__
+        )
+        assert not missing, (
+            f"AnnCls {self.scenario_config.AnnCls.__name__} is missing {missing}. "
+            "Set slim_AnnCls=False or an AnnCls in the ScenarioConfig"
+        )
+
     #################
     # Get attackers #
     #################
@@ -411,6 +432,8 @@ class Scenario(ABC):
             self.attacker_asns,
             self.scenario_config.AttackerBasePolicyCls,
         )
+        if is_slim_ann_cls(self.scenario_config.AnnCls):
+            self._validate_slim_ann_cls()
 
     ##################
     # Subclass Funcs #
@@ -450,10 +473,14 @@ class Scenario(ABC):
         """Adds ROA Info to Announcements"""
 
         if self.roa_infos:
-            roa_checker = self._get_roa_checker()
+            # The registry parsed each prefix once
+            prefix_registry = self.prefix_registry
+            if any(x.prefix not in prefix_registry for x in announcements):
+                prefix_registry = self._get_prefix_registry(announcements)
+            roa_checker = self._get_roa_checker(prefix_registry)
             processed_anns = list()
             for ann in announcements:
-                prefix = ip_network(ann.prefix)
+                prefix = prefix_registry.network(ann.prefix)
 
                 roa_origin = self._get_roa_origin(roa_checker, prefix, ann.origin)
 
@@ -503,12 +530,21 @@ class Scenario(ABC):
     # ROA Helper funcs #
     ####################
 
-    def _get_roa_checker(self) -> ROAChecker:
-        """Returns ROAChecker populated with self.roa_infos"""
+    def _get_roa_checker(
+        self, prefix_registry: Optional[PrefixRegistry] = None
+    ) -> ROAChecker:
+        """Returns ROAChecker populated with self.roa_infos
 
+        prefix_registry must contain the ROA prefixes (defaults to the scenario's)
+        """
+
+        if prefix_registry is None:
+            prefix_registry = self.prefix_registry
         roa_checker = ROAChecker()
         for roa in self.roa_infos:
-            roa_checker.insert(ip_network(roa.prefix), roa.origin, roa.max_length)
+            roa_checker.insert(
+                prefix_registry.network(roa.prefix), roa.origin, roa.max_length
+            )
         return roa_checker
 
     def _get_roa_origin(
@@ -554,40 +590,31 @@ class Scenario(ABC):
     # Helper Funcs #
     ################
 
-    def _get_ordered_prefix_subprefix_dict(self):
-        """Saves a dict of prefix to subprefixes
+    def _get_prefix_registry(
+        self, announcements: Optional[tuple["Ann", ...]] = None
+    ) -> PrefixRegistry:
+        """Returns the registry of all prefixes in this scenario
 
-        mypy was having a lot of trouble with this section
-        thus the type ignores
+        announcements defaults to self.announcements
         """
 
-        prefixes = set([])
-        for ann in self.announcements:
-            prefixes.add(ann.prefix)
+        if announcements is None:
+            announcements = self.announcements
+        prefixes = [ann.prefix for ann in announcements]
         # Add ROA prefixes here, so that if we blackhole a non routed
         # prefix of a superprefix hijack this won't break
         # (since the prefix would only exist in the ROA)
-        for roa in self.roa_infos:
-            prefixes.add(roa.prefix)
-        # Do this here for speed
-        prefixes: list[Union[IPv4Network, IPv6Network]] = [  # type: ignore
-            ip_network(x) for x in prefixes
-        ]
-        # Sort prefixes with most specific prefix first
-        # Note that this must be sorted for the traceback to get the
-        # most specific prefix first
-        prefixes = list(sorted(prefixes, key=lambda x: x.num_addresses))  # type: ignore
-
-        prefix_subprefix_dict = {x: [] for x in prefixes}  # type: ignore
-        for outer_prefix, subprefix_list in prefix_subprefix_dict.items():
-            for prefix in prefixes:
-                if (
-                    prefix.subnet_of(outer_prefix)  # type: ignore
-                    and prefix != outer_prefix
-                ):
-                    subprefix_list.append(str(prefix))
-        # Get rid of ip_network
-        return {str(k): v for k, v in prefix_subprefix_dict.items()}
+        prefixes.extend(roa.prefix for roa in self.roa_infos)
+        return PrefixRegistry(prefixes)
+
+    @property
+    def ordered_prefix_subprefix_dict(self) -> dict[str, list[str]]:
+        """Dict of prefix to subprefixes, most specific prefix first
+
+        Kept for backwards compatibility. Use the prefix_registry instead
+        """
+
+        return self.prefix_registry.get_ordered_prefix_subprefix_dict()
 
     @property
     def json_label(self) -> str:
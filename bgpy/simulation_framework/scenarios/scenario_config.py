@@ -1,14 +1,17 @@
 import abc
 from dataclasses import asdict, dataclass, field
-from typing import Any, Optional, TYPE_CHECKING
+from typing import Any, Optional, TYPE_CHECKING, Union
 
 from frozendict import frozendict
 
-from bgpy.enums import ASGroups
+from bgpy.enums import ASGroups, SpecialPercentAdoptions
 
 from bgpy.simulation_engine import Announcement as Ann
 from bgpy.simulation_engine import Policy
 from bgpy.simulation_engine import BGP
+from bgpy.simulation_engine import BGPFull
+from bgpy.simulation_engine import get_slim_ann_cls
+from bgpy.simulation_engine.slim_announcement import is_slim_ann_cls
 
 from .preprocess_anns_funcs import noop, PREPROCESS_ANNS_FUNC_TYPE
 from .roa_info import ROAInfo
@@ -39,6 +42,11 @@ class ScenarioConfig:
     # This is the base type of announcement for this class
     # You can specify a different base ann
     AnnCls: type[Ann] = Ann
+    # If AnnCls is left as Announcement, replace it in post_init with a
+    # generated Announcement class that only has the attributes required by
+    # the policies of this scenario (much faster to copy). Off by default,
+    # since policies must declare every ann attr they use in required_ann_attrs
+    slim_AnnCls: bool = False
     BasePolicyCls: type[Policy] = BGP
     # Fixed in post init, but can't show mypy for some reason
     AdoptPolicyCls: type[Policy] = MISSINGPolicy  # type: ignore
@@ -85,6 +93,9 @@ class ScenarioConfig:
     csv_label: str = ""
     # Defaults to the AdoptPolicyCls's name property in post_init
     scenario_label: str = ""
+    # Relative cost of a trial for dynamic scheduling. Estimated from
+    # the policies, adoption, and propagation rounds by default
+    trial_cost: Optional[float] = None
 
     def __post_init__(self):
         """sets AdoptPolicyCls if it is None
@@ -131,9 +142,68 @@ class ScenarioConfig:
                 "change the type to frozendict so that it is hashable"
             )
 
+        # Override anns (test suite/YAML) were created with their own class
+        # and anns created during propagation must be comparable to them
+        if self.slim_AnnCls and not self.override_announcements:
+            if self.AnnCls == Ann or is_slim_ann_cls(self.AnnCls):
+                object.__setattr__(
+                    self, "AnnCls", get_slim_ann_cls(self.required_ann_attrs)
+                )
+
         if not self.scenario_label:
             object.__setattr__(self, "scenario_label", self.AdoptPolicyCls.name)
 
+    @property
+    def required_ann_attrs(self) -> frozenset[str]:
+        """Returns the Announcement attributes required by this config's policies"""
+
+        PolicyClses: list[type[Policy]] = [
+            self.BasePolicyCls,
+            self.AdoptPolicyCls,
+            *self.hardcoded_asn_cls_dict.values(),
+        ]
+        if self.AttackerBasePolicyCls:
+            PolicyClses.append(self.AttackerBasePolicyCls)
+        if self.override_non_default_asn_cls_dict:
+            # Could be the names of the classes when coming from YAML
+            PolicyClses.extend(
+                x
+                for x in self.override_non_default_asn_cls_dict.values()
+                if isinstance(x, type)
+            )
+        return frozenset().union(*[x.required_ann_attrs for x in PolicyClses])
+
+    def get_trial_cost(
+        self, percent_adopt: Union[float, SpecialPercentAdoptions]
+    ) -> float:
+        """Returns the estimated relative cost of a trial
+
+        This only needs to be good enough to order trials for scheduling.
+        Adopting ASes cost more as their policy does more work than BGP,
+        and every propagation round is another propagation
+        """
+
+        if self.trial_cost is not None:
+            return self.trial_cost
+
+        adopt_cost = self._get_policy_cost(self.AdoptPolicyCls)
+        base_cost = self._get_policy_cost(self.BasePolicyCls)
+        adopting = float(percent_adopt)
+        cost = adopting * adopt_cost + (1 - adopting) * base_cost
+        return cost * self.propagation_rounds
+
+    @staticmethod
+    def _get_policy_cost(PolicyCls: type[Policy]) -> float:
+        """Returns the estimated relative cost of a policy
+
+        Policies with RIBs out and withdrawals (BGPFull) cost about twice
+        as much, and every extra ann attribute means more work per ann
+        """
+
+        cost = 2.0 if issubclass(PolicyCls, BGPFull) else 1.0
+        extra_attrs = PolicyCls.required_ann_attrs - BGP.required_ann_attrs
+        return cost + 0.25 * len(extra_attrs)
+
     ##############
     # Yaml Funcs #
     ##############
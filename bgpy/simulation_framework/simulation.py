@@ -1,20 +1,30 @@
+from contextlib import nullcontext
 from copy import deepcopy
 import gc
+from inspect import Parameter, signature
 from itertools import product
 from multiprocessing import cpu_count
+from multiprocessing import get_all_start_methods
+from multiprocessing import get_context
 from multiprocessing import Pool
 from pathlib import Path
-from typing import Optional, Union
+from typing import Any, Optional, Union
 import random
 import os
+from uuid import uuid4
 
 from frozendict import frozendict
 
-from bgpy.as_graphs.base import ASGraphConstructor, ASGraph
+from bgpy.as_graphs.base import ASGraphConstructor, ASGraph, ASGraphSnapshot
 from bgpy.as_graphs.caida_as_graph import CAIDAASGraphConstructor
 
 
 from .as_graph_analyzers import BaseASGraphAnalyzer, ASGraphAnalyzer
+from .checkpoint_funcs import _get_unit_id
+from .checkpoint_funcs import _checkpoint_due
+from .checkpoint_funcs import _read_checkpoint
+from .checkpoint_funcs import _write_checkpoint
+from .checkpoint_funcs import _remove_checkpoints
 from .graph_factory import GraphFactory
 from .metric_tracker import MetricTracker
 from .metric_tracker.metric_key import MetricKey
@@ -25,14 +35,30 @@ from .utils import get_all_metric_keys
 
 from bgpy.enums import SpecialPercentAdoptions
 from bgpy.simulation_engine import BaseSimulationEngine, SimulationEngine
+from bgpy.simulation_engine import NumPySimulationEngine
 from bgpy.simulation_engine import BGP
 from bgpy.simulation_engine import BGPFull
 from bgpy.simulation_engine import ROV
+from bgpy.simulation_engine import Profiler
+
+
+# AS graph inherited by forked workers (see Simulation.fork_as_graph)
+# Must be a global, since anything passed to the Pool gets pickled
+_forked_as_graph: Optional[ASGraph] = None
+# Engine of a long-lived worker, kept between tasks (see Simulation._run_task)
+_worker_engine: Optional[BaseSimulationEngine] = None
 
 
 class Simulation:
     """Runs simulations for BGP attack/defend scenarios"""
 
+    # Checkpoint funcs
+    _get_unit_id = _get_unit_id
+    _checkpoint_due = _checkpoint_due
+    _read_checkpoint = _read_checkpoint
+    _write_checkpoint = _write_checkpoint
+    _remove_checkpoints = _remove_checkpoints
+
     def __init__(
         self,
         percent_adoptions: tuple[Union[float, SpecialPercentAdoptions], ...] = (
@@ -74,6 +100,36 @@ class Simulation:
         # Control plane trackign for traceback and MetricTrackerCls
         control_plane_tracking: bool = False,
         metric_keys: tuple[MetricKey, ...] = tuple(list(get_all_metric_keys())),
+        # Number of trials the NumPySimulationEngine propagates at once
+        batch_size: int = 1,
+        # Opt in instrumentation. Each worker gets its own (empty) copy,
+        # and all of them are merged into a JSON summary in the output_dir
+        profiler: Optional[Profiler] = None,
+        # Build the AS graph once and share it with (forked) workers
+        fork_as_graph: bool = False,
+        # Put the AS graph's topology in shared memory for workers to attach to
+        shared_memory_as_graph: bool = False,
+        # Only propagate once per class of identical stubs/multihomed ASes
+        # (see SimulationEngine)
+        equivalence_classes: bool = False,
+        # Skip stubs during propagation, and evaluate them when analyzing
+        # (see SimulationEngine)
+        lazy_stubs: bool = False,
+        # Rather than splitting trials into one static chunk per CPU,
+        # workers pull small tasks (most expensive first) from a shared queue
+        dynamic_scheduling: bool = False,
+        # Trials per task when dynamic_scheduling. Defaults to about
+        # four tasks per CPU
+        trials_per_task: Optional[int] = None,
+        # Only keep running stats of metrics rather than every trial's metrics
+        # (see MetricTracker)
+        running_metric_stats: bool = False,
+        # Trace back the data plane with arrays rather than recursively
+        # (see ASGraphAnalyzer)
+        array_traceback: bool = False,
+        # Checkpoint each chunk (or task) to the output_dir after this many
+        # trials, and resume from the checkpoints if the sim is restarted
+        checkpoint_trials: Optional[int] = None,
     ) -> None:
         """Downloads relationship data, runs simulation
 
@@ -99,12 +155,46 @@ class Simulation:
         # So that multiprocessing doesn't interfere with one another
         self.ASGraphConstructorCls: type[ASGraphConstructor] = ASGraphConstructorCls
         self.as_graph_constructor_kwargs = as_graph_constructor_kwargs
-        self.ASGraphConstructorCls(**as_graph_constructor_kwargs).run()
+        as_graph = self.ASGraphConstructorCls(**as_graph_constructor_kwargs).run()
+
+        # Rather than every worker rebuilding the AS graph (which is slow and
+        # uses a lot of RAM), workers inherit this one when they are forked.
+        # Since the graph is frozen out of the GC before forking, its pages
+        # are only copied when workers write to them (their policies)
+        self.fork_as_graph: bool = fork_as_graph
+        if self.fork_as_graph and "fork" not in get_all_start_methods():
+            raise NotImplementedError("fork_as_graph requires the fork start method")
+        # Alternatively (such as for the spawn start method), the topology
+        # is copied into shared memory, and workers build their ASes and
+        # policies on top of that one physical copy
+        self.shared_memory_as_graph: bool = shared_memory_as_graph
+        assert not (fork_as_graph and shared_memory_as_graph), "Pick one"
+        self._as_graph: Optional[ASGraph] = (
+            as_graph if fork_as_graph or shared_memory_as_graph else None
+        )
+        # Name of the shared memory segment while workers are running
+        self._as_graph_shm_name: Optional[str] = None
 
         self.SimulationEngineCls: type[BaseSimulationEngine] = SimulationEngineCls
+        self.equivalence_classes: bool = equivalence_classes
+        # Lazy stubs keep empty local RIBs (see SimulationEngine), so custom
+        # hooks and metrics must read their anns through engine.get_lazy_ann
+        self.lazy_stubs: bool = lazy_stubs
+        if (equivalence_classes or lazy_stubs) and (
+            not issubclass(SimulationEngineCls, SimulationEngine)
+            or issubclass(SimulationEngineCls, NumPySimulationEngine)
+        ):
+            raise NotImplementedError(
+                "equivalence_classes and lazy_stubs are only supported by the "
+                "SimulationEngine"
+            )
 
         self.ASGraphAnalyzerCls: type[BaseASGraphAnalyzer] = ASGraphAnalyzerCls
+        self.array_traceback: bool = array_traceback
+        if array_traceback and not issubclass(ASGraphAnalyzerCls, ASGraphAnalyzer):
+            raise NotImplementedError("array_traceback requires an ASGraphAnalyzer")
         self.MetricTrackerCls: type[MetricTracker] = MetricTrackerCls
+        self.running_metric_stats: bool = running_metric_stats
 
         self.data_plane_tracking: bool = data_plane_tracking
         self.control_plane_tracking: bool = control_plane_tracking
@@ -113,6 +203,25 @@ class Simulation:
 
         self.metric_keys: tuple[MetricKey, ...] = metric_keys
 
+        assert batch_size >= 1, "batch_size must be at least 1"
+        if batch_size > 1 and not issubclass(
+            SimulationEngineCls, NumPySimulationEngine
+        ):
+            raise NotImplementedError("batch_size requires a NumPySimulationEngine")
+        self.batch_size: int = batch_size
+
+        self.profiler: Optional[Profiler] = profiler
+        # Prefix of the worker profiles of a run, so that runs never
+        # read or remove each other's profiles. Set in run
+        self._profile_run_id: str = ""
+
+        self.dynamic_scheduling: bool = dynamic_scheduling
+        assert trials_per_task is None or trials_per_task >= 1, "Must be at least 1"
+        self.trials_per_task: Optional[int] = trials_per_task
+
+        assert checkpoint_trials is None or checkpoint_trials >= 1, "Must be >= 1"
+        self.checkpoint_trials: Optional[int] = checkpoint_trials
+
         scenario_labels = list()
         for scenario_config in self.scenario_configs:
             scenario_labels.append(scenario_config.scenario_label)
@@ -172,8 +281,17 @@ class Simulation:
     ) -> None:
         """Runs the simulation and write the data"""
 
+        if self.profiler is not None:
+            self._profile_run_id = uuid4().hex
         metric_tracker = self._get_data()
-        metric_tracker.write_data(csv_path=self.csv_path, pickle_path=self.pickle_path)
+        metric_tracker.write_data(
+            csv_path=self.csv_path,
+            pickle_path=self.pickle_path,
+            results_path=self.results_path,
+        )
+        self._remove_checkpoints()
+        if self.profiler is not None:
+            self._write_profile()
         self._graph_data(GraphFactoryCls, graph_factory_kwargs)
         # This object holds a lot of memory, good to get rid of it
         del metric_tracker
@@ -200,15 +318,22 @@ class Simulation:
         if self.parse_cpus == 1:
             # Results are a list of lists of metric trackers that we then sum
             return sum(
-                self._get_single_process_results(), start=self.MetricTrackerCls()
+                self._get_single_process_results(), start=self._get_metric_tracker()
             )
         # Multiprocess
         else:
             # Results are a list of lists of metric trackers that we then sum
             return sum(
-                self._get_mp_results(self.parse_cpus), start=self.MetricTrackerCls()
+                self._get_mp_results(self.parse_cpus), start=self._get_metric_tracker()
             )
 
+    def _get_metric_tracker(self, **kwargs) -> MetricTracker:
+        """Returns an empty metric tracker"""
+
+        if self.running_metric_stats:
+            kwargs["running_stats"] = True
+        return self.MetricTrackerCls(**kwargs)
+
     ###########################
     # Multiprocessing Methods #
     ###########################
@@ -233,6 +358,54 @@ class Simulation:
         # mypy can't seem to handle these types?
         return [percents_trials[i::cpus] for i in range(cpus)]  # type: ignore
 
+    def _get_tasks(
+        self, cpus: int
+    ) -> list[list[tuple[Union[float, SpecialPercentAdoptions], int]]]:
+        """Returns small tasks of trial inputs for dynamic scheduling
+
+        Workers pull tasks from the Pool's queue whenever they finish one,
+        so expensive trials no longer hold up a single static chunk.
+        The most expensive trials go first, so that the cheap ones
+        fill in the gaps at the end
+        """
+
+        combos = product(self.percent_adoptions, list(range(self.num_trials)))
+        percents_trials = [tuple(x) for x in combos]
+        # Stable, so trials of the same cost stay in order
+        percents_trials.sort(key=lambda x: self._get_trial_cost(x[0]), reverse=True)
+
+        trials_per_task = self.trials_per_task or max(
+            self.batch_size, len(percents_trials) // (cpus * 4), 1
+        )
+        tasks = list()
+        for i in range(0, len(percents_trials), trials_per_task):
+            task_end = i + trials_per_task
+            tasks.append(percents_trials[i:task_end])
+        return tasks  # type: ignore
+
+    def _get_trial_cost(
+        self, percent_adopt: Union[float, SpecialPercentAdoptions]
+    ) -> float:
+        """Returns the estimated cost of a trial over all scenario configs"""
+
+        return sum(
+            (x.get_trial_cost(percent_adopt) for x in self.scenario_configs),
+            start=0.0,
+        )
+
+    def _starmap_trials(self, pool: Any, parse_cpus: int) -> list[MetricTracker]:
+        """Runs all trials within the pool, statically or dynamically"""
+
+        if self.dynamic_scheduling:
+            # chunksize=1 so that each worker only takes one task at a time
+            return pool.starmap(  # type: ignore
+                self._run_task, enumerate(self._get_tasks(parse_cpus)), chunksize=1
+            )
+        else:
+            return pool.starmap(  # type: ignore
+                self._run_chunk, enumerate(self._get_chunks(parse_cpus))
+            )
+
     def _get_single_process_results(self) -> list[MetricTracker]:
         """Get all results when using single processing"""
 
@@ -241,9 +414,54 @@ class Simulation:
     def _get_mp_results(self, parse_cpus: int) -> list[MetricTracker]:
         """Get results from multiprocessing"""
 
+        if self.fork_as_graph:
+            return self._get_forked_mp_results(parse_cpus)
+        elif self.shared_memory_as_graph:
+            return self._get_shared_memory_mp_results(parse_cpus)
+
         # Pool is much faster than ProcessPoolExecutor
         with Pool(parse_cpus) as p:
-            return p.starmap(self._run_chunk, enumerate(self._get_chunks(parse_cpus)))
+            return self._starmap_trials(p, parse_cpus)
+
+    def _get_forked_mp_results(self, parse_cpus: int) -> list[MetricTracker]:
+        """Get results from forked workers that inherit the AS graph"""
+
+        global _forked_as_graph
+
+        _forked_as_graph = self._as_graph
+        # Move everything (mainly the AS graph) into the permanent generation
+        # so that the GC in the workers doesn't touch (and thus copy) it
+        gc.collect()
+        gc.freeze()
+        try:
+            with get_context("fork").Pool(parse_cpus) as p:
+                return self._starmap_trials(p, parse_cpus)
+        finally:
+            gc.unfreeze()
+            _forked_as_graph = None
+
+    def _get_shared_memory_mp_results(self, parse_cpus: int) -> list[MetricTracker]:
+        """Get results from workers that attach to the AS graph in shared memory"""
+
+        assert self._as_graph is not None, "AS graph should have been kept"
+        snapshot = ASGraphSnapshot.from_as_graph(self._as_graph, key="")
+        shm = snapshot.to_shared_memory()
+        # Workers get the name when self is pickled
+        self._as_graph_shm_name = shm.name
+        try:
+            with Pool(parse_cpus) as p:
+                return self._starmap_trials(p, parse_cpus)
+        finally:
+            self._as_graph_shm_name = None
+            shm.close()
+            shm.unlink()
+
+    def __getstate__(self) -> dict[str, Any]:
+        """Forked workers inherit the AS graph, so don't pickle it"""
+
+        state = self.__dict__.copy()
+        state["_as_graph"] = None
+        return state
 
     ############################
     # Data Aggregation Methods #
@@ -259,38 +477,135 @@ class Simulation:
         # Must also seed randomness here since we don't want multiproc to be the same
         self._seed_random(seed_suffix=str(chunk_id))
 
+        unit_id = self._get_unit_id("chunk", chunk_id, percent_adopt_trials)
+        checkpoint = self._read_checkpoint(unit_id)
+        if checkpoint and checkpoint["trials_done"] == len(percent_adopt_trials):
+            completed_metric_tracker: MetricTracker = checkpoint["metric_tracker"]
+            return completed_metric_tracker
+
+        # Each worker records into its own profiler, written out per worker
+        profiler = self.profiler.__class__() if self.profiler is not None else None
+        engine = self._get_engine(profiler)
+        metric_tracker = self._run_trials(
+            engine, percent_adopt_trials, unit_id=unit_id, checkpoint=checkpoint
+        )
+        self._write_worker_profile(str(chunk_id), profiler)
+        return metric_tracker
+
+    def _run_task(
+        self,
+        task_id: int,
+        percent_adopt_trials: list[tuple[Union[float, SpecialPercentAdoptions], int]],
+    ) -> MetricTracker:
+        """Runs a task from the shared queue within a long-lived worker
+
+        The worker's engine is constructed for its first task, and kept
+        for the rest. Randomness is seeded per task, so that results don't
+        depend on which worker ran which task
+        """
+
+        global _worker_engine
+
+        self._seed_random(seed_suffix=f"task_{task_id}")
+
+        unit_id = self._get_unit_id("task", task_id, percent_adopt_trials)
+        checkpoint = self._read_checkpoint(unit_id)
+        if checkpoint and checkpoint["trials_done"] == len(percent_adopt_trials):
+            completed_metric_tracker: MetricTracker = checkpoint["metric_tracker"]
+            return completed_metric_tracker
+
+        if _worker_engine is None:
+            profiler = self.profiler.__class__() if self.profiler is not None else None
+            _worker_engine = self._get_engine(profiler)
+        metric_tracker = self._run_trials(
+            _worker_engine, percent_adopt_trials, unit_id=unit_id, checkpoint=checkpoint
+        )
+        # Overwritten after each task, since the worker doesn't know its last
+        self._write_worker_profile(f"worker_{os.getpid()}", _worker_engine.profiler)
+        return metric_tracker
+
+    def _get_engine(self, profiler: Optional[Profiler]) -> BaseSimulationEngine:
+        """Returns the engine for a worker"""
+
+        engine_kwargs: dict[str, Any] = {"profiler": profiler} if profiler else {}
+        if self.equivalence_classes:
+            engine_kwargs["equivalence_classes"] = True
+        if self.lazy_stubs:
+            engine_kwargs["lazy_stubs"] = True
+
         # Engine is not picklable or dillable AT ALL, so do it here
         # (after the multiprocess process has started)
         # Changing recursion depth does nothing
         # Making nothing a reference does nothing
-        constructor_kwargs = dict(self.as_graph_constructor_kwargs)
-        constructor_kwargs["tsv_path"] = None
-        as_graph: ASGraph = self.ASGraphConstructorCls(**constructor_kwargs).run()
-        engine = self.SimulationEngineCls(
+        with profiler.phase("as_graph_construction") if profiler else nullcontext():
+            as_graph: ASGraph = self._get_chunk_as_graph()
+        return self.SimulationEngineCls(
             as_graph,
             cached_as_graph_tsv_path=self.as_graph_constructor_kwargs.get("tsv_path"),
+            **engine_kwargs,
         )
 
-        metric_tracker = self.MetricTrackerCls(metric_keys=self.metric_keys)
+    def _run_trials(
+        self,
+        engine: BaseSimulationEngine,
+        percent_adopt_trials: list[tuple[Union[float, SpecialPercentAdoptions], int]],
+        unit_id: Optional[str] = None,
+        checkpoint: Optional[dict[str, Any]] = None,
+    ) -> MetricTracker:
+        """Runs trial inputs with the engine, and returns their metrics
+
+        If checkpointing (unit_id isn't None), the metrics are checkpointed
+        every checkpoint_trials trials (and once all are done). Resuming from
+        a checkpoint skips its trials, and restores its random state, so the
+        metrics are the same as if the unit had never stopped
+        """
+
+        trials_done = 0
+        if checkpoint is None:
+            metric_tracker = self._get_metric_tracker(metric_keys=self.metric_keys)
+        else:
+            metric_tracker = checkpoint["metric_tracker"]
+            trials_done = checkpoint["trials_done"]
+            random.setstate(checkpoint["random_state"])
+        # Number of trials that were done when the last checkpoint was written
+        checkpointed_trials = trials_done
+
+        if self.batch_size > 1:
+            assert isinstance(engine, NumPySimulationEngine), "Checked in __init__"
+            # Checkpoints are only written between batches, so this is
+            # always the start of a batch
+            for i in range(trials_done, len(percent_adopt_trials), self.batch_size):
+                batch_end = i + self.batch_size
+                batch_trials = percent_adopt_trials[i:batch_end]
+                self._run_batch(engine, batch_trials, metric_tracker)
+                trials_done = i + len(batch_trials)
+                if unit_id and self._checkpoint_due(
+                    trials_done, checkpointed_trials, len(percent_adopt_trials)
+                ):
+                    self._write_checkpoint(unit_id, trials_done, metric_tracker)
+                    checkpointed_trials = trials_done
+            return metric_tracker
 
         prev_scenario = None
 
-        for percent_adopt, trial in percent_adopt_trials:
+        for percent_adopt, trial in percent_adopt_trials[trials_done:]:
             for scenario_config in self.scenario_configs:
                 # Create the scenario for this trial
                 assert scenario_config.ScenarioCls, "ScenarioCls is None"
-                scenario = scenario_config.ScenarioCls(
-                    scenario_config=scenario_config,
-                    percent_adoption=percent_adopt,
-                    engine=engine,
-                    prev_scenario=prev_scenario,
-                    preprocess_anns_func=scenario_config.preprocess_anns_func,
-                )
+                with engine.profile_phase("scenario_construction"):
+                    scenario = scenario_config.ScenarioCls(
+                        scenario_config=scenario_config,
+                        percent_adoption=percent_adopt,
+                        engine=engine,
+                        prev_scenario=prev_scenario,
+                        preprocess_anns_func=scenario_config.preprocess_anns_func,
+                    )
 
                 self._print_progress(percent_adopt, scenario, trial)
 
                 # Change AS Classes, seed announcements before propagation
-                scenario.setup_engine(engine, prev_scenario)
+                with engine.profile_phase("engine_setup"):
+                    scenario.setup_engine(engine, prev_scenario)
                 # For each round of propagation run the engine
                 for propagation_round in range(scenario_config.propagation_rounds):
                     self._single_engine_run(
@@ -304,9 +619,95 @@ class Simulation:
                 prev_scenario = scenario
             # Reset scenario for next round of trials
             prev_scenario = None
+            trials_done += 1
+            if unit_id and self._checkpoint_due(
+                trials_done, checkpointed_trials, len(percent_adopt_trials)
+            ):
+                self._write_checkpoint(unit_id, trials_done, metric_tracker)
+                checkpointed_trials = trials_done
 
         return metric_tracker
 
+    def _get_chunk_as_graph(self) -> ASGraph:
+        """Returns the shared AS graph if there is one, else builds one"""
+
+        if self._as_graph is not None:
+            # Single process
+            return self._as_graph
+        elif _forked_as_graph is not None:
+            # Forked worker
+            return _forked_as_graph
+
+        constructor_kwargs = dict(self.as_graph_constructor_kwargs)
+        constructor_kwargs["tsv_path"] = None
+        constructor = self.ASGraphConstructorCls(**constructor_kwargs)
+        if self._as_graph_shm_name is not None:
+            # Worker attached to shared memory
+            snapshot = ASGraphSnapshot.from_shared_memory(self._as_graph_shm_name)
+            return constructor.get_as_graph_from_snapshot(snapshot)
+        else:
+            return constructor.run()
+
+    def _run_batch(
+        self,
+        engine: NumPySimulationEngine,
+        percent_adopt_trials: list[tuple[Union[float, SpecialPercentAdoptions], int]],
+        metric_tracker: MetricTracker,
+    ) -> None:
+        """Runs a batch of trial inputs, propagating them all at once
+
+        Scenarios with a single propagation round are propagated together
+        by the engine, then loaded into the AS graph one by one for the
+        analyzer and metric tracker. Everything else runs as usual
+        """
+
+        # (percent_adopt, trial, scenario, prev_scenario)
+        batch: list[
+            tuple[
+                Union[float, SpecialPercentAdoptions], int, Scenario, Optional[Scenario]
+            ]
+        ] = list()
+        for percent_adopt, trial in percent_adopt_trials:
+            prev_scenario = None
+            for scenario_config in self.scenario_configs:
+                # Create the scenario for this trial
+                assert scenario_config.ScenarioCls, "ScenarioCls is None"
+                with engine.profile_phase("scenario_construction"):
+                    scenario = scenario_config.ScenarioCls(
+                        scenario_config=scenario_config,
+                        percent_adoption=percent_adopt,
+                        engine=engine,
+                        prev_scenario=prev_scenario,
+                        preprocess_anns_func=scenario_config.preprocess_anns_func,
+                    )
+                batch.append((percent_adopt, trial, scenario, prev_scenario))
+                prev_scenario = scenario
+
+        batch_scenarios = tuple(
+            x[2] for x in batch if x[2].scenario_config.propagation_rounds == 1
+        )
+        batched = bool(batch_scenarios) and engine.run_batch(batch_scenarios)
+        batch_trials = {id(x): i for i, x in enumerate(batch_scenarios)}
+
+        for percent_adopt, trial, scenario, prev_scenario in batch:
+            self._print_progress(percent_adopt, scenario, trial)
+            if batched and id(scenario) in batch_trials:
+                engine.select_batch_trial(batch_trials[id(scenario)])
+
+            # Change AS Classes, seed announcements before propagation
+            with engine.profile_phase("engine_setup"):
+                scenario.setup_engine(engine, prev_scenario)
+            # For each round of propagation run the engine
+            for propagation_round in range(scenario.scenario_config.propagation_rounds):
+                self._single_engine_run(
+                    engine=engine,
+                    percent_adopt=percent_adopt,
+                    trial=trial,
+                    scenario=scenario,
+                    propagation_round=propagation_round,
+                    metric_tracker=metric_tracker,
+                )
+
     def _print_progress(
         self,
         percent_adopt: Union[float | SpecialPercentAdoptions],
@@ -376,21 +777,25 @@ class Simulation:
         # The reason we aggregate info right now, instead of saving
         # the engine and doing it later, is because doing it all
         # in RAM is MUCH faster, and speed is important
-        outcomes = self.ASGraphAnalyzerCls(
-            engine=engine,
-            scenario=scenario,
-            data_plane_tracking=self.data_plane_tracking,
-            control_plane_tracking=self.control_plane_tracking,
-        ).analyze()
-
-        metric_tracker.track_trial_metrics(
-            engine=engine,
-            percent_adopt=percent_adopt,
-            trial=trial,
-            scenario=scenario,
-            propagation_round=propagation_round,
-            outcomes=outcomes,
-        )
+        analyzer_kwargs = {"array_traceback": True} if self.array_traceback else {}
+        with engine.profile_phase("analyzer"):
+            outcomes = self.ASGraphAnalyzerCls(
+                engine=engine,
+                scenario=scenario,
+                data_plane_tracking=self.data_plane_tracking,
+                control_plane_tracking=self.control_plane_tracking,
+                **analyzer_kwargs,  # type: ignore
+            ).analyze()
+
+        with engine.profile_phase("metric_tracking"):
+            metric_tracker.track_trial_metrics(
+                engine=engine,
+                percent_adopt=percent_adopt,
+                trial=trial,
+                scenario=scenario,
+                propagation_round=propagation_round,
+                outcomes=outcomes,
+            )
         return outcomes
 
     ######################
@@ -405,6 +810,55 @@ class Simulation:
     def pickle_path(self) -> Path:
         return self.output_dir / "data.pickle"
 
+    @property
+    def results_path(self) -> Path:
+        return self.output_dir / "results"
+
+    @property
+    def checkpoint_dir(self) -> Path:
+        return self.output_dir / "checkpoints"
+
+    #########################
+    # Profile Writing Funcs #
+    #########################
+
+    @property
+    def profile_path(self) -> Path:
+        return self.output_dir / "profile.json"
+
+    @property
+    def worker_profile_dir(self) -> Path:
+        return self.output_dir / "worker_profiles"
+
+    def _write_worker_profile(
+        self, worker_id: str, profiler: Optional[Profiler]
+    ) -> None:
+        """Writes the profile of a single worker (chunk)
+
+        Written to a file rather than returned, so that the return value
+        of _run_chunk doesn't change
+        """
+
+        if profiler is not None:
+            profiler.write_json(
+                self.worker_profile_dir / f"{self._profile_run_id}_{worker_id}.json"
+            )
+
+    def _write_profile(self) -> None:
+        """Merges the profiles of this run's workers into a JSON summary
+
+        Worker profiles are removed once merged
+        """
+
+        assert self.profiler is not None, "Not profiling"
+        paths = sorted(self.worker_profile_dir.glob(f"{self._profile_run_id}_*.json"))
+        for path in paths:
+            self.profiler += self.profiler.read_json(path)
+        self.profiler.write_json(self.profile_path)
+        for path in paths:
+            path.unlink()
+        print(f"\nWrote profile to {self.profile_path}")
+
     #######################
     # Graph Writing Funcs #
     #######################
@@ -427,9 +881,26 @@ class Simulation:
         kwargs["graph_dir"] = kwargs.pop("graph_dir", self.output_dir / "graphs")
         kwargs["metric_keys"] = kwargs.pop("metric_keys", self.metric_keys)
         if GraphFactoryCls:
+            # Custom GraphFactories don't have to accept newer kwargs
+            # Results only if the pickle wasn't replaced, since they're preferred
+            if kwargs["pickle_path"] == self.pickle_path and self._accepts_kwarg(
+                GraphFactoryCls, "results_path"
+            ):
+                kwargs["results_path"] = kwargs.pop("results_path", self.results_path)
+            if self._accepts_kwarg(GraphFactoryCls, "parse_cpus"):
+                kwargs["parse_cpus"] = kwargs.pop("parse_cpus", self.parse_cpus)
             GraphFactoryCls(**kwargs).generate_graphs()
             print(f"\nWrote graphs to {kwargs['graph_dir']}")
 
+    @staticmethod
+    def _accepts_kwarg(Cls: type, name: str) -> bool:
+        """Returns True if Cls can be initialized with the kwarg"""
+
+        params = signature(Cls).parameters
+        return name in params or any(
+            x.kind == Parameter.VAR_KEYWORD for x in params.values()
+        )
+
     @property
     def graph_output_dir(self) -> Path:
         return self.output_dir / "graphs"
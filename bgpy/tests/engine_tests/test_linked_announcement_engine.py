@@ -0,0 +1,51 @@
+from dataclasses import replace
+from pathlib import Path
+
+import pytest
+
+from bgpy.simulation_engine import LinkedAnnouncement
+from bgpy.utils import EngineRunConfig, EngineRunner, SimulatorCodec
+
+from .engine_test_configs import engine_test_configs
+from .utils import EngineTestConfig
+
+
+@pytest.mark.engine
+class TestLinkedAnnouncementEngine:
+    """Runs the engine tests with LinkedAnnouncement as the AnnCls
+
+    LinkedAnnouncement is a drop in replacement for Announcement,
+    so the results must always match the engine test ground truth
+    """
+
+    @pytest.mark.parametrize("conf", engine_test_configs)
+    def test_linked_announcement_engine(self, conf: EngineTestConfig, tmp_path: Path):
+        """Compares the engine and outcomes against the ground truth"""
+
+        gt_dir = Path(__file__).parent / "engine_test_outputs" / conf.name
+        if not (gt_dir / "engine_gt.yaml").exists():
+            pytest.skip("Ground truth must be generated by test_engine first")
+
+        run_conf = EngineRunConfig(
+            name=conf.name,
+            desc=conf.desc,
+            scenario_config=replace(conf.scenario_config, AnnCls=LinkedAnnouncement),
+            as_graph_info=conf.as_graph_info,
+            ASGraphCls=conf.ASGraphCls,
+            SimulationEngineCls=conf.SimulationEngineCls,
+            MetricTrackerCls=conf.MetricTrackerCls,
+            ASGraphAnalyzerCls=conf.ASGraphAnalyzerCls,
+            DiagramCls=conf.DiagramCls,
+        )
+        engine, outcomes, _, _ = EngineRunner(
+            base_dir=tmp_path, conf=run_conf
+        ).run_engine()
+
+        # Propagation actually used LinkedAnnouncement
+        for as_obj in engine.as_graph:
+            for ann in as_obj.policy._local_rib.values():
+                assert isinstance(ann, LinkedAnnouncement)
+
+        codec = SimulatorCodec()
+        assert engine == codec.load(gt_dir / "engine_gt.yaml")
+        assert outcomes == codec.load(gt_dir / "outcomes_gt.yaml")
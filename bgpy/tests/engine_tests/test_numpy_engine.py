@@ -0,0 +1,45 @@
+from pathlib import Path
+
+import pytest
+
+from bgpy.simulation_engine import NumPySimulationEngine
+from bgpy.utils import EngineRunConfig, EngineRunner, SimulatorCodec
+
+from .engine_test_configs import engine_test_configs
+from .utils import EngineTestConfig
+
+
+@pytest.mark.engine
+class TestNumPyEngine:
+    """Runs the engine tests with the NumPySimulationEngine
+
+    Unsupported policies fall back to the SimulationEngine,
+    so the results must always match the engine test ground truth
+    """
+
+    @pytest.mark.parametrize("conf", engine_test_configs)
+    def test_numpy_engine(self, conf: EngineTestConfig, tmp_path: Path):
+        """Compares the engine and outcomes against the ground truth"""
+
+        gt_dir = Path(__file__).parent / "engine_test_outputs" / conf.name
+        if not (gt_dir / "engine_gt.yaml").exists():
+            pytest.skip("Ground truth must be generated by test_engine first")
+
+        run_conf = EngineRunConfig(
+            name=conf.name,
+            desc=conf.desc,
+            scenario_config=conf.scenario_config,
+            as_graph_info=conf.as_graph_info,
+            ASGraphCls=conf.ASGraphCls,
+            SimulationEngineCls=NumPySimulationEngine,
+            MetricTrackerCls=conf.MetricTrackerCls,
+            ASGraphAnalyzerCls=conf.ASGraphAnalyzerCls,
+            DiagramCls=conf.DiagramCls,
+        )
+        engine, outcomes, _, _ = EngineRunner(
+            base_dir=tmp_path, conf=run_conf
+        ).run_engine()
+
+        codec = SimulatorCodec()
+        assert engine == codec.load(gt_dir / "engine_gt.yaml")
+        assert outcomes == codec.load(gt_dir / "outcomes_gt.yaml")
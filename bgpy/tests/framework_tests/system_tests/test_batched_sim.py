@@ -0,0 +1,67 @@
+from pathlib import Path
+import random
+
+import pytest
+
+from bgpy.simulation_engine import BGP
+from bgpy.simulation_engine import NumPySimulationEngine
+from bgpy.simulation_engine import PeerROV
+from bgpy.simulation_engine import ROV
+from bgpy.simulation_engine import SimulationEngine
+from bgpy.simulation_framework import PrefixHijack
+from bgpy.simulation_framework import SubprefixHijack
+from bgpy.simulation_framework import ScenarioConfig
+from bgpy.simulation_framework import Simulation
+
+
+@pytest.mark.slow
+@pytest.mark.framework
+def test_batched_sim(tmp_path: Path):
+    """Ensures batched NumPy engine runs match the SimulationEngine"""
+
+    scenario_configs = (
+        ScenarioConfig(
+            ScenarioCls=SubprefixHijack,
+            AdoptPolicyCls=ROV,
+            BasePolicyCls=BGP,
+        ),
+        ScenarioConfig(
+            ScenarioCls=PrefixHijack,
+            AdoptPolicyCls=PeerROV,
+            BasePolicyCls=BGP,
+        ),
+    )
+
+    pickle_data = list()
+    engine_clses: tuple[tuple[type[SimulationEngine], int], ...] = (
+        (SimulationEngine, 1),
+        (NumPySimulationEngine, 3),
+    )
+    for SimulationEngineCls, batch_size in engine_clses:
+        sim = Simulation(
+            percent_adoptions=(0.1, 0.5),
+            scenario_configs=scenario_configs,
+            num_trials=4,
+            output_dir=tmp_path / SimulationEngineCls.__name__,
+            parse_cpus=1,
+            SimulationEngineCls=SimulationEngineCls,
+            batch_size=batch_size,
+        )
+        random.seed(0)
+        pickle_data.append(sim._get_data().get_pickle_data())
+    assert pickle_data[0] == pickle_data[1]
+
+
+@pytest.mark.framework
+def test_batch_size_requires_numpy_engine(tmp_path: Path):
+    """Ensures batch_size isn't silently ignored by other engines"""
+
+    with pytest.raises(NotImplementedError):
+        Simulation(
+            scenario_configs=(
+                ScenarioConfig(ScenarioCls=SubprefixHijack, AdoptPolicyCls=ROV),
+            ),
+            output_dir=tmp_path,
+            SimulationEngineCls=SimulationEngine,
+            batch_size=3,
+        )
@@ -0,0 +1,59 @@
+from pathlib import Path
+from typing import Any
+
+import pytest
+
+from bgpy.simulation_framework import Simulation
+
+
+class CrashError(Exception):
+    pass
+
+
+@pytest.mark.slow
+@pytest.mark.framework
+def test_checkpoint_sim(tmp_path: Path, monkeypatch: pytest.MonkeyPatch):
+    """Ensures a crashed sim resumes from its checkpoints with the same results"""
+
+    # Otherwise the random state of a checkpoint wouldn't matter
+    monkeypatch.setenv("PYTHONHASHSEED", "0")
+    sim_kwargs: dict[str, Any] = {
+        "percent_adoptions": (0.1, 0.5),
+        "num_trials": 3,
+        "parse_cpus": 1,
+        "python_hash_seed": 0,
+    }
+    expected = Simulation(output_dir=tmp_path / "expected", **sim_kwargs)
+    expected_pickle_data = expected._get_data().get_pickle_data()
+
+    # Count (and crash) trials through _print_progress, once per scenario
+    trials_run: list[int] = list()
+    og_print_progress = Simulation._print_progress
+
+    def crashing_print_progress(self, *args, **kwargs):
+        if crash_after is not None and len(trials_run) == crash_after:
+            raise CrashError
+        trials_run.append(1)
+        og_print_progress(self, *args, **kwargs)
+
+    monkeypatch.setattr(Simulation, "_print_progress", crashing_print_progress)
+
+    sim = Simulation(output_dir=tmp_path / "sim", checkpoint_trials=2, **sim_kwargs)
+    crash_after: int | None = 5
+    with pytest.raises(CrashError):
+        sim.run(GraphFactoryCls=None)
+    assert len(list(sim.checkpoint_dir.glob("*.pickle"))) == 1
+
+    # Crashed during the 6th trial, so only the trials after the
+    # checkpoint of the first 4 are run again
+    crash_after = None
+    trials_run.clear()
+    assert sim._get_data().get_pickle_data() == expected_pickle_data
+    assert len(trials_run) == 2
+
+    # Completed units aren't run at all, and the checkpoints are
+    # removed once the results are written
+    trials_run.clear()
+    sim.run(GraphFactoryCls=None)
+    assert len(trials_run) == 0
+    assert not sim.checkpoint_dir.exists()
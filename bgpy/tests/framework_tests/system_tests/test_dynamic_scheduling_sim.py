@@ -0,0 +1,31 @@
+from pathlib import Path
+
+import pytest
+
+from bgpy.simulation_framework import Simulation
+
+
+@pytest.mark.slow
+@pytest.mark.framework
+def test_dynamic_scheduling_sim(tmp_path: Path, monkeypatch: pytest.MonkeyPatch):
+    """Ensures dynamically scheduled results don't depend on the workers"""
+
+    # Tasks are seeded, so which worker runs which task doesn't matter
+    monkeypatch.setenv("PYTHONHASHSEED", "0")
+    pickle_data = list()
+    for parse_cpus in (2, 3):
+        sim = Simulation(
+            percent_adoptions=(0.1, 0.5, 0.8),
+            num_trials=2,
+            output_dir=tmp_path / str(parse_cpus),
+            parse_cpus=parse_cpus,
+            python_hash_seed=0,
+            dynamic_scheduling=True,
+            trials_per_task=1,
+        )
+        tasks = sim._get_tasks(parse_cpus)
+        assert len(tasks) == 6
+        # Most expensive (highest adoption) trials first
+        assert [x[0][0] for x in tasks] == [0.8, 0.8, 0.5, 0.5, 0.1, 0.1]
+        pickle_data.append(sim._get_data().get_pickle_data())
+    assert pickle_data[0] == pickle_data[1]
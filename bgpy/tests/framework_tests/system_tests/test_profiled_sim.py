@@ -0,0 +1,42 @@
+import json
+from pathlib import Path
+
+import pytest
+
+from bgpy.simulation_engine import Profiler
+from bgpy.simulation_framework import Simulation
+
+
+@pytest.mark.slow
+@pytest.mark.framework
+def test_profiled_sim(tmp_path: Path):
+    """Ensures worker profiles are merged into a JSON summary"""
+
+    sim = Simulation(
+        percent_adoptions=(0.5,),
+        num_trials=2,
+        output_dir=tmp_path,
+        parse_cpus=2,
+        profiler=Profiler(),
+    )
+    # Profiles of other runs are neither merged nor removed
+    other_profiler = Profiler()
+    with other_profiler.phase("propagation"):
+        pass
+    other_profile_path = sim.worker_profile_dir / "other_run_0.json"
+    other_profiler.write_json(other_profile_path)
+    sim.run(GraphFactoryCls=None)
+    assert other_profile_path.exists()
+    assert list(sim.worker_profile_dir.iterdir()) == [other_profile_path]
+
+    with sim.profile_path.open() as f:
+        profile = json.load(f)
+    # Each worker constructs its own AS graph
+    assert profile["phase_calls"]["as_graph_construction"] == 2
+    for phase in ("scenario_construction", "propagation", "analyzer"):
+        assert profile["phase_calls"][phase] == 2
+    assert set(profile["rank_times"]["propagate_to_providers"]) >= {"0", "1"}
+    counts = profile["ann_counts"]["BGP"]
+    # Anns for seeded prefixes are neither copied nor rejected
+    assert counts["received"] >= counts["copied"] + counts["rejected"]
+    assert counts["copied"] >= counts["accepted"] > 0
@@ -0,0 +1,159 @@
+from functools import cached_property
+from pathlib import Path
+from typing import Any
+
+import pytest
+
+from bgpy.enums import Outcomes, SpecialPercentAdoptions
+from bgpy.simulation_framework import GraphFactory, ResultsStore, Simulation
+
+
+@pytest.mark.slow
+@pytest.mark.framework
+def test_results_store_sim(tmp_path: Path):
+    """Ensures the columnar results have the same rows as the pickle"""
+
+    sim = Simulation(
+        percent_adoptions=(SpecialPercentAdoptions.ONLY_ONE, 0.5),
+        num_trials=2,
+        output_dir=tmp_path,
+        parse_cpus=1,
+    )
+    metric_tracker = sim._get_data()
+    metric_tracker.write_data(
+        csv_path=sim.csv_path,
+        pickle_path=sim.pickle_path,
+        results_path=sim.results_path,
+    )
+
+    results = ResultsStore.read(sim.results_path)
+    assert results is not None
+    # Columns are (read only) memory maps rather than read into memory
+    assert not results.values.flags.writeable
+    assert results.to_pickle_data() == metric_tracker.get_pickle_data()
+    assert ResultsStore.read(tmp_path / "missing") is None
+    # Overwriting a store replaces it, and leaves no temporary stores behind
+    results.write(sim.results_path)
+    rewritten_results = ResultsStore.read(sim.results_path)
+    assert rewritten_results is not None
+    assert rewritten_results.to_pickle_data() == metric_tracker.get_pickle_data()
+    assert [
+        x for x in tmp_path.iterdir() if x.name.startswith(sim.results_path.name)
+    ] == [sim.results_path]
+
+    graph_factories = [
+        GraphFactory(pickle_path=sim.pickle_path, graph_dir=tmp_path / "graphs"),
+        GraphFactory(
+            pickle_path=None,
+            results_path=sim.results_path,
+            graph_dir=tmp_path / "graphs",
+        ),
+    ]
+    assert graph_factories[0].graph_rows == graph_factories[1].graph_rows
+
+
+@pytest.mark.slow
+@pytest.mark.framework
+def test_graph_factory_cache(tmp_path: Path):
+    """Ensures graphs are rendered in parallel, and only rendered once"""
+
+    sim = Simulation(
+        percent_adoptions=(0.1, 0.5),
+        num_trials=1,
+        output_dir=tmp_path,
+        parse_cpus=1,
+    )
+    sim._get_data().write_data(
+        csv_path=sim.csv_path,
+        pickle_path=sim.pickle_path,
+        results_path=sim.results_path,
+    )
+    graph_dir = tmp_path / "graphs"
+    GraphFactory(
+        pickle_path=None,
+        results_path=sim.results_path,
+        graph_dir=graph_dir,
+        parse_cpus=2,
+    ).generate_graphs()
+    graph_paths = sorted(graph_dir.rglob("*.png"))
+    assert graph_paths
+    mtimes = [x.stat().st_mtime_ns for x in graph_paths]
+
+    GraphFactory(
+        pickle_path=None, results_path=sim.results_path, graph_dir=graph_dir
+    ).generate_graphs()
+    # Nothing changed, so nothing was rendered again
+    assert [x.stat().st_mtime_ns for x in graph_paths] == mtimes
+
+    graph_paths[0].unlink()
+    GraphFactory(
+        pickle_path=None, results_path=sim.results_path, graph_dir=graph_dir
+    ).generate_graphs()
+    assert graph_paths[0].exists()
+    assert [x.stat().st_mtime_ns for x in graph_paths[1:]] == mtimes[1:]
+
+
+class AttackerSuccessGraphFactory(GraphFactory):
+    """Only graphs the attacker success rows"""
+
+    @cached_property
+    def graph_rows(self) -> list[dict[str, Any]]:
+        return [
+            x
+            for x in super().graph_rows
+            if x["metric_key"].outcome == Outcomes.ATTACKER_SUCCESS
+        ]
+
+
+@pytest.mark.slow
+@pytest.mark.framework
+def test_graph_factory_graph_rows_override(tmp_path: Path):
+    """Ensures subclasses that filter graph_rows only graph those rows"""
+
+    sim = Simulation(
+        percent_adoptions=(0.1, 0.5),
+        num_trials=1,
+        output_dir=tmp_path,
+        parse_cpus=1,
+    )
+    sim._get_data().write_data(
+        csv_path=sim.csv_path,
+        pickle_path=sim.pickle_path,
+        results_path=sim.results_path,
+    )
+    graph_dir = tmp_path / "graphs"
+    AttackerSuccessGraphFactory(
+        pickle_path=None, results_path=sim.results_path, graph_dir=graph_dir
+    ).generate_graphs()
+    graph_paths = list(graph_dir.rglob("*.png"))
+    assert graph_paths
+    assert all(x.name == f"{Outcomes.ATTACKER_SUCCESS.name}.png" for x in graph_paths)
+
+
+class ExplicitGraphFactory(GraphFactory):
+    """A custom GraphFactory with an explicit signature, without newer kwargs"""
+
+    def __init__(self, pickle_path, graph_dir, metric_keys):
+        super().__init__(
+            pickle_path=pickle_path, graph_dir=graph_dir, metric_keys=metric_keys
+        )
+
+
+@pytest.mark.slow
+@pytest.mark.framework
+def test_custom_graph_factory_signature(tmp_path: Path):
+    """Ensures custom GraphFactories only get the kwargs that they accept"""
+
+    sim = Simulation(
+        percent_adoptions=(0.1, 0.5),
+        num_trials=1,
+        output_dir=tmp_path,
+        parse_cpus=2,
+    )
+    sim._get_data().write_data(
+        csv_path=sim.csv_path,
+        pickle_path=sim.pickle_path,
+        results_path=sim.results_path,
+    )
+    sim._graph_data(ExplicitGraphFactory)
+    assert list((tmp_path / "graphs").rglob("*.png"))
@@ -0,0 +1,37 @@
+from pathlib import Path
+
+import pytest
+
+from bgpy.simulation_framework import Simulation
+
+
+@pytest.mark.slow
+@pytest.mark.framework
+def test_running_metric_stats_sim(tmp_path: Path, monkeypatch: pytest.MonkeyPatch):
+    """Ensures running stats aggregate to the same values as every trial"""
+
+    monkeypatch.setenv("PYTHONHASHSEED", "0")
+    pickle_data = list()
+    for running_metric_stats in (False, True):
+        sim = Simulation(
+            percent_adoptions=(0.1, 0.5),
+            num_trials=3,
+            output_dir=tmp_path / str(running_metric_stats),
+            parse_cpus=2,
+            python_hash_seed=0,
+            running_metric_stats=running_metric_stats,
+        )
+        metric_tracker = sim._get_data()
+        assert metric_tracker.running_stats == running_metric_stats
+        assert bool(metric_tracker.data) != running_metric_stats
+        pickle_data.append(metric_tracker.get_pickle_data())
+
+    assert len(pickle_data[0]) == len(pickle_data[1])
+    for row, running_row in zip(*pickle_data):
+        assert row["data_key"] == running_row["data_key"]
+        assert row["metric_key"] == running_row["metric_key"]
+        if row["value"] is None:
+            assert running_row["value"] is None
+        else:
+            assert running_row["value"] == pytest.approx(row["value"])
+        assert running_row["yerr"] == pytest.approx(row["yerr"])
@@ -0,0 +1,69 @@
+from multiprocessing import get_context
+from pathlib import Path
+
+import pytest
+
+from bgpy.simulation_framework import Simulation
+from bgpy.simulation_framework import simulation as simulation_module
+
+
+@pytest.mark.slow
+@pytest.mark.framework
+@pytest.mark.parametrize("sharing_kwarg", ("fork_as_graph", "shared_memory_as_graph"))
+def test_shared_as_graph_sim(
+    tmp_path: Path, monkeypatch: pytest.MonkeyPatch, sharing_kwarg: str
+):
+    """Ensures workers that share the parent's AS graph get the same results"""
+
+    # Seeds each chunk, since which worker runs which chunk is nondeterministic
+    monkeypatch.setenv("PYTHONHASHSEED", "0")
+    pickle_data = list()
+    for share in (False, True):
+        sim = Simulation(
+            percent_adoptions=(0.1, 0.5),
+            num_trials=2,
+            output_dir=tmp_path / str(share),
+            parse_cpus=2,
+            python_hash_seed=0,
+            **{sharing_kwarg: share},  # type: ignore
+        )
+        assert (sim._as_graph is not None) == share
+        pickle_data.append(sim._get_data().get_pickle_data())
+        # Shared memory is unlinked once the workers are done
+        assert sim._as_graph_shm_name is None
+    assert pickle_data[0] == pickle_data[1]
+
+
+@pytest.mark.slow
+@pytest.mark.framework
+def test_shared_memory_as_graph_spawn_sim(
+    tmp_path: Path, monkeypatch: pytest.MonkeyPatch
+):
+    """Ensures spawned workers (the default on macOS) attach to shared memory
+
+    Spawned workers don't inherit anything from the parent, so they can
+    only get the AS graph through the shared memory name pickled with self
+    """
+
+    monkeypatch.setenv("PYTHONHASHSEED", "0")
+    monkeypatch.setattr(simulation_module, "Pool", get_context("spawn").Pool)
+    results = list()
+    for share in (False, True):
+        sim = Simulation(
+            percent_adoptions=(0.1, 0.5),
+            num_trials=2,
+            output_dir=tmp_path / str(share),
+            parse_cpus=2,
+            python_hash_seed=0,
+            shared_memory_as_graph=share,
+        )
+        # Policy classes hash by id, which differs between spawned workers,
+        # so the order of the rows (but not the rows themselves) can differ
+        results.append(
+            {
+                (x["data_key"], x["metric_key"]): (x["value"], x["yerr"])
+                for x in sim._get_data().get_pickle_data()
+            }
+        )
+        assert sim._as_graph_shm_name is None
+    assert results[0] == results[1]
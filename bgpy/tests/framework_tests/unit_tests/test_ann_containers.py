@@ -0,0 +1,75 @@
+import pytest
+
+from bgpy.enums import Relationships
+from bgpy.simulation_engine import Announcement
+from bgpy.simulation_engine.ann_containers import (
+    FastLocalRIB,
+    FastRecvQueue,
+    FastRIBsIn,
+    LocalRIB,
+    RecvQueue,
+    RIBsIn,
+)
+from bgpy.simulation_framework.scenarios import PrefixRegistry
+
+
+@pytest.mark.framework
+@pytest.mark.unit_tests
+class TestAnnContainers:
+    def test_fast_containers_match_ann_containers(self):
+        """Tests the dict backed containers behave like the UserDict ones"""
+
+        ann = Announcement(prefix="1.2.0.0/16", as_path=(1,))
+        for Cls, FastCls, add in (
+            (LocalRIB, FastLocalRIB, lambda x: x.add_ann(ann)),
+            (RecvQueue, FastRecvQueue, lambda x: x.add_ann(ann)),
+            (
+                RIBsIn,
+                FastRIBsIn,
+                lambda x: x.add_unprocessed_ann(ann, Relationships.CUSTOMERS),
+            ),
+        ):
+            container, fast_container = Cls(), FastCls()
+            add(container)
+            add(fast_container)
+            assert dict(fast_container) == dict(container)
+            # YAML is only available through the explicit conversion
+            converted = fast_container.to_ann_container()
+            assert type(converted) is Cls
+            assert converted.__to_yaml_dict__() == container.__to_yaml_dict__()
+            fast_container.clear()
+            assert not fast_container
+
+    @pytest.mark.parametrize("LocalRIBCls", (LocalRIB, FastLocalRIB))
+    def test_most_specific_ann(self, LocalRIBCls):
+        """Tests the most specific prefix pointer follows adds and removals"""
+
+        anns = [
+            Announcement(prefix=prefix, as_path=(1,))
+            for prefix in ("1.2.0.0/16", "1.2.3.0/24", "1.2.0.0/20")
+        ]
+        prefix_registry = PrefixRegistry(x.prefix for x in anns)
+        local_rib = LocalRIBCls()
+        assert local_rib.get_most_specific_ann(prefix_registry) is None
+        for ann in anns:
+            version = local_rib.version
+            local_rib.add_ann(ann)
+            # The engine uses the version to tell if the RIB changed
+            assert local_rib.version != version
+        assert local_rib.get_most_specific_ann(prefix_registry) is anns[1]
+        local_rib.pop(anns[1].prefix)
+        assert local_rib.get_most_specific_ann(prefix_registry) is anns[2]
+        local_rib.add_ann(anns[1])
+        assert local_rib.get_most_specific_ann(prefix_registry) is anns[1]
+        local_rib.clear()
+        local_rib.add_ann(anns[0])
+        assert local_rib.get_most_specific_ann(prefix_registry) is anns[0]
+        # Setting prefixes directly also moves the pointer
+        local_rib[anns[1].prefix] = anns[1]
+        assert local_rib.get_most_specific_ann(prefix_registry) is anns[1]
+        del local_rib[anns[1].prefix]
+        local_rib.update({anns[2].prefix: anns[2]})
+        assert local_rib.get_most_specific_ann(prefix_registry) is anns[2]
+        local_rib.popitem()
+        local_rib.setdefault(anns[1].prefix, anns[1])
+        assert local_rib.get_most_specific_ann(prefix_registry) is anns[1]
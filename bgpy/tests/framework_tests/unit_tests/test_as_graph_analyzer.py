@@ -0,0 +1,60 @@
+import random
+
+import pytest
+
+from bgpy.enums import Outcomes, Plane
+from bgpy.simulation_engine import ROV
+from bgpy.simulation_framework import ASGraphAnalyzer, ScenarioConfig, SubprefixHijack
+
+
+@pytest.mark.framework
+@pytest.mark.unit_tests
+class TestASGraphAnalyzer:
+    def _get_scenario(self, engine) -> SubprefixHijack:
+        random.seed(0)
+        scenario = SubprefixHijack(
+            scenario_config=ScenarioConfig(
+                ScenarioCls=SubprefixHijack, AdoptPolicyCls=ROV
+            ),
+            percent_adoption=0.5,
+            engine=engine,
+        )
+        scenario.setup_engine(engine)
+        engine.run(propagation_round=0, scenario=scenario)
+        return scenario
+
+    def test_array_traceback(self, engine):
+        """Tests the array traceback matches the recursive traceback"""
+
+        scenario = self._get_scenario(engine)
+        outcomes = [
+            ASGraphAnalyzer(
+                engine=engine, scenario=scenario, array_traceback=array_traceback
+            ).analyze()
+            for array_traceback in (False, True)
+        ]
+        assert outcomes[0] == outcomes[1]
+
+    def test_array_traceback_loop(self, engine):
+        """Tests forwarding loops are disconnected rather than recursing forever"""
+
+        scenario = self._get_scenario(engine)
+        analyzer = ASGraphAnalyzer(
+            engine=engine, scenario=scenario, array_traceback=True
+        )
+        # Two transit ASes that forward to each other
+        ann_dict = analyzer._most_specific_ann_dict
+        as_objs = [
+            as_obj
+            for as_obj, ann in ann_dict.items()
+            if as_obj.customers and ann and len(ann.as_path) > 2
+        ][:2]
+        for as_obj, next_as_obj in zip(as_objs, reversed(as_objs)):
+            ann_dict[as_obj] = ann_dict[as_obj].copy(  # type: ignore
+                {"next_hop_asn": next_as_obj.asn}
+            )
+
+        with pytest.warns(RuntimeWarning, match="forwarding loops"):
+            outcomes = analyzer.analyze()[Plane.DATA.value]
+        for as_obj in as_objs:
+            assert outcomes[as_obj.asn] == Outcomes.DISCONNECTED.value
@@ -0,0 +1,34 @@
+import pytest
+
+
+@pytest.mark.framework
+@pytest.mark.unit_tests
+class TestASGraphArrays:
+    def test_csr_matches_as_objects(self, engine):
+        """Tests the CSR arrays mirror the AS object relationships"""
+
+        as_graph = engine.as_graph
+        arrays = as_graph.get_arrays()
+        # Arrays are cached on the graph
+        assert as_graph.get_arrays() is arrays
+        assert len(arrays) == len(as_graph)
+        for i, as_obj in enumerate(as_graph):
+            assert arrays.asns[i] == as_obj.asn
+            assert arrays.asn_to_index[as_obj.asn] == i
+            assert arrays.propagation_ranks[i] == as_obj.propagation_rank
+            for rel, neighbors in (
+                ("providers", as_obj.providers),
+                ("peers", as_obj.peers),
+                ("customers", as_obj.customers),
+            ):
+                indices = getattr(arrays, rel)(i)
+                assert arrays.asns[indices].tolist() == [x.asn for x in neighbors]
+
+    def test_rank_indices_match_propagation_ranks(self, engine):
+        """Tests the per rank index arrays mirror propagation_ranks"""
+
+        as_graph = engine.as_graph
+        arrays = as_graph.get_arrays()
+        assert len(arrays.rank_indices) == len(as_graph.propagation_ranks)
+        for rank_indices, rank in zip(arrays.rank_indices, as_graph.propagation_ranks):
+            assert arrays.asns[rank_indices].tolist() == [x.asn for x in rank]
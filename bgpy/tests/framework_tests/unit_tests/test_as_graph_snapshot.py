@@ -0,0 +1,48 @@
+from pathlib import Path
+
+import numpy as np
+import pytest
+
+from bgpy.as_graphs import ASGraphSnapshot, CAIDAASGraphConstructor
+
+
+@pytest.mark.framework
+@pytest.mark.unit_tests
+class TestASGraphSnapshot:
+    def test_snapshot_graph_matches_built_graph(self, tmp_path: Path):
+        """Tests graphs loaded from a snapshot are the same as built graphs"""
+
+        snapshot_path = tmp_path / "as_graph.snapshot"
+        built = CAIDAASGraphConstructor(snapshot_path=snapshot_path).run()
+        snapshot = ASGraphSnapshot.read(snapshot_path)
+        assert snapshot is not None
+
+        loaded = CAIDAASGraphConstructor(snapshot_path=snapshot_path).run()
+        assert loaded.as_dict == built.as_dict
+        assert loaded.ixp_asns == built.ixp_asns
+        assert [x.asn for x in loaded] == [x.asn for x in built]
+        assert [[x.asn for x in rank] for rank in loaded.propagation_ranks] == [
+            [x.asn for x in rank] for rank in built.propagation_ranks
+        ]
+        for as_obj in loaded:
+            assert as_obj.as_rank == built.as_dict[as_obj.asn].as_rank
+        # The arrays come from the snapshot (and are read only views)
+        assert loaded.arrays is not None
+        assert not loaded.arrays.customer_indices.flags.writeable
+        built_arrays = built.get_arrays()
+        for name in ("asns", "provider_indices", "peer_offsets", "customer_indices"):
+            assert np.array_equal(
+                getattr(loaded.arrays, name), getattr(built_arrays, name)
+            )
+
+    def test_stale_snapshot_not_loaded(self, tmp_path: Path):
+        """Tests snapshots built from another source or version are ignored"""
+
+        snapshot_path = tmp_path / "as_graph.snapshot"
+        CAIDAASGraphConstructor(snapshot_path=snapshot_path).run()
+        key = ASGraphSnapshot.read(snapshot_path).key  # type: ignore
+        assert ASGraphSnapshot.read(snapshot_path, key=key) is not None
+        assert ASGraphSnapshot.read(snapshot_path, key="other") is None
+        assert ASGraphSnapshot.read(tmp_path / "missing") is None
+        snapshot_path.write_bytes(b"not a snapshot")
+        assert ASGraphSnapshot.read(snapshot_path) is None
@@ -0,0 +1,82 @@
+import bz2
+from pathlib import Path
+
+import pytest
+
+from bgpy.as_graphs import CAIDAASGraphConstructor
+
+
+@pytest.mark.framework
+@pytest.mark.unit_tests
+class TestCAIDAASGraphConstructor:
+    def test_parse_chunks_and_bz2(self, tmp_path: Path):
+        """Tests that parsing doesn't depend on chunk size or compression"""
+
+        lines = [
+            "# input clique: 1 2",
+            "# IXP ASes: 7",
+            "1|2|0|bgp",
+            "1|3|-1|bgp",
+            "# some other comment",
+            "3|4|-1|mlp",
+            "2|5|0|bgp",
+            "2|3|-1|bgp",
+            "1|2|0|bgp",
+            "7|3|0|mlp",
+        ]
+        txt_path = tmp_path / "rels.txt"
+        txt_path.write_text("\n".join(lines))
+        bz2_path = tmp_path / "rels.txt.bz2"
+        bz2_path.write_bytes(bz2.compress(txt_path.read_bytes()))
+
+        as_graph_info = CAIDAASGraphConstructor()._get_as_graph_info(txt_path)
+        assert as_graph_info.input_clique_asns == frozenset([1, 2])
+        assert as_graph_info.ixp_asns == frozenset([7])
+        assert {
+            (x.customer_asn, x.provider_asn)
+            for x in as_graph_info.customer_provider_links
+        } == {
+            (3, 1),
+            (4, 3),
+            (3, 2),
+        }
+        assert {x.asns for x in as_graph_info.peer_links} == {
+            (1, 2),
+            (2, 5),
+            (3, 7),
+        }
+
+        for chunk_size in (1, 7, 1 << 24):
+            constructor = CAIDAASGraphConstructor(parse_chunk_size=chunk_size)
+            for path in (txt_path, bz2_path):
+                assert constructor._get_as_graph_info(path) == as_graph_info
+
+        without_1 = CAIDAASGraphConstructor()._get_as_graph_info(
+            txt_path, frozenset([1])
+        )
+        assert without_1.input_clique_asns == frozenset([2])
+        assert 1 not in without_1.asns
+
+    @pytest.mark.parametrize(
+        "bad_line",
+        (
+            # Not an int
+            "1|x|-1|bgp",
+            # Truncated
+            "1|2",
+        ),
+    )
+    def test_malformed_line(self, tmp_path: Path, bad_line: str):
+        """Tests that malformed lines raise an error with the line number"""
+
+        lines = ["# input clique: 1 2", "1|2|0|bgp", "# comment", "1|3|-1|bgp"]
+        # Within the file, and the last line of the file (without a newline)
+        for bad_line_num in (3, len(lines) + 1):
+            bad_lines = list(lines)
+            bad_lines.insert(bad_line_num - 1, bad_line)
+            txt_path = tmp_path / "rels.txt"
+            txt_path.write_text("\n".join(bad_lines))
+            for chunk_size in (1, 7, 1 << 24):
+                constructor = CAIDAASGraphConstructor(parse_chunk_size=chunk_size)
+                with pytest.raises(ValueError, match=f"line {bad_line_num}:"):
+                    constructor._get_as_graph_info(txt_path)
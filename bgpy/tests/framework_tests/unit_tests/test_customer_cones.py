@@ -0,0 +1,52 @@
+import pytest
+
+from bgpy.as_graphs import ASGraph, ASGraphInfo, CustomerProviderLink as CPLink
+
+
+@pytest.mark.framework
+@pytest.mark.unit_tests
+class TestCustomerCones:
+    def test_deep_chain(self):
+        """Tests ranks and cones of a chain deeper than the recursion limit"""
+
+        depth = 5000
+        as_graph = ASGraph(
+            ASGraphInfo(
+                customer_provider_links=frozenset(
+                    CPLink(customer_asn=asn, provider_asn=asn + 1)
+                    for asn in range(1, depth)
+                )
+            )
+        )
+        for as_obj in as_graph:
+            assert as_obj.propagation_rank == as_obj.asn - 1
+        # The top of the chain only has one neighbor, so it counts as a stub
+        assert as_graph.as_dict[depth].customer_cone_size == 0
+        assert as_graph.as_dict[depth - 1].customer_cone_size == depth - 2
+        cone_bitmap = as_graph.get_customer_cone_bitmap(depth)
+        assert as_graph.customer_cone_asns(cone_bitmap) == frozenset(range(1, depth))
+        assert as_graph.in_customer_cone(1, cone_bitmap)
+        assert not as_graph.in_customer_cone(depth, cone_bitmap)
+
+    def test_multihomed_cones(self):
+        """Tests cones where customers are reachable through multiple paths"""
+
+        as_graph = ASGraph(
+            ASGraphInfo(
+                customer_provider_links=frozenset(
+                    CPLink(customer_asn=customer_asn, provider_asn=provider_asn)
+                    for customer_asn, provider_asn in (
+                        (1, 3),
+                        (1, 4),
+                        (2, 3),
+                        (3, 5),
+                        (4, 5),
+                        (6, 4),
+                    )
+                )
+            )
+        )
+        cone_sizes = {x.asn: x.customer_cone_size for x in as_graph}
+        assert cone_sizes == {1: 0, 2: 0, 3: 2, 4: 2, 5: 5, 6: 0}
+        cone_bitmap = as_graph.get_customer_cone_bitmap(4)
+        assert as_graph.customer_cone_asns(cone_bitmap) == frozenset([1, 6])
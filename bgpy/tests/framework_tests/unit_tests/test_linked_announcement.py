@@ -0,0 +1,56 @@
+import pickle
+
+import pytest
+
+from bgpy.enums import Relationships
+from bgpy.simulation_engine import Announcement, LinkedAnnouncement, LinkedASPath
+
+
+@pytest.mark.framework
+@pytest.mark.unit_tests
+class TestLinkedAnnouncement:
+    def test_linked_as_path_acts_like_tuple(self):
+        """Tests that prepending shares the parent and matches tuples"""
+
+        path = LinkedASPath.from_tuple((2, 1))
+        assert path is not None
+        prepended = (3,) + path
+        assert isinstance(prepended, LinkedASPath)
+        assert prepended.parent is path
+        assert prepended == (3, 2, 1) and (3, 2, 1) == prepended
+        assert hash(prepended) == hash((3, 2, 1))
+        assert len(prepended) == 3
+        assert prepended[0] == 3 and prepended[1] == 2 and prepended[-1] == 1
+        assert prepended[::-1] == (1, 2, 3)
+        assert 2 in prepended and 4 not in prepended
+        assert prepended + (0,) == (3, 2, 1, 0)
+
+    def test_copy_matches_announcement(self):
+        """Tests that copy and the ROA properties match Announcement"""
+
+        kwargs = {
+            "prefix": "1.2.0.0/16",
+            "as_path": (1,),
+            "roa_origin": 1,
+            "roa_valid_length": True,
+        }
+        anns = [AnnCls(**kwargs) for AnnCls in (Announcement, LinkedAnnouncement)]
+        for _ in range(2):
+            anns = [
+                ann.copy(
+                    {
+                        "as_path": (ann.as_path[0] + 1,) + ann.as_path,
+                        "recv_relationship": Relationships.CUSTOMERS,
+                    }
+                )
+                for ann in anns
+            ]
+        ann, linked_ann = anns
+        assert linked_ann == ann and ann == linked_ann
+        assert linked_ann.seed_asn is None and linked_ann.origin == 1
+        assert linked_ann.valid_by_roa and not linked_ann.invalid_by_roa
+        # Optional attrs are shared until they are overwritten
+        assert linked_ann.copy()._delta is linked_ann._delta
+        withdrawn = linked_ann.copy({"withdraw": True})
+        assert withdrawn.withdraw and not linked_ann.withdraw
+        assert pickle.loads(pickle.dumps(linked_ann)) == linked_ann
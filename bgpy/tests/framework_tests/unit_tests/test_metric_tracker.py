@@ -0,0 +1,94 @@
+import random
+
+import pytest
+
+from bgpy.enums import ASGroups, Outcomes, Plane
+from bgpy.simulation_engine import ROV
+from bgpy.simulation_framework import (
+    ASGraphAnalyzer,
+    MetricTracker,
+    ScenarioConfig,
+    SubprefixHijack,
+)
+from bgpy.simulation_framework.metric_tracker.metric import Metric
+from bgpy.simulation_framework.metric_tracker.metric_key import MetricKey
+
+
+class ASByASMetricTracker(MetricTracker):
+    def _vectorizable(self, metrics) -> bool:
+        return False
+
+
+class UnweightedMetric(Metric):
+    """Overrides the numerator and denominator without the weight kwarg"""
+
+    def _add_numerator(
+        self, *, as_obj, engine, scenario, ctrl_plane_outcome, data_plane_outcome
+    ) -> None:
+        self._numerators[as_obj.policy.__class__] += 1
+
+    def _add_denominator(
+        self, *, as_obj, engine, scenario, ctrl_plane_outcome, data_plane_outcome
+    ) -> bool:
+        self._denominators[as_obj.policy.__class__] += 1
+        return True
+
+
+@pytest.mark.framework
+@pytest.mark.unit_tests
+class TestMetricTracker:
+    def test_vectorized_metrics(self, engine):
+        """Tests metrics populated with arrays match adding AS by AS"""
+
+        metric_keys = tuple(
+            MetricKey(plane=plane, as_group=as_group, outcome=outcome)
+            for plane in (Plane.DATA, Plane.CTRL)
+            for as_group in ASGroups
+            for outcome in Outcomes
+            if outcome != Outcomes.UNDETERMINED
+        )
+        random.seed(0)
+        scenario = SubprefixHijack(
+            scenario_config=ScenarioConfig(
+                ScenarioCls=SubprefixHijack, AdoptPolicyCls=ROV
+            ),
+            percent_adoption=0.5,
+            engine=engine,
+        )
+        scenario.setup_engine(engine)
+        engine.run(propagation_round=0, scenario=scenario)
+        outcomes = ASGraphAnalyzer(
+            engine=engine, scenario=scenario, control_plane_tracking=True
+        ).analyze()
+
+        results = list()
+        for MetricTrackerCls in (ASByASMetricTracker, MetricTracker):
+            metric_tracker = MetricTrackerCls(metric_keys=metric_keys)
+            metric_tracker.track_trial_metrics(
+                engine=engine,
+                percent_adopt=0.5,
+                trial=0,
+                scenario=scenario,
+                propagation_round=0,
+                outcomes=outcomes,
+            )
+            results.append(metric_tracker.get_pickle_data())
+        assert results[0] == results[1]
+
+    def test_unweighted_metric_subclass(self, engine):
+        """Tests Metric subclasses that don't take the weight kwarg still work"""
+
+        as_obj = next(iter(engine.as_graph))
+        metric_key = MetricKey(
+            plane=Plane.DATA, as_group=ASGroups.ETC, outcome=Outcomes.VICTIM_SUCCESS
+        )
+        metric = UnweightedMetric(metric_key, frozenset({as_obj.policy.__class__}))
+        metric.add_data(
+            as_obj=as_obj,
+            engine=engine,
+            scenario=None,
+            ctrl_plane_outcome=Outcomes.VICTIM_SUCCESS.value,
+            data_plane_outcome=Outcomes.VICTIM_SUCCESS.value,
+        )
+        assert metric._numerators[as_obj.policy.__class__] == 1
+        assert metric._denominators[as_obj.policy.__class__] == 1
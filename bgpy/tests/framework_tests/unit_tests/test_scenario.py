@@ -1,3 +1,4 @@
+from ipaddress import ip_network
 import random
 
 from frozendict import frozendict
@@ -5,13 +6,22 @@ import pytest
 
 from bgpy.enums import ASNs, Prefixes
 from bgpy.simulation_framework import (
+    PrefixRegistry,
     ScenarioConfig,
     ROAInfo,
     SubprefixHijack,
     ValidPrefix,
     NonRoutedPrefixHijack,
 )
-from bgpy.simulation_engine import Announcement, BGP, BGPFull, ROV
+from bgpy.simulation_engine import (
+    Announcement,
+    BGP,
+    BGPFull,
+    BGPSec,
+    ROV,
+    ROVFull,
+    ROVPPV1Lite,
+)
 
 
 @pytest.mark.framework
@@ -34,6 +44,57 @@ class TestScenario:
         )
         SubprefixHijack(scenario_config=scenario_config)
 
+    def test_slim_ann_cls(self):
+        """Tests the AnnCls only has the attrs required by the config's policies"""
+
+        scenario_config = ScenarioConfig(
+            ScenarioCls=SubprefixHijack,
+            AdoptPolicyCls=ROVFull,
+            hardcoded_asn_cls_dict=frozendict({1: BGPSec}),
+            slim_AnnCls=True,
+        )
+        AnnCls = scenario_config.AnnCls
+        assert AnnCls is not Announcement
+        assert {"withdraw", "bgpsec_as_path"}.issubset(AnnCls.__dataclass_fields__)
+        assert "rovpp_blackhole" not in AnnCls.__dataclass_fields__
+        # Classes are only generated once per set of attrs
+        assert (
+            ScenarioConfig(
+                ScenarioCls=SubprefixHijack,
+                AdoptPolicyCls=BGPFull,
+                hardcoded_asn_cls_dict=frozendict({1: BGPSec}),
+                slim_AnnCls=True,
+            ).AnnCls
+            is AnnCls
+        )
+        ann = AnnCls(prefix=Prefixes.PREFIX.value, as_path=(1,))
+        assert ann == Announcement(prefix=Prefixes.PREFIX.value, as_path=(1,))
+        # Virtual subclasses, since slotted subclasses would keep every slot
+        assert issubclass(AnnCls, Announcement)
+        assert isinstance(ann, Announcement)
+        assert "rovpp_blackhole" not in AnnCls.__slots__
+        assert not hasattr(ann, "rovpp_blackhole")
+        # Off by default
+        assert ScenarioConfig(ScenarioCls=SubprefixHijack).AnnCls is Announcement
+
+    def test_slim_ann_cls_validates_engine_policies(self, engine):
+        """Tests policies the config doesn't know about are validated"""
+
+        class ROVPPAdoptingSubprefixHijack(SubprefixHijack):
+            def _get_non_default_asn_cls_dict(self, *args, **kwargs):
+                return frozendict({next(iter(engine.as_graph)).asn: ROVPPV1Lite})
+
+        scenario_config = ScenarioConfig(
+            ScenarioCls=ROVPPAdoptingSubprefixHijack, slim_AnnCls=True
+        )
+        assert "rovpp_blackhole" not in scenario_config.AnnCls.__dataclass_fields__
+        random.seed(0)
+        scenario = ROVPPAdoptingSubprefixHijack(
+            scenario_config=scenario_config, engine=engine
+        )
+        with pytest.raises(AssertionError):
+            scenario.setup_engine(engine)
+
     def test_init_invalid_attackers(self):
         """Tests the len(attacker_asns) == num_attackers"""
 
@@ -403,3 +464,26 @@ class TestScenario:
             Prefixes.SUBPREFIX.value: [],
         }
         assert scenario.ordered_prefix_subprefix_dict == gt
+
+    def test_prefix_registry(self):
+        """Tests that prefixes are ordered most specific first"""
+
+        registry = PrefixRegistry(
+            ["1.0.0.0/8", "1.2.0.0/16", "1.2.3.0/24", "2.0.0.0/16", "1.2.0.0/16"]
+        )
+        assert registry.prefixes == (
+            "1.2.3.0/24",
+            "1.2.0.0/16",
+            "2.0.0.0/16",
+            "1.0.0.0/8",
+        )
+        assert registry.subprefixes("1.0.0.0/8") == ("1.2.3.0/24", "1.2.0.0/16")
+        assert registry.subprefixes("2.0.0.0/16") == ()
+        assert registry.subprefixes("1.2.0.0/16") == ("1.2.3.0/24",)
+        assert "1.2.0.0/16" in registry
+        assert "3.0.0.0/8" not in registry
+        assert registry.network("1.2.0.0/16") == ip_network("1.2.0.0/16")
+        assert registry.get_most_specific_prefix(["1.0.0.0/8", "1.2.0.0/16"]) == (
+            "1.2.0.0/16"
+        )
+        assert registry.get_most_specific_prefix([]) is None
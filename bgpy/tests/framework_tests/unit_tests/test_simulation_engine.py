@@ -0,0 +1,280 @@
+import random
+
+from frozendict import frozendict
+import pytest
+
+from bgpy.enums import Relationships
+from bgpy.simulation_engine import (
+    BGP,
+    ROV,
+    Announcement,
+    Policy,
+    Profiler,
+    ROVPPV1Lite,
+    SimulationEngine,
+)
+from bgpy.simulation_framework import (
+    ASGraphAnalyzer,
+    MetricTracker,
+    NonRoutedPrefixHijack,
+    ScenarioConfig,
+    SubprefixHijack,
+)
+
+
+class CountingSimulationEngine(SimulationEngine):
+    """Counts the ASes that process incoming anns"""
+
+    def _set_frontier(self) -> None:
+        super()._set_frontier()
+        self.num_processed = 0
+
+    def _process_frontier(
+        self,
+        rank: int,
+        from_rel: Relationships,
+        propagation_round: int,
+        scenario,
+    ) -> None:
+        self.num_processed += len(self._receivers[rank] | self._idle_processors[rank])
+        super()._process_frontier(rank, from_rel, propagation_round, scenario)
+
+
+class FullSweepSimulationEngine(CountingSimulationEngine):
+    """Processes and propagates from every AS, as if there were no frontier"""
+
+    def _set_frontier(self) -> None:
+        super()._set_frontier()
+        for rank, ases in enumerate(self.as_graph.propagation_ranks):
+            self._senders[rank].update(x.asn for x in ases)
+
+    def _process_frontier(
+        self,
+        rank: int,
+        from_rel: Relationships,
+        propagation_round: int,
+        scenario,
+    ) -> None:
+        asns = {x.asn for x in self.as_graph.propagation_ranks[rank]}
+        self._receivers[rank] = asns
+        super()._process_frontier(rank, from_rel, propagation_round, scenario)
+        self._senders[rank].update(asns)
+
+
+class UntrackedBGP(BGP):
+    """BGP with the default frontier funcs of Policy, so it's never skipped"""
+
+    name = "UntrackedBGP"
+
+    has_incoming_anns = Policy.has_incoming_anns
+    has_anns_to_send = Policy.has_anns_to_send
+    local_rib_version = Policy.local_rib_version
+
+
+class UntrackedROV(ROV):
+    """ROV with the default frontier funcs of Policy, so it's never skipped"""
+
+    name = "UntrackedROV"
+
+    has_incoming_anns = Policy.has_incoming_anns
+    has_anns_to_send = Policy.has_anns_to_send
+    local_rib_version = Policy.local_rib_version
+
+
+@pytest.mark.framework
+@pytest.mark.unit_tests
+class TestSimulationEngine:
+    def test_set_as_classes_reuses_policies(self, engine):
+        """Tests that unchanged policies are reset in place, not reallocated"""
+
+        as_objs = list(engine.as_graph)[:2]
+        ann = Announcement(prefix="1.2.0.0/16", as_path=(as_objs[0].asn,))
+        engine.setup(announcements=(ann,), BasePolicyCls=BGP)
+        policies = {as_obj.asn: as_obj.policy for as_obj in engine.as_graph}
+        assert as_objs[0].policy._local_rib
+
+        policies_used = engine.setup(
+            BasePolicyCls=BGP,
+            non_default_asn_cls_dict=frozendict({as_objs[1].asn: ROV}),
+        )
+        assert policies_used == frozenset({BGP, ROV})
+        # Same class, so same (but empty) policy
+        assert as_objs[0].policy is policies[as_objs[0].asn]
+        assert not as_objs[0].policy._local_rib
+        # Class changed, so the policy was swapped
+        assert isinstance(as_objs[1].policy, ROV)
+        assert as_objs[1].policy is not policies[as_objs[1].asn]
+        assert as_objs[1].policy.as_.asn == as_objs[1].asn
+
+    @pytest.mark.parametrize(
+        "engine_kwargs",
+        [
+            {"equivalence_classes": True},
+            {"lazy_stubs": True},
+            {"equivalence_classes": True, "lazy_stubs": True},
+        ],
+    )
+    def test_skipped_ases(self, engine, engine_kwargs):
+        """Tests equivalence classes and lazy stubs don't change outcomes"""
+
+        results = list()
+        skipping_engine = SimulationEngine(engine.as_graph, **engine_kwargs)
+        for cur_engine in (engine, skipping_engine):
+            random.seed(0)
+            scenario = SubprefixHijack(
+                scenario_config=ScenarioConfig(
+                    ScenarioCls=SubprefixHijack, AdoptPolicyCls=ROV
+                ),
+                percent_adoption=0.5,
+                engine=cur_engine,
+            )
+            scenario.setup_engine(cur_engine)
+            cur_engine.run(propagation_round=0, scenario=scenario)
+            outcomes = ASGraphAnalyzer(
+                engine=cur_engine, scenario=scenario, control_plane_tracking=True
+            ).analyze()
+            metric_tracker = MetricTracker()
+            metric_tracker.track_trial_metrics(
+                engine=cur_engine,
+                percent_adopt=0.5,
+                trial=0,
+                scenario=scenario,
+                propagation_round=0,
+                outcomes=outcomes,
+            )
+            metric_percents = {
+                k: [x.percents for x in v] for k, v in metric_tracker.data.items()
+            }
+            results.append((outcomes, metric_percents))
+            if cur_engine is engine:
+                local_ribs = {x.asn: dict(x.policy._local_rib) for x in engine.as_graph}
+
+        assert results[0] == results[1]
+        as_dict = skipping_engine.as_graph.as_dict
+        if engine_kwargs.get("equivalence_classes"):
+            assert skipping_engine.equivalence_classes
+            for asn, representative_asn in skipping_engine.representatives.items():
+                assert asn in skipping_engine.equivalence_classes[representative_asn]
+                # Only the representative processed anns
+                assert not as_dict[asn].policy._local_rib
+                # And the anns the members were sent were dropped
+                assert not as_dict[asn].policy._recv_q
+        if engine_kwargs.get("lazy_stubs"):
+            lazy_asns = skipping_engine.lazy_asns
+            assert lazy_asns
+            assert not any(as_dict[asn].policy._local_rib for asn in lazy_asns)
+            # Evaluating them fills the local RIBs the same as propagating
+            skipping_engine.evaluate_lazy_ases(0, scenario)
+            assert not skipping_engine.lazy_asns
+            for asn in lazy_asns:
+                assert dict(as_dict[asn].policy._local_rib) == local_ribs[asn]
+
+    @pytest.mark.parametrize(
+        "ScenarioCls, AdoptPolicyCls",
+        [
+            (SubprefixHijack, ROV),
+            # Adopters drop the hijack, so many are sent nothing, but still
+            # add non routed blackholes
+            (NonRoutedPrefixHijack, ROVPPV1Lite),
+        ],
+    )
+    def test_frontier_matches_full_sweep(self, engine, ScenarioCls, AdoptPolicyCls):
+        """Tests the frontier skips ASes without changing the outcomes"""
+
+        results = list()
+        engines = (
+            CountingSimulationEngine(engine.as_graph),
+            FullSweepSimulationEngine(engine.as_graph),
+        )
+        for cur_engine in engines:
+            random.seed(0)
+            scenario = ScenarioCls(
+                scenario_config=ScenarioConfig(
+                    ScenarioCls=ScenarioCls, AdoptPolicyCls=AdoptPolicyCls
+                ),
+                percent_adoption=0.5,
+                engine=cur_engine,
+            )
+            scenario.setup_engine(cur_engine)
+            cur_engine.run(propagation_round=0, scenario=scenario)
+            outcomes = ASGraphAnalyzer(
+                engine=cur_engine, scenario=scenario, control_plane_tracking=True
+            ).analyze()
+            local_ribs = {x.asn: dict(x.policy._local_rib) for x in cur_engine.as_graph}
+            results.append((outcomes, local_ribs))
+
+        assert results[0] == results[1]
+        # The frontier skipped ASes that weren't sent anns
+        assert engines[0].num_processed < engines[1].num_processed
+        if AdoptPolicyCls is ROVPPV1Lite:
+            non_routed_prefixes = [x.prefix for x in scenario.roa_infos if x.non_routed]
+            assert non_routed_prefixes
+            adopters = [
+                x for x in engines[0].as_graph if isinstance(x.policy, ROVPPV1Lite)
+            ]
+            assert adopters
+            # Every adopter was processed, even those that were sent nothing
+            for as_obj in adopters:
+                for prefix in non_routed_prefixes:
+                    assert as_obj.policy._local_rib[prefix].rovpp_blackhole
+
+    def test_untracked_policies_are_always_on_the_frontier(self, engine):
+        """Tests policies without frontier funcs are never skipped"""
+
+        local_ribs = list()
+        engines = list()
+        for EngineCls, BasePolicyCls, AdoptPolicyCls in (
+            (CountingSimulationEngine, BGP, ROV),
+            (CountingSimulationEngine, UntrackedBGP, UntrackedROV),
+            (FullSweepSimulationEngine, BGP, ROV),
+        ):
+            cur_engine = EngineCls(engine.as_graph)
+            random.seed(0)
+            scenario = SubprefixHijack(
+                scenario_config=ScenarioConfig(
+                    ScenarioCls=SubprefixHijack,
+                    BasePolicyCls=BasePolicyCls,
+                    AdoptPolicyCls=AdoptPolicyCls,
+                ),
+                percent_adoption=0.5,
+                engine=cur_engine,
+            )
+            scenario.setup_engine(cur_engine)
+            cur_engine.run(propagation_round=0, scenario=scenario)
+            local_ribs.append(
+                {x.asn: dict(x.policy._local_rib) for x in cur_engine.as_graph}
+            )
+            engines.append(cur_engine)
+
+        assert local_ribs[0] == local_ribs[1] == local_ribs[2]
+        # Untracked policies are processed whenever a neighbor sends anns
+        assert engines[0].num_processed < engines[1].num_processed
+
+    def test_profiler_counts_blackholes(self, engine):
+        """Tests ROV++V1 Lite blackholes are counted while profiling"""
+
+        profiler = Profiler()
+        profiled_engine = SimulationEngine(engine.as_graph, profiler=profiler)
+        random.seed(0)
+        scenario = NonRoutedPrefixHijack(
+            scenario_config=ScenarioConfig(
+                ScenarioCls=NonRoutedPrefixHijack, AdoptPolicyCls=ROVPPV1Lite
+            ),
+            percent_adoption=0.5,
+            engine=profiled_engine,
+        )
+        scenario.setup_engine(profiled_engine)
+        profiled_engine.run(propagation_round=0, scenario=scenario)
+
+        counts = profiler.ann_counts[ROVPPV1Lite.name]
+        blackholes = [
+            ann
+            for as_obj in profiled_engine.as_graph
+            for ann in as_obj.policy._local_rib.values()
+            if ann.rovpp_blackhole
+        ]
+        # Non routed blackholes are added again in each propagation phase
+        assert counts["blackholes"] >= len(blackholes) > 0
+        assert counts["received"] >= counts["copied"] + counts["rejected"]
+        # Counting is off outside of the profiled calls
+        assert all(x.policy._ann_counts is None for x in profiled_engine.as_graph)